@@ -0,0 +1,54 @@
+# alembic/versions/3a9c1e7d5b20_add_idempotency_keys_table.py
+
+"""add_idempotency_keys_table
+
+Revision ID: 3a9c1e7d5b20
+Revises: fe71d1277bc1
+Create Date: 2026-10-19 09:12:31.402817
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "3a9c1e7d5b20"
+down_revision: Union[str, None] = "fe71d1277bc1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("chave", sa.VARCHAR(length=255), nullable=False),
+        sa.Column("rota", sa.VARCHAR(length=255), nullable=False),
+        sa.Column("hash_requisicao", sa.VARCHAR(length=64), nullable=False),
+        sa.Column("status_code", sa.INTEGER(), nullable=True),
+        sa.Column(
+            "headers",
+            sa.JSON(none_as_null=True).with_variant(
+                postgresql.JSONB(none_as_null=True), "postgresql"
+            ),
+            nullable=True,
+        ),
+        sa.Column("corpo", sa.LargeBinary(), nullable=True),
+        sa.Column("expira_em", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("chave", "rota", name=op.f("idempotency_keys_pkey")),
+    )
+    op.create_index(
+        op.f("ix_idempotency_keys_expira_em"),
+        "idempotency_keys",
+        ["expira_em"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_idempotency_keys_expira_em"), table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
@@ -0,0 +1,146 @@
+# alembic/versions/7c4e2b9a1f63_partition_agendamentos_by_month.py
+
+"""partition_agendamentos_by_month
+
+Converte 'agendamentos' em tabela particionada por faixa (RANGE) mensal de
+'data_primeira_consulta' (PostgreSQL). As partições cobrem os meses já
+existentes (até 10 anos atrás) e os próximos meses; uma partição DEFAULT
+recebe datas fora da faixa. Novas partições são criadas antecipadamente por
+`python -m app.tools.particoes criar`.
+
+A chave primária passa a ser (id, data_primeira_consulta), como exige o
+particionamento; o id continua único, gerado pela mesma sequence.
+
+Em outros bancos (SQLite) a migração não altera nada.
+
+Revision ID: 7c4e2b9a1f63
+Revises: 3a9c1e7d5b20
+Create Date: 2026-10-19 14:03:52.118204
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "7c4e2b9a1f63"
+down_revision: Union[str, None] = "3a9c1e7d5b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MESES_FUTUROS = 3
+ANOS_MAXIMOS_NO_PASSADO = 10
+
+COLUNAS = (
+    "id, especialidade, data_primeira_consulta, data_proxima_consulta, "
+    "valor_consulta, descricao, receituario, paciente_id, medico_id"
+)
+
+
+def _colunas_ddl(default_id: str) -> str:
+    return f"""
+        id INTEGER NOT NULL DEFAULT {default_id},
+        especialidade VARCHAR NOT NULL,
+        data_primeira_consulta DATE NOT NULL,
+        data_proxima_consulta DATE,
+        valor_consulta NUMERIC(10, 2) NOT NULL,
+        descricao VARCHAR,
+        receituario VARCHAR,
+        paciente_id INTEGER NOT NULL,
+        medico_id INTEGER NOT NULL,
+        CONSTRAINT agendamentos_paciente_id_fkey
+            FOREIGN KEY (paciente_id) REFERENCES pacientes (id),
+        CONSTRAINT agendamentos_medico_id_fkey
+            FOREIGN KEY (medico_id) REFERENCES medicos (id)
+    """
+
+
+def _proximo_mes(mes: date) -> date:
+    return date(mes.year + mes.month // 12, mes.month % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE agendamentos RENAME TO agendamentos_legado")
+    op.execute(
+        "ALTER TABLE agendamentos_legado "
+        "RENAME CONSTRAINT agendamentos_pkey TO agendamentos_legado_pkey"
+    )
+    op.execute("ALTER INDEX ix_agendamentos_id RENAME TO ix_agendamentos_legado_id")
+
+    op.execute(
+        f"""
+        CREATE TABLE agendamentos (
+            {_colunas_ddl("nextval('agendamentos_id_seq'::regclass)")},
+            CONSTRAINT agendamentos_pkey PRIMARY KEY (id, data_primeira_consulta)
+        ) PARTITION BY RANGE (data_primeira_consulta)
+        """
+    )
+    op.execute("ALTER SEQUENCE agendamentos_id_seq OWNED BY agendamentos.id")
+    op.create_index(op.f("ix_agendamentos_id"), "agendamentos", ["id"], unique=False)
+
+    # Partições mensais da menor data existente (limitada a 10 anos) até
+    # MESES_FUTUROS meses depois do maior entre hoje e a maior data existente.
+    menor, maior = bind.execute(
+        sa.text(
+            "SELECT min(data_primeira_consulta), max(data_primeira_consulta) "
+            "FROM agendamentos_legado"
+        )
+    ).one()
+    hoje = date.today().replace(day=1)
+    limite_passado = hoje.replace(year=hoje.year - ANOS_MAXIMOS_NO_PASSADO)
+    mes = max((menor or hoje).replace(day=1), limite_passado)
+    fim = max((maior or hoje).replace(day=1), hoje)
+    for _ in range(MESES_FUTUROS + 1):
+        fim = _proximo_mes(fim)
+    while mes < fim:
+        seguinte = _proximo_mes(mes)
+        op.execute(
+            f"CREATE TABLE agendamentos_p{mes:%Y%m} PARTITION OF agendamentos "
+            f"FOR VALUES FROM ('{mes.isoformat()}') TO ('{seguinte.isoformat()}')"
+        )
+        mes = seguinte
+    op.execute("CREATE TABLE agendamentos_default PARTITION OF agendamentos DEFAULT")
+
+    op.execute(
+        f"INSERT INTO agendamentos ({COLUNAS}) "
+        f"SELECT {COLUNAS} FROM agendamentos_legado"
+    )
+    op.execute("DROP TABLE agendamentos_legado")
+    op.execute("ANALYZE agendamentos")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute(
+        f"""
+        CREATE TABLE agendamentos_nao_particionada (
+            {_colunas_ddl("nextval('agendamentos_id_seq'::regclass)")},
+            CONSTRAINT agendamentos_nao_particionada_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        f"INSERT INTO agendamentos_nao_particionada ({COLUNAS}) "
+        f"SELECT {COLUNAS} FROM agendamentos"
+    )
+    op.execute("ALTER SEQUENCE agendamentos_id_seq OWNED BY NONE")
+    # Remove a tabela particionada com todas as partições e índices
+    op.execute("DROP TABLE agendamentos")
+    op.execute("ALTER TABLE agendamentos_nao_particionada RENAME TO agendamentos")
+    op.execute(
+        "ALTER TABLE agendamentos "
+        "RENAME CONSTRAINT agendamentos_nao_particionada_pkey TO agendamentos_pkey"
+    )
+    op.execute("ALTER SEQUENCE agendamentos_id_seq OWNED BY agendamentos.id")
+    op.create_index(op.f("ix_agendamentos_id"), "agendamentos", ["id"], unique=False)
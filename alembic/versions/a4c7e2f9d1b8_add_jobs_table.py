@@ -0,0 +1,68 @@
+# alembic/versions/a4c7e2f9d1b8_add_jobs_table.py
+
+"""add_jobs_table
+
+Cria a tabela 'jobs' (fila de tarefas em segundo plano executadas por
+`python -m app.worker`), com índice em (status, executar_apos) usado na
+reserva dos próximos jobs.
+
+Revision ID: a4c7e2f9d1b8
+Revises: f3a9c1e7b5d4
+Create Date: 2026-10-19 20:03:51.552190
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "a4c7e2f9d1b8"
+down_revision: Union[str, None] = "f3a9c1e7b5d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "jobs",
+        sa.Column(
+            "id",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            autoincrement=True,
+            nullable=False,
+        ),
+        sa.Column("tipo", sa.VARCHAR(length=64), nullable=False),
+        sa.Column("parametros", JSON, nullable=False),
+        sa.Column("status", sa.VARCHAR(length=16), nullable=False),
+        sa.Column("tentativas", sa.Integer(), nullable=False),
+        sa.Column("max_tentativas", sa.Integer(), nullable=False),
+        sa.Column("executar_apos", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("travado_ate", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("worker", sa.VARCHAR(length=255), nullable=True),
+        sa.Column("progresso", sa.Integer(), nullable=False),
+        sa.Column("mensagem", sa.VARCHAR(), nullable=True),
+        sa.Column("estado", JSON, nullable=True),
+        sa.Column("resultado", JSON, nullable=True),
+        sa.Column("erro", sa.VARCHAR(), nullable=True),
+        sa.Column("criado_em", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("iniciado_em", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("concluido_em", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("jobs_pkey")),
+    )
+    op.create_index(
+        "ix_jobs_status_executar_apos",
+        "jobs",
+        ["status", "executar_apos"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_jobs_status_executar_apos", table_name="jobs")
+    op.drop_table("jobs")
@@ -0,0 +1,92 @@
+# alembic/versions/b5d83f0e2a47_soft_delete_with_partial_indexes.py
+
+"""soft_delete_with_partial_indexes
+
+Adiciona 'deleted_at' a pacientes, médicos e agendamentos. Os índices únicos
+de cpf, cns e nome do médico passam a ser parciais (apenas linhas com
+deleted_at nulo), permitindo recadastrar um CPF removido; agendamentos ganham
+índices parciais para as consultas por paciente e por médico/data.
+
+Revision ID: b5d83f0e2a47
+Revises: 7c4e2b9a1f63
+Create Date: 2026-10-19 15:27:08.640915
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "b5d83f0e2a47"
+down_revision: Union[str, None] = "7c4e2b9a1f63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APENAS_ATIVOS = sa.text("deleted_at IS NULL")
+
+
+def _criar_indice_ativos(nome, tabela, colunas, unique=False) -> None:
+    op.create_index(
+        nome,
+        tabela,
+        colunas,
+        unique=unique,
+        postgresql_where=APENAS_ATIVOS,
+        sqlite_where=APENAS_ATIVOS,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for tabela in ("pacientes", "medicos", "agendamentos"):
+        op.add_column(
+            tabela, sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True)
+        )
+
+    op.drop_index(op.f("ix_pacientes_cpf"), table_name="pacientes")
+    op.drop_index(op.f("ix_pacientes_cns"), table_name="pacientes")
+    op.drop_index(op.f("ix_medicos_nome"), table_name="medicos")
+    # A restrição UNIQUE(nome) da tabela original também impediria reusar o
+    # nome de um médico removido (lote: o SQLite não remove restrições)
+    with op.batch_alter_table("medicos") as batch_op:
+        batch_op.drop_constraint(op.f("medicos_nome_key"), type_="unique")
+    _criar_indice_ativos("ix_pacientes_cpf_ativo", "pacientes", ["cpf"], unique=True)
+    _criar_indice_ativos("ix_pacientes_cns_ativo", "pacientes", ["cns"], unique=True)
+    _criar_indice_ativos("ix_medicos_nome_ativo", "medicos", ["nome"], unique=True)
+    _criar_indice_ativos(
+        "ix_agendamentos_paciente_id_ativo", "agendamentos", ["paciente_id"]
+    )
+    _criar_indice_ativos(
+        "ix_agendamentos_medico_id_data_ativo",
+        "agendamentos",
+        ["medico_id", "data_primeira_consulta"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Linhas removidas logicamente deixam de existir: sem deleted_at, elas
+    # voltariam a aparecer e poderiam violar os índices únicos completos.
+    op.execute("DELETE FROM agendamentos WHERE deleted_at IS NOT NULL")
+    op.execute(
+        "DELETE FROM enderecos WHERE paciente_id IN "
+        "(SELECT id FROM pacientes WHERE deleted_at IS NOT NULL)"
+    )
+    op.execute("DELETE FROM pacientes WHERE deleted_at IS NOT NULL")
+    op.execute("DELETE FROM medicos WHERE deleted_at IS NOT NULL")
+
+    op.drop_index("ix_agendamentos_medico_id_data_ativo", table_name="agendamentos")
+    op.drop_index("ix_agendamentos_paciente_id_ativo", table_name="agendamentos")
+    op.drop_index("ix_medicos_nome_ativo", table_name="medicos")
+    op.drop_index("ix_pacientes_cns_ativo", table_name="pacientes")
+    op.drop_index("ix_pacientes_cpf_ativo", table_name="pacientes")
+    op.create_index(op.f("ix_medicos_nome"), "medicos", ["nome"], unique=True)
+    op.create_index(op.f("ix_pacientes_cns"), "pacientes", ["cns"], unique=True)
+    op.create_index(op.f("ix_pacientes_cpf"), "pacientes", ["cpf"], unique=True)
+    with op.batch_alter_table("medicos") as batch_op:
+        batch_op.create_unique_constraint(op.f("medicos_nome_key"), ["nome"])
+
+    for tabela in ("agendamentos", "medicos", "pacientes"):
+        with op.batch_alter_table(tabela) as batch_op:
+            batch_op.drop_column("deleted_at")
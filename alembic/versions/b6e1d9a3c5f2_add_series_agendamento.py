@@ -0,0 +1,101 @@
+# alembic/versions/b6e1d9a3c5f2_add_series_agendamento.py
+
+"""add_series_agendamento
+
+Cria as tabelas 'series_agendamento' (regras de agendamentos recorrentes,
+com índices parciais por paciente e por médico) e 'excecoes_serie'
+(ocorrências canceladas ou remarcadas, únicas por série e data).
+
+Revision ID: b6e1d9a3c5f2
+Revises: a4c7e2f9d1b8
+Create Date: 2026-10-19 20:48:26.904417
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "b6e1d9a3c5f2"
+down_revision: Union[str, None] = "a4c7e2f9d1b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APENAS_ATIVOS = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "series_agendamento",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("paciente_id", sa.Integer(), nullable=False),
+        sa.Column("medico_id", sa.Integer(), nullable=False),
+        sa.Column("especialidade", sa.VARCHAR(), nullable=False),
+        sa.Column("valor_consulta", sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column("descricao", sa.VARCHAR(), nullable=True),
+        sa.Column("frequencia", sa.VARCHAR(length=16), nullable=False),
+        sa.Column("intervalo", sa.Integer(), nullable=False),
+        sa.Column("data_inicio", sa.Date(), nullable=False),
+        sa.Column("data_fim", sa.Date(), nullable=True),
+        sa.Column("ocorrencias", sa.Integer(), nullable=True),
+        sa.Column("criado_em", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["medico_id"],
+            ["medicos.id"],
+            name=op.f("series_agendamento_medico_id_fkey"),
+        ),
+        sa.ForeignKeyConstraint(
+            ["paciente_id"],
+            ["pacientes.id"],
+            name=op.f("series_agendamento_paciente_id_fkey"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("series_agendamento_pkey")),
+    )
+    for nome, coluna in (
+        ("ix_series_agendamento_paciente_id_ativo", "paciente_id"),
+        ("ix_series_agendamento_medico_id_ativo", "medico_id"),
+    ):
+        op.create_index(
+            nome,
+            "series_agendamento",
+            [coluna],
+            unique=False,
+            postgresql_where=APENAS_ATIVOS,
+            sqlite_where=APENAS_ATIVOS,
+        )
+    op.create_table(
+        "excecoes_serie",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("serie_id", sa.Integer(), nullable=False),
+        sa.Column("data_original", sa.Date(), nullable=False),
+        sa.Column("agendamento_id", sa.Integer(), nullable=True),
+        sa.Column("criado_em", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["serie_id"],
+            ["series_agendamento.id"],
+            name=op.f("excecoes_serie_serie_id_fkey"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("excecoes_serie_pkey")),
+    )
+    op.create_index(
+        "ix_excecoes_serie_serie_id_data",
+        "excecoes_serie",
+        ["serie_id", "data_original"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_excecoes_serie_serie_id_data", table_name="excecoes_serie")
+    op.drop_table("excecoes_serie")
+    op.drop_index(
+        "ix_series_agendamento_medico_id_ativo", table_name="series_agendamento"
+    )
+    op.drop_index(
+        "ix_series_agendamento_paciente_id_ativo", table_name="series_agendamento"
+    )
+    op.drop_table("series_agendamento")
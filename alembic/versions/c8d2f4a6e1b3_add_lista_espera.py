@@ -0,0 +1,70 @@
+# alembic/versions/c8d2f4a6e1b3_add_lista_espera.py
+
+"""add_lista_espera
+
+Cria a tabela 'lista_espera' (pacientes aguardando vaga por especialidade),
+com o índice parcial `ix_lista_espera_fila` em (especialidade, prioridade,
+criado_em, id) sobre as entradas aguardando, usado no encaixe de vagas.
+
+Revision ID: c8d2f4a6e1b3
+Revises: b6e1d9a3c5f2
+Create Date: 2026-10-19 21:32:07.118254
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "c8d2f4a6e1b3"
+down_revision: Union[str, None] = "b6e1d9a3c5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APENAS_AGUARDANDO = sa.text("status = 'aguardando'")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "lista_espera",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("paciente_id", sa.Integer(), nullable=False),
+        sa.Column("especialidade", sa.VARCHAR(), nullable=False),
+        sa.Column("medico_id", sa.Integer(), nullable=True),
+        sa.Column("prioridade", sa.Integer(), nullable=False),
+        sa.Column("data_inicio", sa.Date(), nullable=True),
+        sa.Column("data_fim", sa.Date(), nullable=True),
+        sa.Column("status", sa.VARCHAR(length=16), nullable=False),
+        sa.Column("agendamento_id", sa.Integer(), nullable=True),
+        sa.Column("criado_em", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("atualizado_em", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["medico_id"], ["medicos.id"], name=op.f("lista_espera_medico_id_fkey")
+        ),
+        sa.ForeignKeyConstraint(
+            ["paciente_id"],
+            ["pacientes.id"],
+            name=op.f("lista_espera_paciente_id_fkey"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("lista_espera_pkey")),
+    )
+    op.create_index(
+        "ix_lista_espera_paciente_id", "lista_espera", ["paciente_id"], unique=False
+    )
+    op.create_index(
+        "ix_lista_espera_fila",
+        "lista_espera",
+        ["especialidade", "prioridade", "criado_em", "id"],
+        unique=False,
+        postgresql_where=APENAS_AGUARDANDO,
+        sqlite_where=APENAS_AGUARDANDO,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_lista_espera_fila", table_name="lista_espera")
+    op.drop_index("ix_lista_espera_paciente_id", table_name="lista_espera")
+    op.drop_table("lista_espera")
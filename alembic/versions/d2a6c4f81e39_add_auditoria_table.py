@@ -0,0 +1,89 @@
+# alembic/versions/d2a6c4f81e39_add_auditoria_table.py
+
+"""add_auditoria_table
+
+Cria a tabela 'auditoria' (somente inserção) com índice em
+(entidade, entidade_id, ocorrido_em). No PostgreSQL a tabela é particionada
+por faixa (RANGE) mensal de 'ocorrido_em', com partições do mês atual e dos
+próximos meses e uma partição DEFAULT; as seguintes são criadas por
+`python -m app.tools.particoes --tabela auditoria criar`.
+
+Revision ID: d2a6c4f81e39
+Revises: b5d83f0e2a47
+Create Date: 2026-10-19 16:41:15.207533
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "d2a6c4f81e39"
+down_revision: Union[str, None] = "b5d83f0e2a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MESES_FUTUROS = 3
+
+
+def _proximo_mes(mes: date) -> date:
+    return date(mes.year + mes.month // 12, mes.month % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.create_table(
+            "auditoria",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("ocorrido_em", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("ator_id", sa.Integer(), nullable=True),
+            sa.Column("ator_email", sa.VARCHAR(length=255), nullable=True),
+            sa.Column("acao", sa.VARCHAR(length=16), nullable=False),
+            sa.Column("entidade", sa.VARCHAR(length=32), nullable=False),
+            sa.Column("entidade_id", sa.Integer(), nullable=False),
+            sa.Column("diff", sa.JSON(), nullable=True),
+            sa.PrimaryKeyConstraint("id", name=op.f("auditoria_pkey")),
+        )
+    else:
+        op.execute(
+            """
+            CREATE TABLE auditoria (
+                id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+                ocorrido_em TIMESTAMP WITH TIME ZONE NOT NULL,
+                ator_id INTEGER,
+                ator_email VARCHAR(255),
+                acao VARCHAR(16) NOT NULL,
+                entidade VARCHAR(32) NOT NULL,
+                entidade_id INTEGER NOT NULL,
+                diff JSONB,
+                CONSTRAINT auditoria_pkey PRIMARY KEY (id, ocorrido_em)
+            ) PARTITION BY RANGE (ocorrido_em)
+            """
+        )
+        mes = date.today().replace(day=1)
+        for _ in range(MESES_FUTUROS + 1):
+            seguinte = _proximo_mes(mes)
+            op.execute(
+                f"CREATE TABLE auditoria_p{mes:%Y%m} PARTITION OF auditoria "
+                f"FOR VALUES FROM ('{mes.isoformat()}') TO ('{seguinte.isoformat()}')"
+            )
+            mes = seguinte
+        op.execute("CREATE TABLE auditoria_default PARTITION OF auditoria DEFAULT")
+
+    op.create_index(
+        "ix_auditoria_entidade_id_tempo",
+        "auditoria",
+        ["entidade", "entidade_id", "ocorrido_em"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_auditoria_entidade_id_tempo", table_name="auditoria")
+    # No PostgreSQL remove também todas as partições
+    op.drop_table("auditoria")
@@ -0,0 +1,62 @@
+# alembic/versions/d4f6a8c0e2b5_add_carga_medicos.py
+
+"""add_carga_medicos
+
+Cria a tabela 'carga_medicos' (agendamentos ativos por médico e dia, usada na
+distribuição automática de médicos) já preenchida a partir dos agendamentos
+existentes, e o índice parcial de médicos ativos por especialidade.
+
+Revision ID: d4f6a8c0e2b5
+Revises: c8d2f4a6e1b3
+Create Date: 2026-10-19 22:10:44.502871
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "d4f6a8c0e2b5"
+down_revision: Union[str, None] = "c8d2f4a6e1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APENAS_ATIVOS = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "carga_medicos",
+        sa.Column("medico_id", sa.Integer(), nullable=False),
+        sa.Column("data", sa.Date(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["medico_id"], ["medicos.id"], name=op.f("carga_medicos_medico_id_fkey")
+        ),
+        sa.PrimaryKeyConstraint("medico_id", "data", name=op.f("carga_medicos_pkey")),
+    )
+    op.execute(
+        """
+        INSERT INTO carga_medicos (medico_id, data, total)
+        SELECT medico_id, data_primeira_consulta, COUNT(*)
+        FROM agendamentos
+        WHERE deleted_at IS NULL
+        GROUP BY medico_id, data_primeira_consulta
+        """
+    )
+    op.create_index(
+        "ix_medicos_especialidade_ativo",
+        "medicos",
+        ["especialidade"],
+        unique=False,
+        postgresql_where=APENAS_ATIVOS,
+        sqlite_where=APENAS_ATIVOS,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_medicos_especialidade_ativo", table_name="medicos")
+    op.drop_table("carga_medicos")
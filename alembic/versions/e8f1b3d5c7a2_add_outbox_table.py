@@ -0,0 +1,56 @@
+# alembic/versions/e8f1b3d5c7a2_add_outbox_table.py
+
+"""add_outbox_table
+
+Cria a tabela 'outbox' (transactional outbox) lida pelo feed GET /changes,
+com índice em (transacao, seq) — a ordem de entrega do feed.
+
+Revision ID: e8f1b3d5c7a2
+Revises: d2a6c4f81e39
+Create Date: 2026-10-19 17:55:42.931064
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "e8f1b3d5c7a2"
+down_revision: Union[str, None] = "d2a6c4f81e39"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "outbox",
+        sa.Column(
+            "seq",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            autoincrement=True,
+            nullable=False,
+        ),
+        sa.Column("transacao", sa.BigInteger(), nullable=False),
+        sa.Column("ocorrido_em", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("entidade", sa.VARCHAR(length=32), nullable=False),
+        sa.Column("entidade_id", sa.Integer(), nullable=False),
+        sa.Column("operacao", sa.VARCHAR(length=16), nullable=False),
+        sa.Column(
+            "dados",
+            sa.JSON().with_variant(postgresql.JSONB(), "postgresql"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("seq", name=op.f("outbox_pkey")),
+    )
+    op.create_index(
+        "ix_outbox_transacao_seq", "outbox", ["transacao", "seq"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_outbox_transacao_seq", table_name="outbox")
+    op.drop_table("outbox")
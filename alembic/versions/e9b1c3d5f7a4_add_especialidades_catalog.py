@@ -0,0 +1,205 @@
+# alembic/versions/e9b1c3d5f7a4_add_especialidades_catalog.py
+
+"""add_especialidades_catalog
+
+Cria o catálogo 'especialidades' (nome de exibição e chave normalizada, sem
+acentos e em minúsculas) e a coluna `especialidade_id` em medicos,
+agendamentos, series_agendamento e lista_espera.
+
+O preenchimento agrupa as grafias existentes pela chave: a grafia mais usada
+(no empate, a que mistura maiúsculas e minúsculas) vira o nome do catálogo, e
+a coluna de texto `especialidade` passa a guardá-lo ("cardiologia" e
+"Cardiologia" tornam-se a mesma especialidade). Os índices por especialidade
+passam a usar o ID.
+
+Revision ID: e9b1c3d5f7a4
+Revises: d4f6a8c0e2b5
+Create Date: 2026-10-19 22:58:16.730429
+
+"""
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "e9b1c3d5f7a4"
+down_revision: Union[str, None] = "d4f6a8c0e2b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APENAS_ATIVOS = sa.text("deleted_at IS NULL")
+APENAS_AGUARDANDO = sa.text("status = 'aguardando'")
+
+TABELAS = ("medicos", "agendamentos", "series_agendamento", "lista_espera")
+
+
+def _chave(nome: str) -> str:
+    # Cópia de app.especialidades.chave: a migração não depende do código da app
+    sem_acentos = "".join(
+        caractere
+        for caractere in unicodedata.normalize("NFKD", nome)
+        if not unicodedata.combining(caractere)
+    )
+    return " ".join(sem_acentos.casefold().split())
+
+
+def _nome_preferido(variantes: Counter) -> str:
+    # A grafia mais usada; no empate, a que não está toda em maiúsculas/minúsculas
+    return max(
+        variantes,
+        key=lambda v: (variantes[v], not v.isupper() and not v.islower(), v),
+    )
+
+
+def _preencher() -> None:
+    conexao = op.get_bind()
+    usos: Dict[str, Counter] = defaultdict(Counter)
+    for tabela in TABELAS:
+        for variante, total in conexao.execute(
+            sa.text(
+                f"SELECT especialidade, COUNT(*) FROM {tabela} GROUP BY especialidade"
+            )
+        ):
+            usos[_chave(variante)][variante] += total
+    if not usos:
+        return
+
+    especialidades = sa.table(
+        "especialidades", sa.column("id"), sa.column("nome"), sa.column("chave")
+    )
+    nomes = {
+        chave: " ".join(_nome_preferido(variantes).split())
+        for chave, variantes in usos.items()
+    }
+    conexao.execute(
+        especialidades.insert(),
+        [{"nome": nome, "chave": chave} for chave, nome in sorted(nomes.items())],
+    )
+    ids = {
+        chave: especialidade_id
+        for chave, especialidade_id in conexao.execute(
+            sa.select(especialidades.c.chave, especialidades.c.id)
+        )
+    }
+
+    # Tabela auxiliar grafia -> (ID, nome): um UPDATE por tabela, em uma passada
+    variantes = op.create_table(
+        "especialidades_variantes",
+        sa.Column("variante", sa.String(), primary_key=True),
+        sa.Column("especialidade_id", sa.Integer(), nullable=False),
+        sa.Column("nome", sa.String(), nullable=False),
+    )
+    op.bulk_insert(
+        variantes,
+        [
+            {"variante": variante, "especialidade_id": ids[chave], "nome": nomes[chave]}
+            for chave, contagem in usos.items()
+            for variante in contagem
+        ],
+    )
+    for tabela in TABELAS:
+        op.execute(
+            f"""
+            UPDATE {tabela} SET
+                especialidade_id = (
+                    SELECT v.especialidade_id FROM especialidades_variantes v
+                    WHERE v.variante = {tabela}.especialidade
+                ),
+                especialidade = (
+                    SELECT v.nome FROM especialidades_variantes v
+                    WHERE v.variante = {tabela}.especialidade
+                )
+            """
+        )
+    op.drop_table("especialidades_variantes")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "especialidades",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("nome", sa.String(), nullable=False),
+        sa.Column("chave", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("especialidades_pkey")),
+    )
+    op.create_index(
+        op.f("ix_especialidades_chave"), "especialidades", ["chave"], unique=True
+    )
+    for tabela in TABELAS:
+        # Lote: o SQLite não cria a chave estrangeira com ALTER TABLE
+        with op.batch_alter_table(tabela) as batch_op:
+            batch_op.add_column(
+                sa.Column("especialidade_id", sa.Integer(), nullable=True)
+            )
+            batch_op.create_foreign_key(
+                op.f(f"{tabela}_especialidade_id_fkey"),
+                "especialidades",
+                ["especialidade_id"],
+                ["id"],
+            )
+    _preencher()
+    if op.get_bind().dialect.name == "postgresql":
+        for tabela in TABELAS:
+            op.alter_column(tabela, "especialidade_id", nullable=False)
+
+    op.drop_index("ix_medicos_especialidade_ativo", table_name="medicos")
+    op.create_index(
+        "ix_medicos_especialidade_id_ativo",
+        "medicos",
+        ["especialidade_id"],
+        unique=False,
+        postgresql_where=APENAS_ATIVOS,
+        sqlite_where=APENAS_ATIVOS,
+    )
+    op.create_index(
+        "ix_agendamentos_especialidade_id_ativo",
+        "agendamentos",
+        ["especialidade_id"],
+        unique=False,
+        postgresql_where=APENAS_ATIVOS,
+        sqlite_where=APENAS_ATIVOS,
+    )
+    op.drop_index("ix_lista_espera_fila", table_name="lista_espera")
+    op.create_index(
+        "ix_lista_espera_fila",
+        "lista_espera",
+        ["especialidade_id", "prioridade", "criado_em", "id"],
+        unique=False,
+        postgresql_where=APENAS_AGUARDANDO,
+        sqlite_where=APENAS_AGUARDANDO,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_lista_espera_fila", table_name="lista_espera")
+    op.drop_index("ix_agendamentos_especialidade_id_ativo", table_name="agendamentos")
+    op.drop_index("ix_medicos_especialidade_id_ativo", table_name="medicos")
+    for tabela in TABELAS:
+        with op.batch_alter_table(tabela) as batch_op:
+            batch_op.drop_constraint(
+                op.f(f"{tabela}_especialidade_id_fkey"), type_="foreignkey"
+            )
+            batch_op.drop_column("especialidade_id")
+    op.create_index(
+        "ix_lista_espera_fila",
+        "lista_espera",
+        ["especialidade", "prioridade", "criado_em", "id"],
+        unique=False,
+        postgresql_where=APENAS_AGUARDANDO,
+        sqlite_where=APENAS_AGUARDANDO,
+    )
+    op.create_index(
+        "ix_medicos_especialidade_ativo",
+        "medicos",
+        ["especialidade"],
+        unique=False,
+        postgresql_where=APENAS_ATIVOS,
+        sqlite_where=APENAS_ATIVOS,
+    )
+    op.drop_index(op.f("ix_especialidades_chave"), table_name="especialidades")
+    op.drop_table("especialidades")
@@ -0,0 +1,70 @@
+# alembic/versions/f3a9c1e7b5d4_add_lembretes_enviados.py
+
+"""add_lembretes_enviados
+
+Cria a tabela 'lembretes_enviados' (lembretes de consulta já enviados, únicos
+por agendamento e data) e o índice parcial em
+agendamentos.data_proxima_consulta usado pelo agendador de lembretes para
+carregar a janela de consultas próximas.
+
+Revision ID: f3a9c1e7b5d4
+Revises: e8f1b3d5c7a2
+Create Date: 2026-10-19 19:12:37.418206
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "f3a9c1e7b5d4"
+down_revision: Union[str, None] = "e8f1b3d5c7a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APENAS_ATIVOS = sa.text("deleted_at IS NULL")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_agendamentos_data_proxima_ativo",
+        "agendamentos",
+        ["data_proxima_consulta"],
+        unique=False,
+        postgresql_where=APENAS_ATIVOS,
+        sqlite_where=APENAS_ATIVOS,
+    )
+    op.create_table(
+        "lembretes_enviados",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("agendamento_id", sa.Integer(), nullable=False),
+        sa.Column("data_consulta", sa.Date(), nullable=False),
+        sa.Column("enviado_em", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("lembretes_enviados_pkey")),
+    )
+    op.create_index(
+        "ix_lembretes_enviados_agendamento_data",
+        "lembretes_enviados",
+        ["agendamento_id", "data_consulta"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_lembretes_enviados_data_consulta"),
+        "lembretes_enviados",
+        ["data_consulta"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_lembretes_enviados_data_consulta"), table_name="lembretes_enviados"
+    )
+    op.drop_index(
+        "ix_lembretes_enviados_agendamento_data", table_name="lembretes_enviados"
+    )
+    op.drop_table("lembretes_enviados")
+    op.drop_index("ix_agendamentos_data_proxima_ativo", table_name="agendamentos")
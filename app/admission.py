@@ -0,0 +1,219 @@
+# app/admission.py
+
+"""
+Controle de admissão e descarte de carga (load shedding).
+
+Cada requisição é classificada em uma classe de rota (auth, writes, reads,
+reports), cada uma com um limite de requisições simultâneas e um orçamento de
+espera em fila. Quando a espera estimada excede o orçamento — ou a requisição
+não é admitida dentro dele — a resposta é 503 com `Retry-After`, em vez de
+deixar a requisição esperar por uma conexão do `SessionLocal` até o cliente
+desistir (e repetir, piorando o pico).
+
+Prioridade: além do limite por classe, há um limite global do worker; classes
+de menor prioridade só usam uma fração dele (ADMISSION_PRIORITY_SHARES), de
+modo que login e agendamentos mantêm capacidade reservada sobre relatórios e
+exportações.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import settings
+
+# ====================================================================================
+# ===== --- Constantes ---                                                       =====
+# ====================================================================================
+
+AUTH = "auth"
+WRITES = "writes"
+READS = "reads"
+REPORTS = "reports"
+
+_METODOS_LEITURA = {"GET", "HEAD", "OPTIONS"}
+
+# Peso da última amostra na média móvel do tempo de serviço de cada classe
+_ALFA_MEDIA = 0.2
+
+
+def classificar(metodo: str, caminho: str) -> Optional[str]:
+    """Classe de admissão da requisição; None para rotas isentas (probes, streams)."""
+    if caminho in settings.ADMISSION_EXEMPT_PATHS or caminho.endswith(
+        tuple(settings.LONG_LIVED_PATH_SUFFIXES)
+    ):
+        return None
+    if caminho == "/auth/token":
+        return AUTH
+    if any(caminho.startswith(prefixo) for prefixo in settings.ADMISSION_REPORT_PATHS):
+        return REPORTS
+    if metodo in _METODOS_LEITURA:
+        return READS
+    return WRITES
+
+
+# ====================================================================================
+# ===== --- Controlador ---                                                      =====
+# ====================================================================================
+
+
+class _Classe:
+    """Estado de uma classe de rota: vagas em uso, fila e tempo médio de serviço."""
+
+    def __init__(self, nome: str, limite: int, orcamento: float, prioridade: int):
+        self.nome = nome
+        self.limite = limite
+        self.orcamento = orcamento
+        self.prioridade = prioridade
+        self.em_uso = 0
+        self.fila: Deque[asyncio.Future] = deque()
+        self.tempo_medio = 0.05
+        self.descartadas = 0
+
+
+class ControleDeAdmissao:
+    """
+    Semáforos com fila por classe e limite global por prioridade.
+
+    Opera apenas no event loop do worker (sem threads), então não usa travas.
+    """
+
+    def __init__(self) -> None:
+        self.classes: Dict[str, _Classe] = {
+            nome: _Classe(
+                nome,
+                settings.ADMISSION_LIMITS[nome],
+                settings.ADMISSION_QUEUE_BUDGET_SECONDS[nome],
+                settings.ADMISSION_PRIORITIES[nome],
+            )
+            for nome in (AUTH, WRITES, READS, REPORTS)
+        }
+        self._por_prioridade = sorted(
+            self.classes.values(), key=lambda classe: classe.prioridade
+        )
+        self.em_uso_total = 0
+
+    def _pode_admitir(self, classe: _Classe) -> bool:
+        fatia = settings.ADMISSION_PRIORITY_SHARES[classe.prioridade]
+        return (
+            classe.em_uso < classe.limite
+            and self.em_uso_total < settings.ADMISSION_GLOBAL_LIMIT * fatia
+        )
+
+    def _ocupar(self, classe: _Classe) -> None:
+        classe.em_uso += 1
+        self.em_uso_total += 1
+
+    def espera_estimada(self, classe: _Classe) -> float:
+        """Espera estimada (s) para uma nova requisição entrar na classe."""
+        return (len(classe.fila) + 1) * classe.tempo_medio / classe.limite
+
+    async def admitir(self, classe: _Classe) -> bool:
+        """
+        Admite a requisição, aguardando na fila da classe se necessário.
+
+        Returns:
+            True se admitida (e `liberar` deve ser chamado ao final); False se
+            a espera estimada ou real exceder o orçamento da classe.
+        """
+        if not classe.fila and self._pode_admitir(classe):
+            self._ocupar(classe)
+            return True
+        if self.espera_estimada(classe) > classe.orcamento:
+            classe.descartadas += 1
+            return False
+
+        vaga = asyncio.get_running_loop().create_future()
+        classe.fila.append(vaga)
+        try:
+            return await asyncio.wait_for(vaga, timeout=classe.orcamento)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            # A vaga pode ter sido concedida no mesmo instante do timeout ou
+            # do cancelamento: devolve-a para não vazar capacidade.
+            if vaga.done() and not vaga.cancelled():
+                self.liberar(classe, None)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            classe.descartadas += 1
+            return False
+        finally:
+            if vaga in classe.fila:
+                classe.fila.remove(vaga)
+
+    def liberar(self, classe: _Classe, duracao: Optional[float]) -> None:
+        """Devolve a vaga e admite quem estiver na fila, por prioridade."""
+        classe.em_uso -= 1
+        self.em_uso_total -= 1
+        if duracao is not None:
+            classe.tempo_medio += _ALFA_MEDIA * (duracao - classe.tempo_medio)
+        for candidata in self._por_prioridade:
+            while candidata.fila and self._pode_admitir(candidata):
+                vaga = candidata.fila.popleft()
+                if vaga.done():
+                    continue
+                self._ocupar(candidata)
+                vaga.set_result(True)
+
+
+# ====================================================================================
+# ===== --- Middleware de Admissão ---                                           =====
+# ====================================================================================
+
+
+class AdmissionControlMiddleware:
+    """Aplica o controle de admissão a cada requisição HTTP."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.controle = ControleDeAdmissao()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        nome = classificar(scope["method"], scope["path"])
+        if nome is None:
+            await self.app(scope, receive, send)
+            return
+
+        classe = self.controle.classes[nome]
+        if not await self.controle.admitir(classe):
+            await self._recusar(send)
+            return
+        inicio = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controle.liberar(classe, time.monotonic() - inicio)
+
+    @staticmethod
+    async def _recusar(send: Send) -> None:
+        # Retry-After com variação aleatória evita que os clientes recusados
+        # voltem todos no mesmo segundo.
+        base = settings.ADMISSION_RETRY_AFTER_SECONDS
+        retry_after = base + random.randint(0, base)
+        corpo = json.dumps(
+            {"detail": "Servidor sobrecarregado. Tente novamente em instantes."},
+            ensure_ascii=False,
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(corpo)).encode()),
+                    (b"retry-after", str(retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": corpo})
@@ -0,0 +1,247 @@
+# app/auditoria.py
+
+"""
+Trilha de auditoria (LGPD) de leituras e alterações de pacientes e agendamentos.
+
+As funções do `crud` chamam `registrar(...)`, que apenas monta o evento (ator,
+ação, entidade, id, diff) e o coloca em uma fila limitada em memória — sem
+INSERT no caminho da requisição. Uma thread de fundo agrupa os eventos e os
+grava na tabela 'auditoria' com um único INSERT de múltiplas linhas por lote.
+
+O ator vem de uma ContextVar preenchida por `get_current_user`, visível também
+nas rotas síncronas executadas no threadpool.
+
+Contrapressão: com a fila cheia, quem registra espera até
+AUDIT_ENQUEUE_TIMEOUT_SECONDS por espaço e, persistindo a lotação, grava o
+próprio evento de forma síncrona — a requisição fica mais lenta, mas nenhum
+evento é descartado. No encerramento da aplicação a fila é esvaziada antes de
+o processo terminar.
+
+A gravação síncrona acontece depois do commit da alteração auditada; se ela
+falhar, os eventos vão para o log de erros em vez de a exceção chegar a quem
+chamou — a escrita já confirmada não se torna um erro.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import json
+import logging
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from . import models
+from .config import settings
+from .database import engine
+
+logger = logging.getLogger(__name__)
+
+# ====================================================================================
+# ===== --- Constantes ---                                                       =====
+# ====================================================================================
+
+LER = "ler"
+CRIAR = "criar"
+ATUALIZAR = "atualizar"
+REMOVER = "remover"
+
+PACIENTE = "paciente"
+AGENDAMENTO = "agendamento"
+MEDICO = "medico"
+SERIE = "serie_agendamento"
+
+# Novas tentativas de gravação de um lote antes de desistir (e registrá-lo no log)
+_ESPERAS_NOVA_TENTATIVA = (0.5, 1.0, 2.0)
+
+Evento = Dict[str, Any]
+
+# (id, e-mail) do usuário autenticado na requisição atual
+_ator: ContextVar[Optional[Tuple[int, str]]] = ContextVar(
+    "ator_auditoria", default=None
+)
+
+
+# ====================================================================================
+# ===== --- Registro de Eventos ---                                              =====
+# ====================================================================================
+
+
+def definir_ator(usuario: models.User) -> None:
+    """Define o usuário autenticado como ator dos eventos da requisição atual."""
+    _ator.set((usuario.id, usuario.email))
+
+
+def registrar(
+    acao: str, entidade: str, entidade_id: int, diff: Optional[Dict] = None
+) -> None:
+    """
+    Registra um evento de auditoria sem gravá-lo no caminho da requisição.
+
+    Args:
+        acao: LER, CRIAR, ATUALIZAR ou REMOVER.
+        entidade: PACIENTE, AGENDAMENTO ou SERIE.
+        entidade_id: O ID do registro afetado.
+        diff: Os valores gravados, nas criações e alterações.
+    """
+    registrar_varios(acao, entidade, (entidade_id,), diff)
+
+
+def registrar_varios(
+    acao: str, entidade: str, entidade_ids: Iterable[int], diff: Optional[Dict] = None
+) -> None:
+    """Registra o mesmo evento para vários registros (leituras e operações em lote)."""
+    if not settings.AUDIT_ENABLED:
+        return
+    ator_id, ator_email = _ator.get() or (None, None)
+    agora = datetime.now(timezone.utc)
+    eventos = [
+        {
+            "ocorrido_em": agora,
+            "ator_id": ator_id,
+            "ator_email": ator_email,
+            "acao": acao,
+            "entidade": entidade,
+            "entidade_id": entidade_id,
+            "diff": diff,
+        }
+        for entidade_id in entidade_ids
+    ]
+    if not eventos:
+        return
+    gravador = _gravador
+    if gravador is None:
+        # Fora da aplicação (scripts) ou após o encerramento: grava na hora
+        _gravar_ou_registrar_falha(eventos)
+        return
+    for evento in eventos:
+        gravador.enfileirar(evento)
+
+
+def gravar(eventos: List[Evento]) -> None:
+    """Grava os eventos com um único INSERT de múltiplas linhas."""
+    linhas = [{**evento, "diff": _serializavel(evento["diff"])} for evento in eventos]
+    with engine.begin() as conexao:
+        conexao.execute(insert(models.RegistroAuditoria).values(linhas))
+
+
+def _gravar_ou_registrar_falha(eventos: List[Evento]) -> None:
+    # Gravação síncrona, após o commit de quem chamou: uma falha aqui não
+    # pode transformar em erro uma escrita já confirmada
+    try:
+        gravar(eventos)
+    except Exception:
+        logger.exception(
+            "Falha ao gravar %d evento(s) de auditoria: %s",
+            len(eventos),
+            json.dumps(eventos, default=str),
+        )
+
+
+def _serializavel(diff: Optional[Dict]) -> Optional[Dict]:
+    # Datas e Decimals viram texto; o diff é guardado como JSON
+    return None if diff is None else json.loads(json.dumps(diff, default=str))
+
+
+# ====================================================================================
+# ===== --- Gravação em Segundo Plano ---                                        =====
+# ====================================================================================
+
+
+class GravadorDeAuditoria:
+    """Thread de fundo que esvazia a fila de eventos em lotes."""
+
+    def __init__(self, tamanho_fila: int, tamanho_lote: int, intervalo: float) -> None:
+        self.fila: "queue.Queue[Optional[Evento]]" = queue.Queue(tamanho_fila)
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.gravados = 0
+        self.gravados_na_requisicao = 0
+        self._thread = threading.Thread(
+            target=self._executar, name="gravador-de-auditoria", daemon=True
+        )
+        self._thread.start()
+
+    def enfileirar(self, evento: Evento) -> None:
+        """Enfileira o evento; com a fila cheia, espera e, por fim, grava-o direto."""
+        try:
+            self.fila.put(evento, timeout=settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS)
+        except queue.Full:
+            self.gravados_na_requisicao += 1
+            _gravar_ou_registrar_falha([evento])
+
+    def encerrar(self) -> None:
+        """Grava os eventos pendentes e encerra a thread."""
+        self.fila.put(None)
+        self._thread.join()
+
+    def _executar(self) -> None:
+        while True:
+            evento = self.fila.get()
+            if evento is None:
+                return
+            lote = [evento]
+            # Acumula eventos por até `intervalo` segundos para lotes maiores
+            prazo = time.monotonic() + self.intervalo
+            encerrar = False
+            while len(lote) < self.tamanho_lote:
+                restante = prazo - time.monotonic()
+                try:
+                    proximo = (
+                        self.fila.get(timeout=restante)
+                        if restante > 0
+                        else self.fila.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if proximo is None:
+                    encerrar = True
+                    break
+                lote.append(proximo)
+            self._gravar_com_novas_tentativas(lote)
+            if encerrar:
+                return
+
+    def _gravar_com_novas_tentativas(self, lote: List[Evento]) -> None:
+        for espera in (*_ESPERAS_NOVA_TENTATIVA, None):
+            try:
+                gravar(lote)
+                self.gravados += len(lote)
+                return
+            except Exception:
+                if espera is None:
+                    logger.exception(
+                        "Falha ao gravar %d evento(s) de auditoria: %s",
+                        len(lote),
+                        json.dumps(lote, default=str),
+                    )
+                    return
+                time.sleep(espera)
+
+
+_gravador: Optional[GravadorDeAuditoria] = None
+
+
+def iniciar_gravador() -> None:
+    """Inicia a thread de gravação (chamado no lifespan da aplicação)."""
+    global _gravador
+    if settings.AUDIT_ENABLED and _gravador is None:
+        _gravador = GravadorDeAuditoria(
+            settings.AUDIT_QUEUE_SIZE,
+            settings.AUDIT_BATCH_SIZE,
+            settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        )
+
+
+def encerrar_gravador() -> None:
+    """Grava todos os eventos pendentes e encerra a thread de gravação."""
+    global _gravador
+    gravador, _gravador = _gravador, None
+    if gravador is not None:
+        gravador.encerrar()
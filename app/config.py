@@ -3,6 +3,9 @@
 # ====================================================================================
 # ===== --- Importações ---                                                      =====
 # ====================================================================================
+import logging
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -25,6 +28,160 @@ class Settings(BaseSettings):
     APP_NAME: str = "API de Agendamentos Médicos"
     APP_VERSION: str = "0.1.0"
 
+    # Chaves de Idempotência (header Idempotency-Key em requisições POST)
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 300
+    IDEMPOTENCY_EXCLUDED_PATHS: list[str] = ["/auth/token"]
+
+    # Consultas em lote (GET /pacientes/?ids=..., GET /medicos/?ids=...)
+    BATCH_MAX_IDS: int = 500
+
+    # Operações em lote de agendamentos (POST /agendamentos/bulk)
+    BULK_MAX_ITENS: int = 1000
+
+    # Janela máxima (dias) dos calendários, que expandem as séries recorrentes
+    CALENDAR_MAX_DAYS: int = 366
+
+    # Distribuição automática de médicos (POST /agendamentos/ sem medico_id):
+    # menor carga em ±AUTO_ASSIGN_WINDOW_DAYS dias, até AUTO_ASSIGN_MAX_PER_DAY
+    # consultas por dia; o médico anterior do paciente tem preferência se sua
+    # carga exceder a menor em até AUTO_ASSIGN_CONTINUITY_SLACK consultas
+    AUTO_ASSIGN_WINDOW_DAYS: int = 7
+    AUTO_ASSIGN_MAX_PER_DAY: int = 20
+    AUTO_ASSIGN_CONTINUITY_SLACK: int = 2
+
+    # Lista de espera: vagas de agendamentos removidos são oferecidas à fila;
+    # entradas confirmadas ou canceladas são expurgadas após a retenção
+    WAITLIST_MATCHING_ENABLED: bool = True
+    WAITLIST_RETENTION_DAYS: int = 30
+
+    # Profiling por amostragem (header X-Profile e /admin/profiling)
+    PROFILING_ENABLED: bool = False
+    PROFILING_INTERVAL_SECONDS: float = 0.005
+    PROFILING_REQUEST_INTERVAL_SECONDS: float = 0.001
+    PROFILING_MAX_SECONDS: int = 60
+    PROFILING_TOKEN_TTL_SECONDS: int = 600
+
+    # Tracing local (spans de JWT, usuário, SQL, validação e bcrypt)
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 1.0
+    TRACING_EXPORTER: Literal["file", "otlp"] = "file"
+    TRACING_FILE: str = "traces.jsonl"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_QUEUE_SIZE: int = 1000
+
+    # Verificação da revisão do alembic na inicialização ("error", "warn" ou "off")
+    MIGRATIONS_CHECK: Literal["error", "warn", "off"] = "error"
+
+    # Health checks (/healthz e /readyz)
+    HEALTH_DB_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_CACHE_SECONDS: float = 2.0
+    HEALTH_POOL_SATURATION_MAX: float = 0.9
+
+    # Controle de admissão (limites simultâneos e orçamento de fila por classe)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_LIMITS: dict[str, int] = {
+        "auth": 4,
+        "writes": 10,
+        "reads": 15,
+        "reports": 2,
+    }
+    ADMISSION_QUEUE_BUDGET_SECONDS: dict[str, float] = {
+        "auth": 3.0,
+        "writes": 2.0,
+        "reads": 1.0,
+        "reports": 0.5,
+    }
+    # Prioridade 0 é a mais alta; a fatia do limite global que cada uma pode usar
+    ADMISSION_PRIORITIES: dict[str, int] = {
+        "auth": 0,
+        "writes": 0,
+        "reads": 1,
+        "reports": 2,
+    }
+    ADMISSION_PRIORITY_SHARES: list[float] = [1.0, 0.8, 0.5]
+    ADMISSION_GLOBAL_LIMIT: int = 24
+    ADMISSION_RETRY_AFTER_SECONDS: int = 2
+    ADMISSION_REPORT_PATHS: list[str] = ["/admin", "/changes", "/sync"]
+    ADMISSION_EXEMPT_PATHS: list[str] = [
+        "/",
+        "/healthz",
+        "/readyz",
+        "/docs",
+        "/redoc",
+        "/openapi.json",
+    ]
+
+    # Prazos por requisição (header X-Request-Timeout ou padrão da rota), em
+    # segundos, propagados ao banco como statement_timeout
+    REQUEST_TIMEOUT_ENABLED: bool = True
+    REQUEST_TIMEOUT_DEFAULT_SECONDS: float = 15.0
+    REQUEST_TIMEOUT_MAX_SECONDS: float = 120.0
+    REQUEST_TIMEOUT_ROUTES: dict[str, float] = {
+        "POST /auth/token": 5.0,
+        "/agendamentos/bulk": 60.0,
+        "/admin": 120.0,
+    }
+
+    # Remoção lógica: registros removidos são apagados fisicamente, em lotes,
+    # depois do período de retenção
+    SOFT_DELETE_RETENTION_DAYS: int = 30
+    SOFT_DELETE_PURGE_INTERVAL_SECONDS: int = 3600
+    SOFT_DELETE_PURGE_BATCH: int = 500
+
+    # Auditoria (LGPD): eventos enfileirados em memória e gravados em lote
+    AUDIT_ENABLED: bool = True
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = 0.5
+
+    # Outbox de mudanças (feed GET /changes)
+    OUTBOX_RETENTION_DAYS: int = 7
+    CHANGES_MAX_LIMIT: int = 1000
+
+    # Sincronização incremental (GET /sync); tokens devem expirar antes de o
+    # outbox ser expurgado (OUTBOX_RETENTION_DAYS)
+    SYNC_PAGE_SIZE: int = 500
+    SYNC_TOKEN_MAX_AGE_DAYS: int = 6
+
+    # Lembretes de consulta (data_proxima_consulta): enviados REMINDER_DAYS_BEFORE
+    # dias antes, às REMINDER_SEND_HOUR horas (horário local do servidor)
+    REMINDERS_ENABLED: bool = True
+    REMINDER_DAYS_BEFORE: int = 1
+    REMINDER_SEND_HOUR: int = 9
+    REMINDER_WINDOW_DAYS: int = 3
+    REMINDER_RELOAD_INTERVAL_SECONDS: int = 300
+    REMINDER_BATCH_SIZE: int = 200
+    REMINDER_RETRY_SECONDS: float = 30.0
+    REMINDER_NOTIFIER: Literal["file", "log"] = "file"
+    REMINDER_FILE: str = "lembretes.jsonl"
+    # Chave do advisory lock que elege o worker responsável pelos lembretes
+    REMINDER_LOCK_KEY: int = 4520
+
+    # Fila de jobs (python -m app.worker): reserva renovada a cada progresso e
+    # novas tentativas com espera exponencial
+    JOBS_POLL_INTERVAL_SECONDS: float = 1.0
+    JOBS_LEASE_SECONDS: int = 300
+    JOBS_MAX_ATTEMPTS: int = 5
+    JOBS_BACKOFF_BASE_SECONDS: float = 10.0
+    JOBS_BACKOFF_MAX_SECONDS: float = 900.0
+    JOBS_OUTPUT_DIR: str = "exports"
+    JOBS_RETENTION_DAYS: int = 7
+
+    # Respostas maiores que este tamanho (bytes) são compactadas com gzip
+    GZIP_MINIMUM_SIZE: int = 1000
+
+    # Streams SSE da agenda dos médicos (GET /medicos/{id}/agenda/stream); o
+    # canal do LISTEN/NOTIFY entrega as mudanças a todos os workers
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+    SSE_RETRY_MILLISECONDS: int = 3000
+    SSE_QUEUE_SIZE: int = 100
+    PUBSUB_CHANNEL: str = "agenda"
+    # Conexões de longa duração: sem vaga de admissão e sem prazo por requisição
+    LONG_LIVED_PATH_SUFFIXES: list[str] = ["/stream"]
+
     # Configuração para Pydantic-Settings
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
@@ -34,5 +191,10 @@ class Settings(BaseSettings):
 # Instância global das configurações
 settings = Settings()
 
-# Depuração inicial
-print(f"Configurações Carregadas: {settings.model_dump_json(indent=2)}")
+# Depuração inicial (sem a chave secreta e sem custo quando DEBUG está desligado)
+logger = logging.getLogger(__name__)
+if logger.isEnabledFor(logging.DEBUG):
+    logger.debug(
+        "Configurações carregadas: %s",
+        settings.model_dump_json(indent=2, exclude={"SECRET_KEY"}),
+    )
@@ -4,15 +4,241 @@
 # ===== --- Importações ---                                                      =====
 # ====================================================================================
 
-from typing import List, Optional
-
+import json
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import (
+    BigInteger,
+    Text,
+    and_,
+    case,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    inspect,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
-
-from . import models, schemas
-from .enums import UserRole
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from . import auditoria, models, pubsub, recorrencia, schemas
+from .auditoria import (
+    AGENDAMENTO,
+    ATUALIZAR,
+    CRIAR,
+    LER,
+    MEDICO,
+    PACIENTE,
+    REMOVER,
+    SERIE,
+)
+from .enums import StatusJob, StatusListaEspera, UserRole
+from .especialidades import catalogo
+from .especialidades import chave as chave_especialidade
 from .security import get_password_hash
 
+# ====================================================================================
+# ===== --- Exceções ---                                                         =====
+# ====================================================================================
+
+
+class PacienteDuplicadoError(ValueError):
+    """Levantada quando o CPF ou o CNS de um novo paciente já está cadastrado."""
+
+    def __init__(self, campo: str):
+        self.campo = campo
+        super().__init__(f"{campo.upper()} já cadastrado no sistema.")
+
+
+class MedicoDuplicadoError(ValueError):
+    """Levantada quando já existe um médico ativo com o nome informado."""
+
+    def __init__(self) -> None:
+        super().__init__("Já existe um médico cadastrado com este nome.")
+
+
+class EspecialidadeNaoEncontradaError(ValueError):
+    """Levantada quando o nome não corresponde a uma especialidade do catálogo."""
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        super().__init__(f"Especialidade '{nome}' não encontrada.")
+
+
+class EspecialidadeDuplicadaError(ValueError):
+    """Levantada ao cadastrar uma especialidade equivalente a uma já existente."""
+
+    def __init__(self, nome: str):
+        self.nome = nome
+        super().__init__(f"A especialidade '{nome}' já está cadastrada.")
+
+
+class OcorrenciaAlteradaError(ValueError):
+    """Levantada quando a ocorrência da série já foi cancelada ou remarcada."""
+
+    def __init__(self, data: date):
+        self.data = data
+        super().__init__(f"A ocorrência de {data.isoformat()} já foi alterada.")
+
+
+# ====================================================================================
+# ===== --- Remoção Lógica ---                                                   =====
+# ====================================================================================
+
+# Pacientes, médicos e agendamentos removidos ficam com `deleted_at` preenchido
+# e não aparecem nas consultas padrão; o expurgo físico ocorre em lotes
+# (`purgar_*_removidos`, acionados por app.manutencao).
+
+
+def _agora() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# Leituras e alterações de pacientes e agendamentos são registradas na trilha
+# de auditoria (app.auditoria) depois do commit, sem INSERT no caminho da
+# requisição.
+
+
+def _auditar_leitura(entidade: str, registros: Any) -> Any:
+    """Registra a leitura de um registro ou de uma lista de registros."""
+    if isinstance(registros, list):
+        auditoria.registrar_varios(LER, entidade, [r.id for r in registros])
+    elif registros is not None:
+        auditoria.registrar(LER, entidade, registros.id)
+    return registros
+
+
+# ====================================================================================
+# ===== --- Outbox de Mudanças ---                                               =====
+# ====================================================================================
+
+# Criações, alterações e remoções de pacientes, médicos e agendamentos gravam
+# um evento na tabela 'outbox' na mesma transação da mudança; o feed
+# GET /changes e a sincronização GET /sync os entregam em ordem de
+# (transacao, seq).
+
+CRIADO = "criado"
+ATUALIZADO = "atualizado"
+REMOVIDO = "removido"
+
+
+def _valor_json(valor: Any) -> Any:
+    return valor.isoformat() if hasattr(valor, "isoformat") else str(valor)
+
+
+def _instantaneo(registro: Any) -> dict:
+    """Estado atual das colunas do registro (e do endereço, para pacientes)."""
+    dados = {
+        coluna.key: getattr(registro, coluna.key)
+        for coluna in inspect(registro).mapper.column_attrs
+    }
+    if isinstance(registro, models.Paciente):
+        endereco = registro.endereco
+        dados["endereco"] = None if endereco is None else _instantaneo(endereco)
+    return json.loads(json.dumps(dados, default=_valor_json))
+
+
+def _transacao_atual(db: Session) -> Any:
+    """Id da transação atual no PostgreSQL; 0 nos demais bancos."""
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(cast(func.pg_current_xact_id(), Text), BigInteger)
+    return 0
+
+
+def _gravar_mudancas(
+    db: Session,
+    entidade: str,
+    operacao: str,
+    registros: List[Any],
+    anteriores: Optional[List[Tuple[int, date]]] = None,
+    ajustar_carga: bool = True,
+) -> None:
+    """
+    Grava, na transação atual, um evento de outbox por registro alterado.
+
+    Mudanças de agendamentos também atualizam os contadores de carga dos
+    médicos (exceto com `ajustar_carga=False`, quando a vaga já foi ocupada
+    por `reservar_vaga_medico`) e são publicadas, no commit, para os streams
+    da agenda do médico. Em alterações, `anteriores` traz o (medico_id,
+    data_primeira_consulta) de cada registro antes da mudança: a carga
+    anterior é descontada e, em transferências, a agenda do médico anterior
+    recebe a remoção.
+    """
+    if not registros:
+        return
+    agora = _agora()
+    transacao = _transacao_atual(db)
+    instantaneos = [_instantaneo(registro) for registro in registros]
+    db.execute(
+        insert(models.EventoOutbox).values(
+            [
+                {
+                    "transacao": transacao,
+                    "ocorrido_em": agora,
+                    "entidade": entidade,
+                    "entidade_id": registro.id,
+                    "operacao": operacao,
+                    "dados": dados,
+                }
+                for registro, dados in zip(registros, instantaneos)
+            ]
+        )
+    )
+    if entidade != AGENDAMENTO:
+        return
+    carga: Counter = Counter()
+    for indice, (registro, dados) in enumerate(zip(registros, instantaneos)):
+        atual = (registro.medico_id, registro.data_primeira_consulta)
+        anterior = anteriores[indice] if anteriores is not None else None
+        if operacao == CRIADO:
+            carga[atual] += 1
+        elif operacao == REMOVIDO:
+            carga[atual] -= 1
+        elif anterior is not None and anterior != atual:
+            carga[anterior] -= 1
+            carga[atual] += 1
+        pubsub.publicar_agenda(db, registro.medico_id, operacao, dados)
+        if anterior is not None and anterior[0] != registro.medico_id:
+            pubsub.publicar_agenda(db, anterior[0], REMOVIDO, dados)
+    if ajustar_carga:
+        _ajustar_carga(db, carga)
+
+
+def _ajustar_carga(db: Session, carga: Counter) -> None:
+    """
+    Soma os deltas de `carga` ((medico_id, data) -> delta) aos contadores, com
+    um único `INSERT ... ON CONFLICT DO UPDATE`.
+    """
+    linhas = [
+        {"medico_id": medico_id, "data": data, "total": delta}
+        # Ordem fixa: transações concorrentes travam os contadores na mesma
+        # sequência, sem deadlock
+        for (medico_id, data), delta in sorted(carga.items())
+        if delta
+    ]
+    if not linhas:
+        return
+    dialeto = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialeto.insert(models.CargaMedico).values(linhas)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[models.CargaMedico.medico_id, models.CargaMedico.data],
+            set_={"total": models.CargaMedico.total + stmt.excluded.total},
+        )
+    )
+
+
 # ====================================================================================
 # ===== --- CRUD de Pacientes (Já implementado anteriormente) ---                =====
 # ====================================================================================
@@ -29,7 +255,13 @@ def get_paciente_by_id(db: Session, paciente_id: int) -> Optional[models.Pacient
     Returns:
         O objeto models.Paciente correspondente ao ID, ou None se não encontrado.
     """
-    return db.query(models.Paciente).filter(models.Paciente.id == paciente_id).first()
+    return _auditar_leitura(
+        PACIENTE,
+        db.query(models.Paciente)
+        .options(joinedload(models.Paciente.endereco))
+        .filter(models.Paciente.id == paciente_id, models.Paciente.deleted_at.is_(None))
+        .first(),
+    )
 
 
 def get_paciente_by_cpf(db: Session, cpf: str) -> Optional[models.Paciente]:
@@ -46,7 +278,16 @@ def get_paciente_by_cpf(db: Session, cpf: str) -> Optional[models.Paciente]:
     cleaned_cpf = "".join(filter(str.isdigit, cpf))
     if not cleaned_cpf:
         return None
-    return db.query(models.Paciente).filter(models.Paciente.cpf == cleaned_cpf).first()
+    return _auditar_leitura(
+        PACIENTE,
+        db.query(models.Paciente)
+        .options(joinedload(models.Paciente.endereco))
+        .filter(
+            models.Paciente.cpf == cleaned_cpf,
+            models.Paciente.deleted_at.is_(None),
+        )
+        .first(),
+    )
 
 
 def get_paciente_by_cns(db: Session, cns: str) -> Optional[models.Paciente]:
@@ -63,7 +304,16 @@ def get_paciente_by_cns(db: Session, cns: str) -> Optional[models.Paciente]:
     cleaned_cns = "".join(filter(str.isdigit, cns))
     if not cleaned_cns:
         return None
-    return db.query(models.Paciente).filter(models.Paciente.cns == cleaned_cns).first()
+    return _auditar_leitura(
+        PACIENTE,
+        db.query(models.Paciente)
+        .options(joinedload(models.Paciente.endereco))
+        .filter(
+            models.Paciente.cns == cleaned_cns,
+            models.Paciente.deleted_at.is_(None),
+        )
+        .first(),
+    )
 
 
 def get_pacientes(
@@ -80,13 +330,72 @@ def get_pacientes(
     Returns:
         Uma lista de objetos models.Paciente.
     """
-    return db.query(models.Paciente).offset(skip).limit(limit).all()
+    return _auditar_leitura(
+        PACIENTE,
+        db.query(models.Paciente)
+        .options(joinedload(models.Paciente.endereco))
+        .filter(models.Paciente.deleted_at.is_(None))
+        .offset(skip)
+        .limit(limit)
+        .all(),
+    )
+
+
+def _campo_unico_violado(exc: IntegrityError) -> Optional[str]:
+    """
+    Identifica qual restrição de unicidade de `pacientes` foi violada.
+
+    Usa o nome da restrição informado pelo driver (psycopg2 expõe `diag`) e,
+    na falta dele, a mensagem de erro do banco (ex.: SQLite).
+
+    Returns:
+        "cpf", "cns" ou None se a violação não for de CPF/CNS.
+    """
+    diag = getattr(exc.orig, "diag", None)
+    origem = (getattr(diag, "constraint_name", None) or str(exc.orig)).lower()
+    for campo in ("cpf", "cns"):
+        if any(
+            marcador in origem
+            for marcador in (f"pacientes_{campo}", f"pacientes.{campo}", f"({campo})")
+        ):
+            return campo
+    return None
+
+
+def get_pacientes_by_ids(db: Session, ids: List[int]) -> List[models.Paciente]:
+    """
+    Busca vários pacientes (com seus endereços) em uma única consulta `IN`.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        ids: Os IDs dos pacientes desejados.
+
+    Returns:
+        Os pacientes encontrados, na mesma ordem de `ids`. IDs inexistentes
+        são omitidos.
+    """
+    if not ids:
+        return []
+    encontrados = {
+        paciente.id: paciente
+        for paciente in db.scalars(
+            select(models.Paciente)
+            .where(models.Paciente.id.in_(ids), models.Paciente.deleted_at.is_(None))
+            .options(joinedload(models.Paciente.endereco))
+        )
+    }
+    return _auditar_leitura(PACIENTE, [encontrados[i] for i in ids if i in encontrados])
 
 
 def create_paciente(db: Session, paciente: schemas.PacienteCreate) -> models.Paciente:
     """
     Cria um novo paciente e seu respectivo endereço no banco de dados.
 
+    A unicidade de CPF e CNS é garantida pelos índices únicos parciais do banco
+    (apenas pacientes não removidos): não há consulta prévia, e uma inserção
+    concorrente com o mesmo documento é detectada no próprio INSERT, que indica
+    qual campo conflitou.
+
     Args:
         db: A sessão ativa do banco de dados.
         paciente: Objeto schemas.PacienteCreate contendo os dados do novo paciente
@@ -94,14 +403,10 @@ def create_paciente(db: Session, paciente: schemas.PacienteCreate) -> models.Pac
 
     Returns:
         O objeto models.Paciente recém-criado, com seus dados e ID populados.
-    """
-    existing_paciente_cpf = get_paciente_by_cpf(db, cpf=paciente.cpf)
-    if existing_paciente_cpf:
-        raise ValueError(f"Paciente com CPF {paciente.cpf} já existe.")
-
-    if paciente.cns:
-        pass
 
+    Raises:
+        PacienteDuplicadoError: Se o CPF ou o CNS já estiver cadastrado.
+    """
     try:
         endereco_data = paciente.endereco.model_dump()
         db_endereco = models.Endereco(**endereco_data)
@@ -109,11 +414,16 @@ def create_paciente(db: Session, paciente: schemas.PacienteCreate) -> models.Pac
         db_paciente = models.Paciente(**paciente_data)
         db_paciente.endereco = db_endereco
         db.add(db_paciente)
+        db.flush()
+        _gravar_mudancas(db, PACIENTE, CRIADO, [db_paciente])
         db.commit()
-        db.refresh(db_paciente)
+        auditoria.registrar(CRIAR, PACIENTE, db_paciente.id, paciente.model_dump())
         return db_paciente
-    except IntegrityError:
+    except IntegrityError as exc:
         db.rollback()
+        campo = _campo_unico_violado(exc)
+        if campo is not None:
+            raise PacienteDuplicadoError(campo) from exc
         raise ValueError("Erro de integridade: CPF ou CNS existente no Banco de Dados.")
 
 
@@ -123,6 +433,9 @@ def update_paciente(
     """
     Atualiza os dados de um paciente existente e/ou seu endereço.
 
+    Cada tabela afetada recebe um único `UPDATE ... RETURNING`, sem leitura
+    prévia da linha nem `refresh` após o commit.
+
     Args:
         db: A sessão ativa do banco de dados.
         paciente_id: O ID do paciente a ser atualizado.
@@ -132,29 +445,63 @@ def update_paciente(
     Returns:
         O objeto models.Paciente atualizado, ou None se o paciente não for encontrado.
     """
-    db_paciente = get_paciente_by_id(db, paciente_id)
-    if not db_paciente:
-        return None
     update_data = paciente_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        if key == "endereco" and value is not None:
-            if db_paciente.endereco:
-                endereco_update_data = value
-                for end_key, end_value in endereco_update_data.items():
-                    if end_value is not None:
-                        setattr(db_paciente.endereco, end_key, end_value)
-            else:
-                db_paciente.endereco = models.Endereco(**value)
-        elif key == "telefone" and value is not None:
-            setattr(db_paciente, key, value)
-    db.commit()
-    db.refresh(db_paciente)
+    telefone = update_data.get("telefone")
+    endereco_data = update_data.get("endereco")
+
+    if telefone is not None:
+        stmt = (
+            update(models.Paciente)
+            .where(
+                models.Paciente.id == paciente_id, models.Paciente.deleted_at.is_(None)
+            )
+            .values(telefone=telefone)
+            .returning(models.Paciente)
+        )
+    else:
+        stmt = select(models.Paciente).where(
+            models.Paciente.id == paciente_id, models.Paciente.deleted_at.is_(None)
+        )
+    if endereco_data is None:
+        stmt = stmt.options(selectinload(models.Paciente.endereco))
+    db_paciente = db.scalars(
+        stmt, execution_options={"synchronize_session": False}
+    ).first()
+    if db_paciente is None:
+        db.rollback()
+        return None
+
+    if endereco_data is not None:
+        endereco_valores = {k: v for k, v in endereco_data.items() if v is not None}
+        db_endereco = db.scalars(
+            update(models.Endereco)
+            .where(models.Endereco.paciente_id == paciente_id)
+            .values(**endereco_valores)
+            .returning(models.Endereco),
+            execution_options={"synchronize_session": False},
+        ).first()
+        if db_endereco is None:
+            db_endereco = models.Endereco(paciente_id=paciente_id, **endereco_data)
+            db.add(db_endereco)
+            db.flush()
+        set_committed_value(db_paciente, "endereco", db_endereco)
+
+    if update_data:
+        _gravar_mudancas(db, PACIENTE, ATUALIZADO, [db_paciente])
+    db.commit()
+    if update_data:
+        auditoria.registrar(ATUALIZAR, PACIENTE, paciente_id, update_data)
     return db_paciente
 
 
 def delete_paciente(db: Session, paciente_id: int) -> Optional[models.Paciente]:
     """
-    Remove um paciente (e seu endereço associado devido à cascata) do banco de dados.
+    Remove logicamente um paciente (`UPDATE ... SET deleted_at ... RETURNING`).
+
+    O paciente e seu endereço permanecem no banco até o expurgo
+    (`purgar_pacientes_removidos`); o CPF e o CNS ficam livres para um novo
+    cadastro imediatamente. As esperas do paciente são canceladas. O endereço
+    é anexado ao paciente removido para compor a resposta.
 
     Args:
         db: A sessão ativa do banco de dados.
@@ -163,11 +510,32 @@ def delete_paciente(db: Session, paciente_id: int) -> Optional[models.Paciente]:
     Returns:
         O objeto models.Paciente que foi removido, ou None se não encontrado.
     """
-    db_paciente = get_paciente_by_id(db, paciente_id)
-    if not db_paciente:
+    db_paciente = db.scalars(
+        update(models.Paciente)
+        .where(models.Paciente.id == paciente_id, models.Paciente.deleted_at.is_(None))
+        .values(deleted_at=_agora())
+        .returning(models.Paciente),
+        execution_options={"synchronize_session": False},
+    ).first()
+    if db_paciente is None:
+        db.rollback()
         return None
-    db.delete(db_paciente)
+    db_endereco = db.scalars(
+        select(models.Endereco).where(models.Endereco.paciente_id == paciente_id)
+    ).first()
+    set_committed_value(db_paciente, "endereco", db_endereco)
+    # O paciente removido sai da lista de espera
+    db.execute(
+        update(models.EntradaListaEspera)
+        .where(
+            models.EntradaListaEspera.paciente_id == paciente_id,
+            models.EntradaListaEspera.status == StatusListaEspera.AGUARDANDO.value,
+        )
+        .values(status=StatusListaEspera.CANCELADO.value, atualizado_em=_agora())
+    )
+    _gravar_mudancas(db, PACIENTE, REMOVIDO, [db_paciente])
     db.commit()
+    auditoria.registrar(REMOVER, PACIENTE, paciente_id)
     return db_paciente
 
 
@@ -175,6 +543,18 @@ def delete_paciente(db: Session, paciente_id: int) -> Optional[models.Paciente]:
 # ===== --- CRUD de Agendamentos ---                                             =====
 # ====================================================================================
 
+# Os relacionamentos que entram nas respostas (o médico do agendamento, o
+# endereço do paciente) são carregados pelas próprias funções, dentro da
+# transação: a serialização da resposta não consulta o banco e, portanto, não
+# esbarra no prazo da requisição (app.deadlines).
+
+
+def _carregar_medico(db: Session, db_agendamento: models.Agendamento) -> None:
+    """Anexa o médico a um agendamento recém-criado (do identity map, se já lido)."""
+    set_committed_value(
+        db_agendamento, "medico", db.get(models.Medico, db_agendamento.medico_id)
+    )
+
 
 def get_agendamento_by_id(
     db: Session, agendamento_id: int
@@ -189,10 +569,15 @@ def get_agendamento_by_id(
     Returns:
         O objeto models.Agendamento ou None se não encontrado.
     """
-    return (
+    return _auditar_leitura(
+        AGENDAMENTO,
         db.query(models.Agendamento)
-        .filter(models.Agendamento.id == agendamento_id)
-        .first()
+        .options(joinedload(models.Agendamento.medico))
+        .filter(
+            models.Agendamento.id == agendamento_id,
+            models.Agendamento.deleted_at.is_(None),
+        )
+        .first(),
     )
 
 
@@ -211,17 +596,25 @@ def get_agendamentos_by_paciente(
     Returns:
         Uma lista de objetos models.Agendamento.
     """
-    return (
+    return _auditar_leitura(
+        AGENDAMENTO,
         db.query(models.Agendamento)
-        .filter(models.Agendamento.paciente_id == paciente_id)
+        .options(joinedload(models.Agendamento.medico))
+        .filter(
+            models.Agendamento.paciente_id == paciente_id,
+            models.Agendamento.deleted_at.is_(None),
+        )
         .offset(skip)
         .limit(limit)
-        .all()
+        .all(),
     )
 
 
 def get_agendamentos_all(
-    db: Session, skip: int = 0, limit: int = 100
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    especialidade_id: Optional[int] = None,
 ) -> List[models.Agendamento]:
     """
     Busca todos os agendamentos no sistema, com paginação.
@@ -230,15 +623,23 @@ def get_agendamentos_all(
         db: A sessão ativa do banco de dados.
         skip: O número de registros a pular.
         limit: O número máximo de registros a retornar.
+        especialidade_id: Filtra pela especialidade (índice parcial por ID).
 
     Returns:
         Uma lista de objetos models.Agendamento.
     """
-    return db.query(models.Agendamento).offset(skip).limit(limit).all()
+    query = (
+        db.query(models.Agendamento)
+        .options(joinedload(models.Agendamento.medico))
+        .filter(models.Agendamento.deleted_at.is_(None))
+    )
+    if especialidade_id is not None:
+        query = query.filter(models.Agendamento.especialidade_id == especialidade_id)
+    return _auditar_leitura(AGENDAMENTO, query.offset(skip).limit(limit).all())
 
 
 def create_agendamento(
-    db: Session, agendamento: schemas.AgendamentoCreate
+    db: Session, agendamento: schemas.AgendamentoCreate, vaga_reservada: bool = False
 ) -> models.Agendamento:
     """
     Cria um novo agendamento.
@@ -246,14 +647,22 @@ def create_agendamento(
     Args:
         db: A sessão ativa do banco de dados.
         agendamento: Objeto schemas.AgendamentoCreate com os dados do agendamento.
+        vaga_reservada: True se a vaga já foi somada à carga do médico nesta
+            transação (`reservar_vaga_medico`).
 
     Returns:
         O objeto models.Agendamento recém-criado.
     """
-    db_agendamento = models.Agendamento(**agendamento.model_dump())
+    dados = _com_especialidade(db, agendamento.model_dump())
+    db_agendamento = models.Agendamento(**dados)
     db.add(db_agendamento)
+    db.flush()
+    _carregar_medico(db, db_agendamento)
+    _gravar_mudancas(
+        db, AGENDAMENTO, CRIADO, [db_agendamento], ajustar_carga=not vaga_reservada
+    )
     db.commit()
-    db.refresh(db_agendamento)
+    auditoria.registrar(CRIAR, AGENDAMENTO, db_agendamento.id, dados)
     return db_agendamento
 
 
@@ -261,7 +670,7 @@ def update_agendamento(
     db: Session, agendamento_id: int, agendamento_update: schemas.AgendamentoUpdate
 ) -> Optional[models.Agendamento]:
     """
-    Atualiza um agendamento existente.
+    Atualiza um agendamento existente com um único `UPDATE ... RETURNING`.
 
     Args:
         db: A sessão ativa do banco de dados.
@@ -272,17 +681,55 @@ def update_agendamento(
     Returns:
         O objeto models.Agendamento atualizado, ou None se não encontrado.
     """
-    db_agendamento = get_agendamento_by_id(db, agendamento_id)
-    if not db_agendamento:
+    update_data = _com_especialidade(
+        db,
+        {
+            key: value
+            for key, value in agendamento_update.model_dump(exclude_unset=True).items()
+            if value is not None
+        },
+    )
+    anteriores = None
+    if "medico_id" in update_data or "data_primeira_consulta" in update_data:
+        # Transferência ou remarcação: a carga e a agenda anteriores são
+        # atualizadas (a trava mantém os valores lidos até o commit)
+        anterior = db.execute(
+            select(
+                models.Agendamento.medico_id,
+                models.Agendamento.data_primeira_consulta,
+            )
+            .where(models.Agendamento.id == agendamento_id)
+            .with_for_update()
+        ).first()
+        anteriores = None if anterior is None else [tuple(anterior)]
+    if update_data:
+        stmt = (
+            update(models.Agendamento)
+            .where(
+                models.Agendamento.id == agendamento_id,
+                models.Agendamento.deleted_at.is_(None),
+            )
+            .values(**update_data)
+            .returning(models.Agendamento)
+        )
+    else:
+        stmt = select(models.Agendamento).where(
+            models.Agendamento.id == agendamento_id,
+            models.Agendamento.deleted_at.is_(None),
+        )
+    db_agendamento = db.scalars(
+        stmt.options(selectinload(models.Agendamento.medico)),
+        execution_options={"synchronize_session": False},
+    ).first()
+    if db_agendamento is None:
+        db.rollback()
         return None
 
-    update_data = agendamento_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        if value is not None:
-            setattr(db_agendamento, key, value)
-
+    if update_data:
+        _gravar_mudancas(db, AGENDAMENTO, ATUALIZADO, [db_agendamento], anteriores)
     db.commit()
-    db.refresh(db_agendamento)
+    if update_data:
+        auditoria.registrar(ATUALIZAR, AGENDAMENTO, agendamento_id, update_data)
     return db_agendamento
 
 
@@ -290,7 +737,7 @@ def delete_agendamento(
     db: Session, agendamento_id: int
 ) -> Optional[models.Agendamento]:
     """
-    Remove um agendamento.
+    Remove logicamente um agendamento com um único `UPDATE ... RETURNING`.
 
     Args:
         db: A sessão ativa do banco de dados.
@@ -299,116 +746,1836 @@ def delete_agendamento(
     Returns:
         O objeto models.Agendamento removido, ou None se não encontrado.
     """
-    db_agendamento = get_agendamento_by_id(db, agendamento_id)
-    if not db_agendamento:
+    db_agendamento = db.scalars(
+        update(models.Agendamento)
+        .where(
+            models.Agendamento.id == agendamento_id,
+            models.Agendamento.deleted_at.is_(None),
+        )
+        .values(deleted_at=_agora())
+        .returning(models.Agendamento)
+        .options(selectinload(models.Agendamento.medico)),
+        execution_options={"synchronize_session": False},
+    ).first()
+    if db_agendamento is None:
+        db.rollback()
         return None
 
-    db.delete(db_agendamento)
+    _gravar_mudancas(db, AGENDAMENTO, REMOVIDO, [db_agendamento])
     db.commit()
+    auditoria.registrar(REMOVER, AGENDAMENTO, agendamento_id)
     return db_agendamento
 
 
 # ====================================================================================
-# ===== --- CRUD de Médicos (Simples) ---                                        =====
+# ===== --- Operações em Lote de Agendamentos ---                                =====
 # ====================================================================================
 
 
-def get_medico_by_id(db: Session, medico_id: int) -> Optional[models.Medico]:
-    """Busca um médico pelo ID."""
-    return db.query(models.Medico).filter(models.Medico.id == medico_id).first()
+def _filtro_agendamentos_em_lote(
+    medico_id: int, data_inicio: Optional[date], data_fim: Optional[date]
+) -> List[Any]:
+    """Monta as condições WHERE que selecionam os agendamentos de um lote."""
+    condicoes = [
+        models.Agendamento.medico_id == medico_id,
+        models.Agendamento.deleted_at.is_(None),
+    ]
+    if data_inicio is not None:
+        condicoes.append(models.Agendamento.data_primeira_consulta >= data_inicio)
+    if data_fim is not None:
+        condicoes.append(models.Agendamento.data_primeira_consulta <= data_fim)
+    return condicoes
 
 
-def get_medico_by_nome(db: Session, nome: str) -> Optional[models.Medico]:
-    """Busca um médico pelo nome."""
-    return db.query(models.Medico).filter(models.Medico.nome == nome).first()
+def _deslocar_data(db: Session, coluna: Any, dias: int) -> Any:
+    """
+    Retorna a expressão SQL `coluna + dias` para uma coluna DATE.
 
+    O PostgreSQL soma inteiros a datas diretamente; o SQLite armazena datas
+    como texto e precisa da função date().
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.date(coluna, f"{dias:+d} days")
+    return coluna + dias
+
+
+def get_pacientes_inexistentes(db: Session, paciente_ids: List[int]) -> List[int]:
+    """Retorna, dentre `paciente_ids`, os IDs que não existem (uma consulta `IN`)."""
+    unicos = list(dict.fromkeys(paciente_ids))
+    existentes = set(
+        db.scalars(
+            select(models.Paciente.id).where(
+                models.Paciente.id.in_(unicos), models.Paciente.deleted_at.is_(None)
+            )
+        )
+    )
+    return [i for i in unicos if i not in existentes]
 
-def get_medicos(db: Session, skip: int = 0, limit: int = 100) -> List[models.Medico]:
-    """Retorna uma lista de médicos."""
-    return db.query(models.Medico).offset(skip).limit(limit).all()
 
+def get_especialidades_inexistentes(db: Session, nomes: List[str]) -> List[str]:
+    """Retorna, dentre `nomes`, os que não estão no catálogo de especialidades."""
+    return [nome for nome in dict.fromkeys(nomes) if catalogo.obter(db, nome) is None]
 
-def create_medico(db: Session, medico: schemas.MedicoCreate) -> models.Medico:
-    """Cria um novo médico."""
-    db_medico = models.Medico(**medico.model_dump())
-    db.add(db_medico)
+
+def contar_agendamentos_em_lote(
+    db: Session,
+    medico_id: int,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+) -> int:
+    """Conta os agendamentos selecionados por um filtro de operação em lote."""
+    return db.scalar(
+        select(func.count())
+        .select_from(models.Agendamento)
+        .where(*_filtro_agendamentos_em_lote(medico_id, data_inicio, data_fim))
+    )
+
+
+def create_agendamentos_em_lote(
+    db: Session, agendamentos: List[schemas.AgendamentoEmLoteCreate]
+) -> List[int]:
+    """
+    Cria vários agendamentos com um INSERT de múltiplas linhas, em uma transação.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        agendamentos: Os agendamentos a serem criados.
+
+    Returns:
+        Os IDs dos agendamentos criados, na ordem de entrada.
+    """
+    dados = [
+        _com_especialidade(db, agendamento.model_dump()) for agendamento in agendamentos
+    ]
+    criados = list(
+        db.scalars(
+            insert(models.Agendamento).returning(
+                models.Agendamento, sort_by_parameter_order=True
+            ),
+            dados,
+        )
+    )
+    _gravar_mudancas(db, AGENDAMENTO, CRIADO, criados)
     db.commit()
-    db.refresh(db_medico)
-    return db_medico
+    ids = [agendamento.id for agendamento in criados]
+    for agendamento_id, valores in zip(ids, dados):
+        auditoria.registrar(CRIAR, AGENDAMENTO, agendamento_id, valores)
+    return ids
+
+
+def reagendar_agendamentos_em_lote(
+    db: Session,
+    medico_id: int,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    novo_medico_id: Optional[int] = None,
+    deslocamento_dias: Optional[int] = None,
+) -> List[int]:
+    """
+    Transfere e/ou desloca, com um único UPDATE, todos os agendamentos de um
+    médico no intervalo informado.
 
+    Args:
+        db: A sessão ativa do banco de dados.
+        medico_id: O médico cujos agendamentos serão alterados.
+        data_inicio: Data inicial (inclusiva) de `data_primeira_consulta`.
+        data_fim: Data final (inclusiva) de `data_primeira_consulta`.
+        novo_medico_id: Médico que assumirá os agendamentos, se informado.
+        deslocamento_dias: Dias somados às datas de consulta, se informado.
 
-def update_medico(
-    db: Session, medico_id: int, medico_update: schemas.MedicoUpdate
-) -> Optional[models.Medico]:
-    """Atualiza um médico existente."""
-    db_medico = get_medico_by_id(db, medico_id)
-    if not db_medico:
-        return None
-    update_data = medico_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        if value is not None:
-            setattr(db_medico, key, value)
+    Returns:
+        Os IDs dos agendamentos alterados.
+    """
+    valores: dict = {}
+    if novo_medico_id is not None:
+        valores["medico_id"] = novo_medico_id
+    if deslocamento_dias:
+        valores["data_primeira_consulta"] = _deslocar_data(
+            db, models.Agendamento.data_primeira_consulta, deslocamento_dias
+        )
+        valores["data_proxima_consulta"] = _deslocar_data(
+            db, models.Agendamento.data_proxima_consulta, deslocamento_dias
+        )
+    alterados = list(
+        db.scalars(
+            update(models.Agendamento)
+            .where(*_filtro_agendamentos_em_lote(medico_id, data_inicio, data_fim))
+            .values(**valores)
+            .returning(models.Agendamento),
+            execution_options={"synchronize_session": False},
+        )
+    )
+    _gravar_mudancas(
+        db,
+        AGENDAMENTO,
+        ATUALIZADO,
+        alterados,
+        anteriores=[
+            (
+                medico_id,
+                agendamento.data_primeira_consulta
+                - timedelta(days=deslocamento_dias or 0),
+            )
+            for agendamento in alterados
+        ],
+    )
     db.commit()
-    db.refresh(db_medico)
-    return db_medico
+    ids = [agendamento.id for agendamento in alterados]
+    auditoria.registrar_varios(
+        ATUALIZAR,
+        AGENDAMENTO,
+        ids,
+        {"medico_id": novo_medico_id, "deslocamento_dias": deslocamento_dias},
+    )
+    return ids
 
 
-def delete_medico(db: Session, medico_id: int) -> Optional[models.Medico]:
-    """Remove um médico."""
-    db_medico = get_medico_by_id(db, medico_id)
-    if not db_medico:
-        return None
-    db.delete(db_medico)
+def cancelar_agendamentos_em_lote(
+    db: Session,
+    medico_id: int,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+) -> List[int]:
+    """
+    Remove logicamente, com um único UPDATE, todos os agendamentos de um médico
+    no intervalo.
+
+    Returns:
+        Os IDs dos agendamentos removidos.
+    """
+    removidos = list(
+        db.scalars(
+            update(models.Agendamento)
+            .where(*_filtro_agendamentos_em_lote(medico_id, data_inicio, data_fim))
+            .values(deleted_at=_agora())
+            .returning(models.Agendamento),
+            execution_options={"synchronize_session": False},
+        )
+    )
+    _gravar_mudancas(db, AGENDAMENTO, REMOVIDO, removidos)
     db.commit()
-    return db_medico
+    ids = [agendamento.id for agendamento in removidos]
+    auditoria.registrar_varios(REMOVER, AGENDAMENTO, ids)
+    return ids
 
 
 # ====================================================================================
-# ===== --- CRUD de Usuários ---                                                 =====
+# ===== --- Séries de Agendamentos ---                                           =====
 # ====================================================================================
 
-
-def get_user_by_id(db: Session, user_id: int) -> Optional[models.User]:
-    """Busca um usuário pelo seu ID."""
-    return db.query(models.User).filter(models.User.id == user_id).first()
+# Uma série guarda só a regra de recorrência; as ocorrências são calculadas
+# por app.recorrencia para a janela consultada. Apenas as exceções viram
+# linhas: uma ocorrência cancelada grava uma linha em 'excecoes_serie', e uma
+# remarcada também cria um agendamento comum, que passa a seguir o fluxo
+# normal (outbox, streams de agenda, lembretes).
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
-    """Busca um usuário pelo seu endereço de e-mail."""
-    return db.query(models.User).filter(models.User.email == email).first()
+def create_serie(
+    db: Session, serie: schemas.SerieAgendamentoCreate
+) -> models.SerieAgendamento:
+    """
+    Cria uma nova série de agendamentos recorrentes.
 
+    Args:
+        db: A sessão ativa do banco de dados.
+        serie: Objeto schemas.SerieAgendamentoCreate com a regra de recorrência.
 
-def create_user(db: Session, user: schemas.UserCreate) -> models.User:
+    Returns:
+        O objeto models.SerieAgendamento recém-criado.
     """
-    Cria um novo usuário no banco de dados.
-    A senha fornecida é hasheada antes de ser armazenada.
-    O campo is_superuser é definido como True se o role for ADMIN.
+    dados = serie.model_dump(mode="json")
+    db_serie = models.SerieAgendamento(
+        **_com_especialidade(db, serie.model_dump(exclude={"frequencia"})),
+        frequencia=serie.frequencia.value,
+        criado_em=_agora(),
+    )
+    db.add(db_serie)
+    db.commit()
+    auditoria.registrar(CRIAR, SERIE, db_serie.id, dados)
+    return db_serie
+
+
+def get_serie_by_id(db: Session, serie_id: int) -> Optional[models.SerieAgendamento]:
     """
-    hashed_password = get_password_hash(user.password)
+    Busca uma série de agendamentos (não removida) pelo seu ID.
 
-    is_superuser_val = True if user.role == UserRole.ADMIN else False
+    Args:
+        db: A sessão ativa do banco de dados.
+        serie_id: O ID da série.
 
-    # Cria a instância do modelo User
-    db_user = models.User(
-        email=user.email,
-        hashed_password=hashed_password,
-        nome_completo=user.nome_completo,
-        role=user.role,
-        is_active=True,
-        is_superuser=is_superuser_val,
-        medico_id=user.medico_id if hasattr(user, "medico_id") else None,
+    Returns:
+        O objeto models.SerieAgendamento ou None se não encontrada.
+    """
+    return _auditar_leitura(
+        SERIE,
+        db.scalars(
+            select(models.SerieAgendamento).where(
+                models.SerieAgendamento.id == serie_id,
+                models.SerieAgendamento.deleted_at.is_(None),
+            )
+        ).first(),
     )
 
+
+def delete_serie(db: Session, serie_id: int) -> Optional[models.SerieAgendamento]:
+    """
+    Remove logicamente uma série: suas ocorrências futuras deixam de aparecer.
+    Os agendamentos criados por remarcações são mantidos.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        serie_id: O ID da série a ser removida.
+
+    Returns:
+        O objeto models.SerieAgendamento removido, ou None se não encontrado.
+    """
+    db_serie = db.scalars(
+        update(models.SerieAgendamento)
+        .where(
+            models.SerieAgendamento.id == serie_id,
+            models.SerieAgendamento.deleted_at.is_(None),
+        )
+        .values(deleted_at=_agora())
+        .returning(models.SerieAgendamento),
+        execution_options={"synchronize_session": False},
+    ).first()
+    if db_serie is None:
+        db.rollback()
+        return None
+    db.commit()
+    auditoria.registrar(REMOVER, SERIE, serie_id)
+    return db_serie
+
+
+def _gravar_excecao(
+    db: Session, serie_id: int, data: date, agendamento_id: Optional[int]
+) -> None:
+    """Grava a exceção; a unicidade (série, data) barra alterações repetidas."""
+    db.add(
+        models.ExcecaoSerie(
+            serie_id=serie_id,
+            data_original=data,
+            agendamento_id=agendamento_id,
+            criado_em=_agora(),
+        )
+    )
     try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        return db_user
+        db.flush()
     except IntegrityError:
         db.rollback()
-        raise ValueError(
-            "Erro de integridade: Email ou medico_id (se único) já pode existir."
-        )
+        raise OcorrenciaAlteradaError(data)
 
 
-# (Adicionar update_user e delete_user futuramente, conforme necessário)
+def cancelar_ocorrencia(
+    db: Session, serie: models.SerieAgendamento, data: date
+) -> None:
+    """
+    Cancela uma ocorrência da série (sem afetar as demais).
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        serie: A série (já validada como existente).
+        data: A data da ocorrência, que deve seguir a regra da série.
+
+    Raises:
+        OcorrenciaAlteradaError: Se a ocorrência já foi cancelada ou remarcada.
+    """
+    _gravar_excecao(db, serie.id, data, None)
+    db.commit()
+    auditoria.registrar(ATUALIZAR, SERIE, serie.id, {"cancelada": data.isoformat()})
+
+
+def mover_ocorrencia(
+    db: Session,
+    serie: models.SerieAgendamento,
+    data: date,
+    nova_data: date,
+    medico_id: Optional[int] = None,
+) -> models.Agendamento:
+    """
+    Remarca uma ocorrência da série: cria um agendamento comum na nova data e
+    registra a exceção, na mesma transação.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        serie: A série (já validada como existente).
+        data: A data original da ocorrência.
+        nova_data: A data do agendamento que substitui a ocorrência.
+        medico_id: Outro médico para o agendamento (padrão: o da série).
+
+    Returns:
+        O objeto models.Agendamento criado.
+
+    Raises:
+        OcorrenciaAlteradaError: Se a ocorrência já foi cancelada ou remarcada.
+    """
+    dados = {
+        "paciente_id": serie.paciente_id,
+        "medico_id": medico_id if medico_id is not None else serie.medico_id,
+        "especialidade": serie.especialidade,
+        "especialidade_id": serie.especialidade_id,
+        "data_primeira_consulta": nova_data,
+        "valor_consulta": serie.valor_consulta,
+        "descricao": serie.descricao,
+    }
+    db_agendamento = models.Agendamento(**dados)
+    db.add(db_agendamento)
+    db.flush()
+    _carregar_medico(db, db_agendamento)
+    _gravar_excecao(db, serie.id, data, db_agendamento.id)
+    _gravar_mudancas(db, AGENDAMENTO, CRIADO, [db_agendamento])
+    db.commit()
+    auditoria.registrar(CRIAR, AGENDAMENTO, db_agendamento.id, dados)
+    auditoria.registrar(
+        ATUALIZAR,
+        SERIE,
+        serie.id,
+        {"remarcada": data.isoformat(), "agendamento_id": db_agendamento.id},
+    )
+    return db_agendamento
+
+
+def get_calendario(
+    db: Session,
+    inicio: date,
+    fim: date,
+    paciente_id: Optional[int] = None,
+    medico_id: Optional[int] = None,
+) -> List[dict]:
+    """
+    Monta o calendário de um paciente ou de um médico entre `inicio` e `fim`:
+    os agendamentos da janela mais as ocorrências das séries ativas,
+    calculadas sob demanda (exceto as canceladas ou remarcadas).
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        inicio: Primeiro dia da janela.
+        fim: Último dia da janela (inclusive).
+        paciente_id: Filtra pelo paciente.
+        medico_id: Filtra pelo médico.
+
+    Returns:
+        Uma lista de itens (schemas.ItemCalendario) ordenada por data.
+    """
+    agendamentos = select(models.Agendamento).where(
+        models.Agendamento.deleted_at.is_(None),
+        models.Agendamento.data_primeira_consulta.between(inicio, fim),
+    )
+    series = select(models.SerieAgendamento).where(
+        models.SerieAgendamento.deleted_at.is_(None),
+        models.SerieAgendamento.data_inicio <= fim,
+        or_(
+            models.SerieAgendamento.data_fim.is_(None),
+            models.SerieAgendamento.data_fim >= inicio,
+        ),
+    )
+    if paciente_id is not None:
+        agendamentos = agendamentos.where(models.Agendamento.paciente_id == paciente_id)
+        series = series.where(models.SerieAgendamento.paciente_id == paciente_id)
+    if medico_id is not None:
+        agendamentos = agendamentos.where(models.Agendamento.medico_id == medico_id)
+        series = series.where(models.SerieAgendamento.medico_id == medico_id)
+
+    itens = [
+        {
+            "data": agendamento.data_primeira_consulta,
+            "agendamento_id": agendamento.id,
+            "paciente_id": agendamento.paciente_id,
+            "medico_id": agendamento.medico_id,
+            "especialidade": agendamento.especialidade,
+            "valor_consulta": agendamento.valor_consulta,
+            "descricao": agendamento.descricao,
+        }
+        for agendamento in _auditar_leitura(AGENDAMENTO, list(db.scalars(agendamentos)))
+    ]
+    db_series = list(db.scalars(series))
+    excecoes = set()
+    if db_series:
+        excecoes = set(
+            db.execute(
+                select(
+                    models.ExcecaoSerie.serie_id, models.ExcecaoSerie.data_original
+                ).where(
+                    models.ExcecaoSerie.serie_id.in_([s.id for s in db_series]),
+                    models.ExcecaoSerie.data_original.between(inicio, fim),
+                )
+            )
+        )
+    for serie in db_series:
+        for data in recorrencia.expandir(serie, inicio, fim):
+            if (serie.id, data) in excecoes:
+                continue
+            itens.append(
+                {
+                    "data": data,
+                    "serie_id": serie.id,
+                    "paciente_id": serie.paciente_id,
+                    "medico_id": serie.medico_id,
+                    "especialidade": serie.especialidade,
+                    "valor_consulta": serie.valor_consulta,
+                    "descricao": serie.descricao,
+                }
+            )
+    _auditar_leitura(SERIE, db_series)
+    itens.sort(key=lambda item: item["data"])
+    return itens
+
+
+def purgar_series_removidas(db: Session, antes_de: datetime, limite: int = 500) -> int:
+    """
+    Apaga fisicamente até `limite` séries removidas antes de `antes_de`, junto
+    com suas exceções.
+
+    Returns:
+        O número de séries apagadas.
+    """
+    ids = _ids_removidos(db, models.SerieAgendamento, antes_de, limite)
+    if ids:
+        db.execute(
+            delete(models.ExcecaoSerie).where(models.ExcecaoSerie.serie_id.in_(ids))
+        )
+        db.execute(
+            delete(models.SerieAgendamento).where(models.SerieAgendamento.id.in_(ids))
+        )
+    db.commit()
+    return len(ids)
+
+
+# ====================================================================================
+# ===== --- Lista de Espera ---                                                  =====
+# ====================================================================================
+
+# Quando um agendamento é removido, a vaga (médico, data, especialidade) é
+# oferecida à primeira entrada compatível da fila: a busca percorre o índice
+# parcial `ix_lista_espera_fila` na ordem (prioridade, chegada) e para na
+# primeira entrada que aceita a data e o médico. O encaixe cria um agendamento
+# para o paciente e deixa a entrada como `oferecido`, até a recepção confirmar
+# ou recusar a oferta.
+
+_AGUARDANDO = literal_column(f"'{StatusListaEspera.AGUARDANDO.value}'")
+
+
+def create_entrada_lista_espera(
+    db: Session, entrada: schemas.EntradaListaEsperaCreate
+) -> models.EntradaListaEspera:
+    """
+    Coloca um paciente na lista de espera de uma especialidade.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        entrada: Objeto schemas.EntradaListaEsperaCreate com os dados da espera.
+
+    Returns:
+        O objeto models.EntradaListaEspera recém-criado.
+    """
+    agora = _agora()
+    db_entrada = models.EntradaListaEspera(
+        **_com_especialidade(db, entrada.model_dump()),
+        status=StatusListaEspera.AGUARDANDO.value,
+        criado_em=agora,
+        atualizado_em=agora,
+    )
+    db.add(db_entrada)
+    db.commit()
+    return db_entrada
+
+
+def get_entrada_lista_espera(
+    db: Session, entrada_id: int
+) -> Optional[models.EntradaListaEspera]:
+    """Busca uma entrada da lista de espera pelo seu ID."""
+    return db.get(models.EntradaListaEspera, entrada_id)
+
+
+def get_lista_espera(
+    db: Session,
+    especialidade_id: Optional[int] = None,
+    status: StatusListaEspera = StatusListaEspera.AGUARDANDO,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[models.EntradaListaEspera]:
+    """
+    Lista as entradas da lista de espera na ordem da fila (prioridade e chegada).
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        especialidade_id: Filtra pela especialidade.
+        status: Filtra pelo estado da entrada (padrão: aguardando).
+        skip: O número de registros a pular.
+        limit: O número máximo de registros a retornar.
+
+    Returns:
+        Uma lista de objetos models.EntradaListaEspera.
+    """
+    stmt = select(models.EntradaListaEspera).where(
+        models.EntradaListaEspera.status == status.value
+    )
+    if especialidade_id is not None:
+        stmt = stmt.where(
+            models.EntradaListaEspera.especialidade_id == especialidade_id
+        )
+    return list(
+        db.scalars(
+            stmt.order_by(
+                models.EntradaListaEspera.prioridade,
+                models.EntradaListaEspera.criado_em,
+                models.EntradaListaEspera.id,
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+    )
+
+
+def _mudar_status_entrada(
+    db: Session,
+    entrada_id: int,
+    de: StatusListaEspera,
+    para: StatusListaEspera,
+) -> Optional[models.EntradaListaEspera]:
+    db_entrada = db.scalars(
+        update(models.EntradaListaEspera)
+        .where(
+            models.EntradaListaEspera.id == entrada_id,
+            models.EntradaListaEspera.status == de.value,
+        )
+        .values(status=para.value, atualizado_em=_agora())
+        .returning(models.EntradaListaEspera),
+        execution_options={"synchronize_session": False},
+    ).first()
+    if db_entrada is None:
+        db.rollback()
+        return None
+    db.commit()
+    return db_entrada
+
+
+def cancelar_entrada_lista_espera(
+    db: Session, entrada_id: int
+) -> Optional[models.EntradaListaEspera]:
+    """Retira da fila uma entrada aguardando vaga (None se não há tal entrada)."""
+    return _mudar_status_entrada(
+        db, entrada_id, StatusListaEspera.AGUARDANDO, StatusListaEspera.CANCELADO
+    )
+
+
+def confirmar_oferta_lista_espera(
+    db: Session, entrada_id: int
+) -> Optional[models.EntradaListaEspera]:
+    """Confirma o encaixe oferecido à entrada (None se não há oferta pendente)."""
+    return _mudar_status_entrada(
+        db, entrada_id, StatusListaEspera.OFERECIDO, StatusListaEspera.CONFIRMADO
+    )
+
+
+def recusar_oferta_lista_espera(
+    db: Session, entrada_id: int
+) -> Optional[Tuple[models.EntradaListaEspera, Optional[models.Agendamento]]]:
+    """
+    Recusa o encaixe oferecido: remove o agendamento criado no encaixe e
+    devolve a entrada à fila, na mesma posição.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        entrada_id: O ID da entrada com oferta pendente.
+
+    Returns:
+        A entrada e o agendamento removido (a vaga, que pode ser oferecida à
+        próxima entrada da fila), ou None se não há oferta pendente.
+    """
+    db_entrada = db.scalars(
+        select(models.EntradaListaEspera)
+        .where(
+            models.EntradaListaEspera.id == entrada_id,
+            models.EntradaListaEspera.status == StatusListaEspera.OFERECIDO.value,
+        )
+        .with_for_update()
+    ).first()
+    if db_entrada is None:
+        db.rollback()
+        return None
+    db_agendamento = db.scalars(
+        update(models.Agendamento)
+        .where(
+            models.Agendamento.id == db_entrada.agendamento_id,
+            models.Agendamento.deleted_at.is_(None),
+        )
+        .values(deleted_at=_agora())
+        .returning(models.Agendamento),
+        execution_options={"synchronize_session": False},
+    ).first()
+    db_entrada.status = StatusListaEspera.AGUARDANDO.value
+    db_entrada.agendamento_id = None
+    db_entrada.atualizado_em = _agora()
+    if db_agendamento is not None:
+        _gravar_mudancas(db, AGENDAMENTO, REMOVIDO, [db_agendamento])
+    db.commit()
+    if db_agendamento is not None:
+        auditoria.registrar(REMOVER, AGENDAMENTO, db_agendamento.id)
+    return db_entrada, db_agendamento
+
+
+def encaixar_da_lista_espera(
+    db: Session, vaga: models.Agendamento
+) -> Optional[models.EntradaListaEspera]:
+    """
+    Oferece a vaga de um agendamento removido à primeira entrada compatível da
+    fila e cria o agendamento do encaixe, na mesma transação.
+
+    A entrada é travada com `FOR UPDATE SKIP LOCKED`: cancelamentos
+    simultâneos (em qualquer worker) encaixam pacientes diferentes.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        vaga: O agendamento removido (médico, data, especialidade e valor).
+
+    Returns:
+        A entrada encaixada (com `agendamento_id`), ou None se ninguém na fila
+        aceita a vaga.
+    """
+    data = vaga.data_primeira_consulta
+    entrada = models.EntradaListaEspera
+    db_entrada = db.scalars(
+        select(entrada)
+        .where(
+            entrada.status == _AGUARDANDO,
+            entrada.especialidade_id == vaga.especialidade_id,
+            entrada.paciente_id != vaga.paciente_id,
+            or_(entrada.medico_id.is_(None), entrada.medico_id == vaga.medico_id),
+            or_(entrada.data_inicio.is_(None), entrada.data_inicio <= data),
+            or_(entrada.data_fim.is_(None), entrada.data_fim >= data),
+        )
+        .order_by(entrada.prioridade, entrada.criado_em, entrada.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).first()
+    if db_entrada is None:
+        db.rollback()
+        return None
+    dados = {
+        "paciente_id": db_entrada.paciente_id,
+        "medico_id": vaga.medico_id,
+        "especialidade": vaga.especialidade,
+        "especialidade_id": vaga.especialidade_id,
+        "data_primeira_consulta": data,
+        "valor_consulta": vaga.valor_consulta,
+        "descricao": "Encaixe da lista de espera",
+    }
+    db_agendamento = models.Agendamento(**dados)
+    db.add(db_agendamento)
+    db.flush()
+    db_entrada.status = StatusListaEspera.OFERECIDO.value
+    db_entrada.agendamento_id = db_agendamento.id
+    db_entrada.atualizado_em = _agora()
+    _gravar_mudancas(db, AGENDAMENTO, CRIADO, [db_agendamento])
+    db.commit()
+    auditoria.registrar(CRIAR, AGENDAMENTO, db_agendamento.id, dados)
+    return db_entrada
+
+
+def purgar_lista_espera_finalizada(
+    db: Session, antes_de: datetime, limite: int = 500
+) -> int:
+    """
+    Apaga até `limite` entradas confirmadas ou canceladas antes de `antes_de`.
+
+    Returns:
+        O número de entradas apagadas.
+    """
+    antigas = (
+        select(models.EntradaListaEspera.id)
+        .where(
+            models.EntradaListaEspera.status.in_(
+                [StatusListaEspera.CONFIRMADO.value, StatusListaEspera.CANCELADO.value]
+            ),
+            models.EntradaListaEspera.atualizado_em < antes_de,
+        )
+        .limit(limite)
+    )
+    apagados = db.execute(
+        delete(models.EntradaListaEspera).where(
+            models.EntradaListaEspera.id.in_(antigas)
+        )
+    ).rowcount
+    db.commit()
+    return apagados
+
+
+# ====================================================================================
+# ===== --- Carga dos Médicos ---                                                =====
+# ====================================================================================
+
+# 'carga_medicos' conta os agendamentos ativos por médico e dia e é mantida
+# por `_gravar_mudancas` na transação de cada mudança. A distribuição
+# automática (app.distribuicao) lê apenas estes contadores: o custo depende do
+# número de médicos da especialidade e dos dias da janela, não do volume de
+# agendamentos.
+
+
+def get_carga_medicos(
+    db: Session, especialidade_id: int, inicio: date, fim: date, dia: date
+) -> List[Tuple[int, int, int]]:
+    """
+    Carga dos médicos ativos de uma especialidade.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        especialidade_id: A especialidade dos médicos.
+        inicio: Primeiro dia da janela de carga.
+        fim: Último dia da janela de carga (inclusive).
+        dia: O dia da consulta a agendar.
+
+    Returns:
+        Uma lista de (medico_id, agendamentos na janela, agendamentos no dia),
+        incluindo médicos sem agendamentos.
+    """
+    carga = models.CargaMedico
+    return list(
+        db.execute(
+            select(
+                models.Medico.id,
+                func.coalesce(func.sum(carga.total), 0),
+                func.coalesce(
+                    func.sum(case((carga.data == dia, carga.total), else_=0)), 0
+                ),
+            )
+            .select_from(models.Medico)
+            .outerjoin(
+                carga,
+                and_(
+                    carga.medico_id == models.Medico.id,
+                    carga.data.between(inicio, fim),
+                ),
+            )
+            .where(
+                models.Medico.deleted_at.is_(None),
+                models.Medico.especialidade_id == especialidade_id,
+            )
+            .group_by(models.Medico.id)
+        )
+    )
+
+
+def reservar_vaga_medico(db: Session, medico_id: int, data: date, maximo: int) -> bool:
+    """
+    Ocupa uma vaga do médico no dia: soma 1 ao contador de carga se ele estiver
+    abaixo de `maximo`, com um único `INSERT ... ON CONFLICT DO UPDATE ...
+    WHERE total < :maximo RETURNING`. O contador fica travado até o fim da
+    transação, de modo que agendamentos concorrentes não ultrapassam o limite.
+
+    Returns:
+        True se a vaga foi ocupada; False se o médico já atingiu o limite.
+    """
+    dialeto = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialeto.insert(models.CargaMedico).values(
+        medico_id=medico_id, data=data, total=1
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[models.CargaMedico.medico_id, models.CargaMedico.data],
+        set_={"total": models.CargaMedico.total + 1},
+        where=models.CargaMedico.total < maximo,
+    ).returning(models.CargaMedico.total)
+    return db.execute(stmt).first() is not None
+
+
+def get_ultimo_medico_do_paciente(
+    db: Session, paciente_id: int, especialidade_id: int
+) -> Optional[int]:
+    """ID do médico do agendamento mais recente do paciente na especialidade."""
+    return db.scalar(
+        select(models.Agendamento.medico_id)
+        .where(
+            models.Agendamento.paciente_id == paciente_id,
+            models.Agendamento.especialidade_id == especialidade_id,
+            models.Agendamento.deleted_at.is_(None),
+        )
+        .order_by(models.Agendamento.data_primeira_consulta.desc())
+        .limit(1)
+    )
+
+
+def recalcular_carga_medicos(db: Session) -> int:
+    """
+    Reconstrói os contadores de carga a partir dos agendamentos ativos (após
+    cargas em massa que não passam pelo CRUD, como app.tools.seed).
+
+    Returns:
+        O número de contadores (médico e dia) gravados.
+    """
+    db.execute(delete(models.CargaMedico))
+    gravados = db.execute(
+        insert(models.CargaMedico).from_select(
+            ["medico_id", "data", "total"],
+            select(
+                models.Agendamento.medico_id,
+                models.Agendamento.data_primeira_consulta,
+                func.count(),
+            )
+            .where(models.Agendamento.deleted_at.is_(None))
+            .group_by(
+                models.Agendamento.medico_id,
+                models.Agendamento.data_primeira_consulta,
+            ),
+        )
+    ).rowcount
+    db.commit()
+    return gravados
+
+
+def purgar_carga_medicos(db: Session, antes_de: date, limite: int = 500) -> int:
+    """
+    Apaga até `limite` contadores de dias anteriores a `antes_de`, que não
+    entram mais nas janelas de distribuição.
+
+    Returns:
+        O número de contadores apagados.
+    """
+    antigos = (
+        select(models.CargaMedico.medico_id, models.CargaMedico.data)
+        .where(models.CargaMedico.data < antes_de)
+        .limit(limite)
+    )
+    apagados = db.execute(
+        delete(models.CargaMedico).where(
+            tuple_(models.CargaMedico.medico_id, models.CargaMedico.data).in_(antigos)
+        )
+    ).rowcount
+    db.commit()
+    return apagados
+
+
+# ====================================================================================
+# ===== --- Catálogo de Especialidades ---                                       =====
+# ====================================================================================
+
+# Médicos, agendamentos, séries e a lista de espera guardam o ID da
+# especialidade no catálogo (filtros e agrupamentos comparam inteiros
+# indexados) e, para exibição, o nome cadastrado. O nome recebido pela API é
+# resolvido pelo cache de app.especialidades: grafias equivalentes ("Cardiologia",
+# "cardiologia") resultam na mesma especialidade; nomes fora do catálogo são
+# rejeitados antes de qualquer escrita.
+
+
+def _com_especialidade(db: Session, dados: dict) -> dict:
+    """
+    Preenche `especialidade_id` e o nome do catálogo a partir de `especialidade`.
+
+    Raises:
+        EspecialidadeNaoEncontradaError: Se o nome não está no catálogo.
+    """
+    if dados.get("especialidade") is not None:
+        item = catalogo.obter(db, dados["especialidade"])
+        if item is None:
+            raise EspecialidadeNaoEncontradaError(dados["especialidade"])
+        dados["especialidade_id"], dados["especialidade"] = item
+    return dados
+
+
+def get_especialidades(db: Session) -> List[models.Especialidade]:
+    """Retorna as especialidades do catálogo, em ordem alfabética de chave."""
+    return list(
+        db.scalars(select(models.Especialidade).order_by(models.Especialidade.chave))
+    )
+
+
+def create_especialidade(
+    db: Session, especialidade: schemas.EspecialidadeCreate
+) -> models.Especialidade:
+    """
+    Cadastra uma especialidade no catálogo.
+
+    Raises:
+        EspecialidadeDuplicadaError: Se já existe uma especialidade com a mesma
+            chave normalizada (índice único; cadastros simultâneos esbarram
+            nele na inserção).
+    """
+    nome = " ".join(especialidade.nome.split())
+    if catalogo.obter(db, nome) is not None:
+        raise EspecialidadeDuplicadaError(nome)
+    db_especialidade = models.Especialidade(nome=nome, chave=chave_especialidade(nome))
+    db.add(db_especialidade)
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        raise EspecialidadeDuplicadaError(nome) from exc
+    return db_especialidade
+
+
+# ====================================================================================
+# ===== --- CRUD de Médicos (Simples) ---                                        =====
+# ====================================================================================
+
+
+def get_medico_by_id(db: Session, medico_id: int) -> Optional[models.Medico]:
+    """Busca um médico pelo ID."""
+    return (
+        db.query(models.Medico)
+        .filter(models.Medico.id == medico_id, models.Medico.deleted_at.is_(None))
+        .first()
+    )
+
+
+def get_medico_by_nome(db: Session, nome: str) -> Optional[models.Medico]:
+    """Busca um médico pelo nome."""
+    return (
+        db.query(models.Medico)
+        .filter(models.Medico.nome == nome, models.Medico.deleted_at.is_(None))
+        .first()
+    )
+
+
+def get_medicos(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    especialidade_id: Optional[int] = None,
+) -> List[models.Medico]:
+    """Retorna uma lista de médicos, opcionalmente de uma especialidade."""
+    query = db.query(models.Medico).filter(models.Medico.deleted_at.is_(None))
+    if especialidade_id is not None:
+        query = query.filter(models.Medico.especialidade_id == especialidade_id)
+    return query.offset(skip).limit(limit).all()
+
+
+def get_medicos_by_ids(db: Session, ids: List[int]) -> List[models.Medico]:
+    """Busca vários médicos em uma única consulta `IN`, na ordem de `ids`."""
+    if not ids:
+        return []
+    encontrados = {
+        medico.id: medico
+        for medico in db.scalars(
+            select(models.Medico).where(
+                models.Medico.id.in_(ids), models.Medico.deleted_at.is_(None)
+            )
+        )
+    }
+    return [encontrados[i] for i in ids if i in encontrados]
+
+
+def create_medico(db: Session, medico: schemas.MedicoCreate) -> models.Medico:
+    """
+    Cria um novo médico.
+
+    Raises:
+        MedicoDuplicadoError: Se o nome já pertence a um médico ativo (índice
+            único parcial; cadastros simultâneos esbarram nele na inserção).
+    """
+    db_medico = models.Medico(**_com_especialidade(db, medico.model_dump()))
+    db.add(db_medico)
+    try:
+        db.flush()
+    except IntegrityError as exc:
+        db.rollback()
+        raise MedicoDuplicadoError() from exc
+    _gravar_mudancas(db, MEDICO, CRIADO, [db_medico])
+    db.commit()
+    return db_medico
+
+
+def update_medico(
+    db: Session, medico_id: int, medico_update: schemas.MedicoUpdate
+) -> Optional[models.Medico]:
+    """Atualiza um médico existente com um único `UPDATE ... RETURNING`."""
+    update_data = _com_especialidade(
+        db,
+        {
+            key: value
+            for key, value in medico_update.model_dump(exclude_unset=True).items()
+            if value is not None
+        },
+    )
+    if update_data:
+        stmt = (
+            update(models.Medico)
+            .where(models.Medico.id == medico_id, models.Medico.deleted_at.is_(None))
+            .values(**update_data)
+            .returning(models.Medico)
+        )
+    else:
+        stmt = select(models.Medico).where(
+            models.Medico.id == medico_id, models.Medico.deleted_at.is_(None)
+        )
+    db_medico = db.scalars(
+        stmt, execution_options={"synchronize_session": False}
+    ).first()
+    if db_medico is None:
+        db.rollback()
+        return None
+    if update_data:
+        _gravar_mudancas(db, MEDICO, ATUALIZADO, [db_medico])
+    db.commit()
+    return db_medico
+
+
+def delete_medico(db: Session, medico_id: int) -> Optional[models.Medico]:
+    """
+    Remove logicamente um médico com um único `UPDATE ... RETURNING`. Esperas
+    que preferiam o médico passam a aceitar qualquer médico da especialidade.
+    """
+    db_medico = db.scalars(
+        update(models.Medico)
+        .where(models.Medico.id == medico_id, models.Medico.deleted_at.is_(None))
+        .values(deleted_at=_agora())
+        .returning(models.Medico),
+        execution_options={"synchronize_session": False},
+    ).first()
+    if db_medico is None:
+        db.rollback()
+        return None
+    db.execute(
+        update(models.EntradaListaEspera)
+        .where(models.EntradaListaEspera.medico_id == medico_id)
+        .values(medico_id=None)
+    )
+    _gravar_mudancas(db, MEDICO, REMOVIDO, [db_medico])
+    db.commit()
+    return db_medico
+
+
+# ====================================================================================
+# ===== --- Feed de Mudanças ---                                                 =====
+# ====================================================================================
+
+
+def formatar_cursor(transacao: int, seq: int) -> str:
+    """Cursor opaco do feed de mudanças: "<transacao>.<seq>"."""
+    return f"{transacao}.{seq}"
+
+
+def ler_cursor(cursor: Optional[str]) -> Tuple[int, int]:
+    """
+    Converte um cursor do feed em (transacao, seq); None ou "0" é o início.
+
+    Raises:
+        ValueError: Se o cursor for inválido.
+    """
+    if not cursor or cursor == "0":
+        return 0, 0
+    transacao, _, seq = cursor.partition(".")
+    return int(transacao), int(seq)
+
+
+def get_mudancas(
+    db: Session, desde: Tuple[int, int], limite: int = 100
+) -> List[models.EventoOutbox]:
+    """
+    Busca os eventos de outbox posteriores ao cursor, em ordem.
+
+    No PostgreSQL, a ordem é (transacao, seq) e só são entregues eventos de
+    transações anteriores ao xmin do snapshot atual — todas já concluídas.
+    Assim, um evento que ainda será confirmado nunca fica "para trás" de um
+    cursor já entregue, mesmo que sua seq seja menor.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        desde: O cursor (transacao, seq) do último evento já consumido.
+        limite: O número máximo de eventos a retornar.
+
+    Returns:
+        Uma lista de objetos models.EventoOutbox.
+    """
+    stmt = (
+        select(models.EventoOutbox)
+        .where(
+            tuple_(models.EventoOutbox.transacao, models.EventoOutbox.seq)
+            > tuple_(*(literal(valor, BigInteger) for valor in desde))
+        )
+        .order_by(models.EventoOutbox.transacao, models.EventoOutbox.seq)
+        .limit(limite)
+    )
+    return list(db.scalars(_apenas_transacoes_concluidas(db, stmt)))
+
+
+def _apenas_transacoes_concluidas(db: Session, stmt: Any) -> Any:
+    """No PostgreSQL, restringe aos eventos de transações anteriores ao xmin."""
+    if db.get_bind().dialect.name != "postgresql":
+        return stmt
+    xmin = cast(
+        cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger
+    )
+    return stmt.where(models.EventoOutbox.transacao < xmin)
+
+
+def posicao_atual_outbox(db: Session) -> Tuple[int, int]:
+    """
+    Posição (transacao, seq) do último evento de outbox que `get_mudancas` já
+    entregaria; toda mudança confirmada depois fica após essa posição.
+    """
+    ultima = db.execute(
+        _apenas_transacoes_concluidas(
+            db,
+            select(models.EventoOutbox.transacao, models.EventoOutbox.seq)
+            .order_by(
+                models.EventoOutbox.transacao.desc(), models.EventoOutbox.seq.desc()
+            )
+            .limit(1),
+        )
+    ).first()
+    return (0, 0) if ultima is None else (ultima.transacao, ultima.seq)
+
+
+# Tabelas entregues pelo snapshot da sincronização, na ordem de entrega
+ENTIDADES_SINCRONIZADAS = {
+    PACIENTE: models.Paciente,
+    MEDICO: models.Medico,
+    AGENDAMENTO: models.Agendamento,
+}
+
+
+def get_snapshot_sync(
+    db: Session, entidade: str, apos_id: int, limite: int
+) -> List[dict]:
+    """
+    Página do snapshot inicial da sincronização: registros ativos da entidade
+    com id maior que `apos_id`, em ordem de id.
+
+    Returns:
+        O estado de cada registro (como nos eventos de outbox).
+    """
+    modelo = ENTIDADES_SINCRONIZADAS[entidade]
+    stmt = (
+        select(modelo)
+        .where(modelo.id > apos_id, modelo.deleted_at.is_(None))
+        .order_by(modelo.id)
+        .limit(limite)
+    )
+    if modelo is models.Paciente:
+        stmt = stmt.options(joinedload(models.Paciente.endereco))
+    return [_instantaneo(registro) for registro in db.scalars(stmt)]
+
+
+def purgar_eventos_outbox(db: Session, antes_de: datetime, limite: int = 500) -> int:
+    """
+    Apaga até `limite` eventos de outbox gravados antes de `antes_de`.
+
+    Returns:
+        O número de eventos apagados.
+    """
+    antigos = (
+        select(models.EventoOutbox.seq)
+        .where(models.EventoOutbox.ocorrido_em < antes_de)
+        .order_by(models.EventoOutbox.seq)
+        .limit(limite)
+    )
+    apagados = db.execute(
+        delete(models.EventoOutbox).where(models.EventoOutbox.seq.in_(antigos))
+    ).rowcount
+    db.commit()
+    return apagados
+
+
+# ====================================================================================
+# ===== --- Lembretes de Consulta ---                                            =====
+# ====================================================================================
+
+
+def _sem_lembrete_enviado() -> Any:
+    return ~exists().where(
+        models.LembreteEnviado.agendamento_id == models.Agendamento.id,
+        models.LembreteEnviado.data_consulta
+        == models.Agendamento.data_proxima_consulta,
+    )
+
+
+def get_consultas_a_lembrar(
+    db: Session, inicio: date, fim: date
+) -> List[Tuple[int, date]]:
+    """
+    Busca as próximas consultas entre `inicio` e `fim` (inclusive) ainda sem
+    lembrete enviado, pelo índice parcial em `data_proxima_consulta`.
+
+    Returns:
+        Pares (ID do agendamento, data da próxima consulta).
+    """
+    return [
+        (agendamento_id, data_consulta)
+        for agendamento_id, data_consulta in db.execute(
+            select(
+                models.Agendamento.id, models.Agendamento.data_proxima_consulta
+            ).where(
+                models.Agendamento.deleted_at.is_(None),
+                models.Agendamento.data_proxima_consulta.between(inicio, fim),
+                _sem_lembrete_enviado(),
+            )
+        )
+    ]
+
+
+def get_lembretes_validos(db: Session, lembretes: List[Tuple[int, date]]) -> List[dict]:
+    """
+    Relê, em uma consulta, os agendamentos de um lote de lembretes e descarta
+    os que foram removidos, remarcados ou já lembrados desde a carga.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        lembretes: Pares (ID do agendamento, data da próxima consulta).
+
+    Returns:
+        Os dados de cada lembrete ainda válido (paciente, médico e consulta).
+    """
+    esperadas = dict(lembretes)
+    linhas = db.execute(
+        select(
+            models.Agendamento.id,
+            models.Agendamento.data_proxima_consulta,
+            models.Agendamento.especialidade,
+            models.Paciente.id,
+            models.Paciente.nome_completo,
+            models.Paciente.telefone,
+            models.Medico.nome,
+        )
+        .join(models.Paciente, models.Paciente.id == models.Agendamento.paciente_id)
+        .join(models.Medico, models.Medico.id == models.Agendamento.medico_id)
+        .where(
+            models.Agendamento.id.in_(esperadas),
+            models.Agendamento.deleted_at.is_(None),
+            _sem_lembrete_enviado(),
+        )
+    )
+    return [
+        {
+            "agendamento_id": agendamento_id,
+            "data_consulta": data_consulta,
+            "especialidade": especialidade,
+            "paciente_id": paciente_id,
+            "paciente_nome": paciente_nome,
+            "telefone": telefone,
+            "medico_nome": medico_nome,
+        }
+        for (
+            agendamento_id,
+            data_consulta,
+            especialidade,
+            paciente_id,
+            paciente_nome,
+            telefone,
+            medico_nome,
+        ) in linhas
+        if esperadas[agendamento_id] == data_consulta
+    ]
+
+
+def marcar_lembretes_enviados(db: Session, lembretes: List[Tuple[int, date]]) -> None:
+    """Registra os lembretes enviados com um único INSERT de múltiplas linhas."""
+    if not lembretes:
+        return
+    agora = _agora()
+    db.execute(
+        insert(models.LembreteEnviado).values(
+            [
+                {
+                    "agendamento_id": agendamento_id,
+                    "data_consulta": data_consulta,
+                    "enviado_em": agora,
+                }
+                for agendamento_id, data_consulta in lembretes
+            ]
+        )
+    )
+    db.commit()
+
+
+def purgar_lembretes_enviados(db: Session, antes_de: date, limite: int = 500) -> int:
+    """
+    Apaga até `limite` registros de lembretes de consultas anteriores a
+    `antes_de` (que nunca mais serão carregadas pelo agendador).
+
+    Returns:
+        O número de registros apagados.
+    """
+    antigos = (
+        select(models.LembreteEnviado.id)
+        .where(models.LembreteEnviado.data_consulta < antes_de)
+        .limit(limite)
+    )
+    apagados = db.execute(
+        delete(models.LembreteEnviado).where(models.LembreteEnviado.id.in_(antigos))
+    ).rowcount
+    db.commit()
+    return apagados
+
+
+# ====================================================================================
+# ===== --- Fila de Jobs ---                                                     =====
+# ====================================================================================
+
+
+def create_job(
+    db: Session, tipo: str, parametros: dict, max_tentativas: int
+) -> models.Job:
+    """
+    Enfileira um job para execução pelos workers.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        tipo: O tipo da tarefa (registrada em `app.jobs`).
+        parametros: Os parâmetros da tarefa (JSON).
+        max_tentativas: Quantas vezes o job pode ser executado antes de falhar.
+
+    Returns:
+        O objeto models.Job recém-criado.
+    """
+    agora = _agora()
+    db_job = models.Job(
+        tipo=tipo,
+        parametros=parametros,
+        status=StatusJob.PENDENTE.value,
+        tentativas=0,
+        max_tentativas=max_tentativas,
+        executar_apos=agora,
+        progresso=0,
+        criado_em=agora,
+    )
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+
+def get_job(db: Session, job_id: int) -> Optional[models.Job]:
+    """Busca um job pelo seu ID."""
+    return db.get(models.Job, job_id)
+
+
+def reservar_job(db: Session, worker: str, duracao: float) -> Optional[models.Job]:
+    """
+    Reserva o próximo job pronto para execução com um único UPDATE.
+
+    Candidatos são os jobs pendentes cujo `executar_apos` já passou e os jobs
+    em execução com a reserva vencida (worker interrompido). No PostgreSQL,
+    `FOR UPDATE SKIP LOCKED` faz cada worker pular os jobs que outro está
+    reservando no mesmo instante, sem espera.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        worker: Identificação do worker que reserva o job.
+        duracao: Segundos de validade da reserva (renovada a cada progresso).
+
+    Returns:
+        O job reservado, ou None se não houver job pronto.
+    """
+    agora = _agora()
+    proximo = (
+        select(models.Job.id)
+        .where(
+            or_(
+                (models.Job.status == StatusJob.PENDENTE.value)
+                & (models.Job.executar_apos <= agora),
+                (models.Job.status == StatusJob.EXECUTANDO.value)
+                & (models.Job.travado_ate < agora),
+            )
+        )
+        .order_by(models.Job.executar_apos)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    db_job = db.scalars(
+        update(models.Job)
+        .where(models.Job.id.in_(proximo))
+        .values(
+            status=StatusJob.EXECUTANDO.value,
+            tentativas=models.Job.tentativas + 1,
+            travado_ate=agora + timedelta(seconds=duracao),
+            worker=worker,
+            iniciado_em=func.coalesce(models.Job.iniciado_em, agora),
+            erro=None,
+        )
+        .returning(models.Job),
+        execution_options={"synchronize_session": False},
+    ).first()
+    db.commit()
+    return db_job
+
+
+def _do_worker(job_id: int, worker: str) -> List[Any]:
+    # Só o dono da reserva altera o job: outro worker pode tê-lo reassumido
+    return [
+        models.Job.id == job_id,
+        models.Job.worker == worker,
+        models.Job.status == StatusJob.EXECUTANDO.value,
+    ]
+
+
+def atualizar_progresso_job(
+    db: Session,
+    job_id: int,
+    worker: str,
+    progresso: int,
+    mensagem: Optional[str],
+    estado: Optional[dict],
+    duracao: float,
+) -> bool:
+    """
+    Grava o progresso (0 a 100) e o ponto de retomada do job e renova a reserva.
+
+    Returns:
+        False se o worker perdeu a reserva do job.
+    """
+    valores: dict = {
+        "progresso": progresso,
+        "mensagem": mensagem,
+        "travado_ate": _agora() + timedelta(seconds=duracao),
+    }
+    if estado is not None:
+        valores["estado"] = estado
+    atualizados = db.execute(
+        update(models.Job).where(*_do_worker(job_id, worker)).values(**valores),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    db.commit()
+    return atualizados == 1
+
+
+def concluir_job(db: Session, job_id: int, worker: str, resultado: dict) -> None:
+    """Marca o job como concluído com o resultado da tarefa."""
+    db.execute(
+        update(models.Job)
+        .where(*_do_worker(job_id, worker))
+        .values(
+            status=StatusJob.CONCLUIDO.value,
+            progresso=100,
+            resultado=resultado,
+            travado_ate=None,
+            concluido_em=_agora(),
+        ),
+        execution_options={"synchronize_session": False},
+    )
+    db.commit()
+
+
+def falhar_job(
+    db: Session,
+    job_id: int,
+    worker: str,
+    erro: str,
+    nova_tentativa_em: Optional[datetime],
+) -> None:
+    """
+    Registra a falha de uma execução do job.
+
+    Args:
+        nova_tentativa_em: Quando tentar de novo; None para falha definitiva.
+    """
+    if nova_tentativa_em is None:
+        valores: dict = {
+            "status": StatusJob.FALHOU.value,
+            "concluido_em": _agora(),
+        }
+    else:
+        valores = {
+            "status": StatusJob.PENDENTE.value,
+            "executar_apos": nova_tentativa_em,
+        }
+    db.execute(
+        update(models.Job)
+        .where(*_do_worker(job_id, worker))
+        .values(erro=erro, travado_ate=None, **valores),
+        execution_options={"synchronize_session": False},
+    )
+    db.commit()
+
+
+def purgar_jobs_finalizados(db: Session, antes_de: datetime, limite: int = 500) -> int:
+    """
+    Apaga até `limite` jobs concluídos ou falhos finalizados antes de `antes_de`.
+
+    Returns:
+        O número de jobs apagados.
+    """
+    antigos = (
+        select(models.Job.id)
+        .where(
+            models.Job.status.in_([StatusJob.CONCLUIDO.value, StatusJob.FALHOU.value]),
+            models.Job.concluido_em < antes_de,
+        )
+        .limit(limite)
+    )
+    apagados = db.execute(delete(models.Job).where(models.Job.id.in_(antigos))).rowcount
+    db.commit()
+    return apagados
+
+
+# ====================================================================================
+# ===== --- Expurgo de Registros Removidos ---                                   =====
+# ====================================================================================
+
+
+def _ids_removidos(
+    db: Session, modelo: Any, antes_de: datetime, limite: int, *condicoes: Any
+) -> List[int]:
+    """
+    Seleciona (e trava) até `limite` IDs removidos antes de `antes_de`.
+
+    `FOR UPDATE SKIP LOCKED` no PostgreSQL permite que vários workers
+    expurguem em paralelo sem disputar as mesmas linhas.
+    """
+    return list(
+        db.scalars(
+            select(modelo.id)
+            .where(modelo.deleted_at.is_not(None), modelo.deleted_at < antes_de)
+            .where(*condicoes)
+            .order_by(modelo.deleted_at)
+            .limit(limite)
+            .with_for_update(skip_locked=True)
+        )
+    )
+
+
+def purgar_agendamentos_removidos(
+    db: Session, antes_de: datetime, limite: int = 500
+) -> int:
+    """
+    Apaga fisicamente até `limite` agendamentos removidos antes de `antes_de`.
+
+    Returns:
+        O número de agendamentos apagados.
+    """
+    ids = _ids_removidos(db, models.Agendamento, antes_de, limite)
+    if ids:
+        db.execute(delete(models.Agendamento).where(models.Agendamento.id.in_(ids)))
+    db.commit()
+    return len(ids)
+
+
+def purgar_pacientes_removidos(
+    db: Session, antes_de: datetime, limite: int = 500
+) -> int:
+    """
+    Apaga fisicamente até `limite` pacientes removidos antes de `antes_de`,
+    junto com seus endereços.
+
+    Pacientes ainda referenciados por agendamentos, séries ou entradas da
+    lista de espera são mantidos até que esses registros sejam apagados.
+
+    Returns:
+        O número de pacientes apagados.
+    """
+    ids = _ids_removidos(
+        db,
+        models.Paciente,
+        antes_de,
+        limite,
+        ~exists().where(models.Agendamento.paciente_id == models.Paciente.id),
+        ~exists().where(models.SerieAgendamento.paciente_id == models.Paciente.id),
+        ~exists().where(models.EntradaListaEspera.paciente_id == models.Paciente.id),
+    )
+    if ids:
+        db.execute(delete(models.Endereco).where(models.Endereco.paciente_id.in_(ids)))
+        db.execute(delete(models.Paciente).where(models.Paciente.id.in_(ids)))
+    db.commit()
+    return len(ids)
+
+
+def purgar_medicos_removidos(db: Session, antes_de: datetime, limite: int = 500) -> int:
+    """
+    Apaga fisicamente até `limite` médicos removidos antes de `antes_de`.
+
+    Médicos ainda referenciados por agendamentos, séries, entradas da lista de
+    espera ou contas de usuário são mantidos.
+
+    Returns:
+        O número de médicos apagados.
+    """
+    ids = _ids_removidos(
+        db,
+        models.Medico,
+        antes_de,
+        limite,
+        ~exists().where(models.Agendamento.medico_id == models.Medico.id),
+        ~exists().where(models.SerieAgendamento.medico_id == models.Medico.id),
+        ~exists().where(models.EntradaListaEspera.medico_id == models.Medico.id),
+        ~exists().where(models.User.medico_id == models.Medico.id),
+    )
+    if ids:
+        db.execute(
+            delete(models.CargaMedico).where(models.CargaMedico.medico_id.in_(ids))
+        )
+        db.execute(delete(models.Medico).where(models.Medico.id.in_(ids)))
+    db.commit()
+    return len(ids)
+
+
+# ====================================================================================
+# ===== --- CRUD de Usuários ---                                                 =====
+# ====================================================================================
+
+
+def get_user_by_id(db: Session, user_id: int) -> Optional[models.User]:
+    """Busca um usuário pelo seu ID."""
+    return db.query(models.User).filter(models.User.id == user_id).first()
+
+
+def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
+    """Busca um usuário pelo seu endereço de e-mail."""
+    return db.query(models.User).filter(models.User.email == email).first()
+
+
+def create_user(db: Session, user: schemas.UserCreate) -> models.User:
+    """
+    Cria um novo usuário no banco de dados.
+    A senha fornecida é hasheada antes de ser armazenada.
+    O campo is_superuser é definido como True se o role for ADMIN.
+    """
+    hashed_password = get_password_hash(user.password)
+
+    is_superuser_val = True if user.role == UserRole.ADMIN else False
+
+    # Cria a instância do modelo User
+    db_user = models.User(
+        email=user.email,
+        hashed_password=hashed_password,
+        nome_completo=user.nome_completo,
+        role=user.role,
+        is_active=True,
+        is_superuser=is_superuser_val,
+        medico_id=user.medico_id if hasattr(user, "medico_id") else None,
+    )
+
+    try:
+        db.add(db_user)
+        db.commit()
+        return db_user
+    except IntegrityError:
+        db.rollback()
+        raise ValueError(
+            "Erro de integridade: Email ou medico_id (se único) já pode existir."
+        )
+
+
+# (Adicionar update_user e delete_user futuramente, conforme necessário)
+
+
+# ====================================================================================
+# ===== --- CRUD de Chaves de Idempotência ---                                   =====
+# ====================================================================================
+
+
+def get_chave_idempotencia(
+    db: Session, chave: str, rota: str
+) -> Optional[models.ChaveIdempotencia]:
+    """Busca uma chave de idempotência ainda válida (não expirada)."""
+    return db.scalars(
+        select(models.ChaveIdempotencia).where(
+            models.ChaveIdempotencia.chave == chave,
+            models.ChaveIdempotencia.rota == rota,
+            models.ChaveIdempotencia.expira_em > datetime.now(timezone.utc),
+        )
+    ).first()
+
+
+def reservar_chave_idempotencia(
+    db: Session, chave: str, rota: str, hash_requisicao: str, lease_segundos: float
+) -> Tuple[models.ChaveIdempotencia, bool]:
+    """
+    Reserva uma chave de idempotência para uma requisição em andamento.
+
+    A reserva é um INSERT com `status_code` nulo; a chave primária garante que
+    apenas uma requisição (em qualquer worker) a obtenha. Uma chave expirada
+    ainda não purgada é removida e a reserva é refeita. A reserva vale apenas
+    por `lease_segundos`: se o worker morrer antes de concluí-la, a chave
+    volta a ficar disponível logo, e não ao fim do TTL da resposta.
+
+    Args:
+        db: A sessão ativa do banco de dados.
+        chave: O valor do header Idempotency-Key.
+        rota: O caminho da requisição.
+        hash_requisicao: Hash do corpo e da identidade da requisição.
+        lease_segundos: Por quanto tempo a reserva em andamento é válida.
+
+    Returns:
+        Uma tupla (registro, reservada). `reservada` é False quando a chave já
+        existia; nesse caso o registro existente é retornado.
+    """
+    agora = datetime.now(timezone.utc)
+    db.execute(
+        delete(models.ChaveIdempotencia).where(
+            models.ChaveIdempotencia.chave == chave,
+            models.ChaveIdempotencia.rota == rota,
+            models.ChaveIdempotencia.expira_em <= agora,
+        )
+    )
+    db_chave = models.ChaveIdempotencia(
+        chave=chave,
+        rota=rota,
+        hash_requisicao=hash_requisicao,
+        expira_em=agora + timedelta(seconds=lease_segundos),
+    )
+    try:
+        db.add(db_chave)
+        db.commit()
+        return db_chave, True
+    except IntegrityError:
+        db.rollback()
+    existente = get_chave_idempotencia(db, chave=chave, rota=rota)
+    if existente is None:
+        # A chave existente expirou entre o INSERT e a leitura: tenta de novo.
+        return reservar_chave_idempotencia(
+            db, chave, rota, hash_requisicao, lease_segundos
+        )
+    return existente, False
+
+
+def concluir_chave_idempotencia(
+    db: Session,
+    chave: str,
+    rota: str,
+    status_code: int,
+    headers: List[List[str]],
+    corpo: bytes,
+    ttl_segundos: int,
+) -> None:
+    """
+    Armazena a resposta final de uma requisição associada à chave e estende
+    a validade da chave, até então a da reserva, para `ttl_segundos`.
+    """
+    db.execute(
+        update(models.ChaveIdempotencia)
+        .where(
+            models.ChaveIdempotencia.chave == chave,
+            models.ChaveIdempotencia.rota == rota,
+            models.ChaveIdempotencia.status_code.is_(None),
+        )
+        .values(
+            status_code=status_code,
+            headers=headers,
+            corpo=corpo,
+            expira_em=datetime.now(timezone.utc) + timedelta(seconds=ttl_segundos),
+        )
+    )
+    db.commit()
+
+
+def liberar_chave_idempotencia(db: Session, chave: str, rota: str) -> None:
+    """Remove a reserva de uma chave cuja requisição falhou, liberando-a."""
+    db.execute(
+        delete(models.ChaveIdempotencia).where(
+            models.ChaveIdempotencia.chave == chave,
+            models.ChaveIdempotencia.rota == rota,
+            models.ChaveIdempotencia.status_code.is_(None),
+        )
+    )
+    db.commit()
+
+
+def purgar_chaves_idempotencia_expiradas(db: Session, limite: int = 1000) -> int:
+    """
+    Remove até `limite` chaves de idempotência expiradas.
+
+    Returns:
+        O número de chaves removidas.
+    """
+    expiradas = (
+        select(models.ChaveIdempotencia.chave, models.ChaveIdempotencia.rota)
+        .where(models.ChaveIdempotencia.expira_em <= datetime.now(timezone.utc))
+        .limit(limite)
+    )
+    removidas = db.execute(
+        delete(models.ChaveIdempotencia).where(
+            tuple_(models.ChaveIdempotencia.chave, models.ChaveIdempotencia.rota).in_(
+                expiradas
+            )
+        )
+    ).rowcount
+    db.commit()
+    return removidas
@@ -25,8 +25,12 @@ if SQLALCHEMY_DATABASE_URL is None:
 # Cria a engine do SQLAlchemy
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 
-# Cria a instância de SessionLocal, que será uma sessão do banco de dados
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Cria a instância de SessionLocal, que será uma sessão do banco de dados.
+# expire_on_commit=False evita que os objetos retornados pelo CRUD sejam
+# recarregados (um SELECT extra por objeto) ao serem serializados após o commit.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 
 # ====================================================================================
@@ -38,17 +42,3 @@ class Base(DeclarativeBase):
     """Classe base para todos os modelos ORM SQLAlchemy."""
 
     pass
-
-
-# ====================================================================================
-# ===== --- Funções Utilitárias de Banco de Dados ---                            =====
-# ====================================================================================
-
-
-# Função para criar todas as tabelas no banco de dados
-def create_db_and_tables():
-    """
-    Cria todas as tabelas no banco de dados definidas pelos modelos que herdam de Base.
-    Esta função deve ser chamada na inicialização da aplicação.
-    """
-    Base.metadata.create_all(bind=engine)
@@ -0,0 +1,206 @@
+# app/deadlines.py
+
+"""
+Prazos (deadlines) por requisição, propagados ao banco como statement_timeout.
+
+O prazo vem do header `X-Request-Timeout` (segundos) ou do padrão da rota
+(REQUEST_TIMEOUT_ROUTES / REQUEST_TIMEOUT_DEFAULT_SECONDS) e fica em uma
+ContextVar, visível também nas rotas síncronas executadas no threadpool.
+
+Quem faz cumprir o prazo é o banco, não o event loop. Toda transação aberta
+por uma sessão do `SessionLocal` recebe `SET LOCAL statement_timeout` com o
+tempo restante (PostgreSQL): o próprio banco cancela a consulta no prazo, a
+exceção desfaz a transação e `get_db` devolve a conexão ao pool. Antes de cada
+comando SQL, um prazo já esgotado levanta `PrazoExcedidoError` sem ida ao
+banco. O middleware responde 504 nos dois casos.
+
+As rotas são `async def` com chamadas síncronas ao banco: enquanto uma
+consulta roda, o event loop está bloqueado e o `asyncio.wait_for` do
+middleware não consegue interrompê-la — ele só age nos pontos de `await`
+(espera na admissão, leitura do corpo). Trabalho lento fora do banco não é
+interrompido. As funções do `crud` carregam, na transação, os relacionamentos
+usados nas respostas, de modo que a serialização não consulta o banco.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import asyncio
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+# ====================================================================================
+# ===== --- Prazo da Requisição ---                                              =====
+# ====================================================================================
+
+HEADER_TIMEOUT = b"x-request-timeout"
+
+# Instante (time.monotonic) em que a requisição atual expira
+_prazo: ContextVar[Optional[float]] = ContextVar("prazo_requisicao", default=None)
+
+# Folga dada ao banco para cancelar a consulta antes de o middleware desistir
+_FOLGA_SEGUNDOS = 0.5
+
+
+class PrazoExcedidoError(Exception):
+    """Levantada quando o prazo da requisição já passou antes de um comando SQL."""
+
+
+def tempo_restante() -> Optional[float]:
+    """Segundos restantes até o prazo da requisição atual (None se não houver)."""
+    prazo = _prazo.get()
+    return None if prazo is None else prazo - time.monotonic()
+
+
+@contextmanager
+def sem_prazo() -> Iterator[None]:
+    """
+    Executa o bloco sem o prazo da requisição atual. Para BackgroundTasks,
+    que rodam depois da resposta mas herdam a ContextVar da requisição.
+    """
+    token = _prazo.set(None)
+    try:
+        yield
+    finally:
+        _prazo.reset(token)
+
+
+def timeout_da_rota(metodo: str, caminho: str) -> float:
+    """
+    Prazo padrão da rota: a chave mais longa de REQUEST_TIMEOUT_ROUTES que for
+    prefixo de "MÉTODO /caminho" ou de "/caminho".
+    """
+    melhor, tamanho = settings.REQUEST_TIMEOUT_DEFAULT_SECONDS, -1
+    completo = f"{metodo} {caminho}"
+    for chave, segundos in settings.REQUEST_TIMEOUT_ROUTES.items():
+        alvo = completo if " " in chave else caminho
+        if alvo.startswith(chave) and len(chave) > tamanho:
+            melhor, tamanho = segundos, len(chave)
+    return melhor
+
+
+def _consulta_cancelada(exc: BaseException) -> bool:
+    """True para o erro de statement_timeout do PostgreSQL (SQLSTATE 57014)."""
+    return (
+        isinstance(exc, OperationalError)
+        and getattr(exc.orig, "pgcode", None) == "57014"
+    )
+
+
+# ====================================================================================
+# ===== --- Propagação para o Banco ---                                          =====
+# ====================================================================================
+
+
+def instrumentar_sessoes(fabrica_de_sessoes, engine) -> None:
+    """
+    Aplica o tempo restante como statement_timeout em cada transação e recusa
+    novos comandos SQL depois que o prazo passou.
+
+    O statement_timeout limita cada comando ao tempo restante no início da
+    transação; a verificação antes de cada comando (sem ida ao banco) impede
+    que uma sequência de comandos rápidos ultrapasse o prazo.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _verificar_prazo(conn, cursor, statement, parameters, context, executemany):
+        restante = tempo_restante()
+        if restante is not None and restante <= 0:
+            raise PrazoExcedidoError()
+
+    @event.listens_for(fabrica_de_sessoes, "after_begin")
+    def _aplicar_statement_timeout(session, transaction, connection):
+        restante = tempo_restante()
+        if restante is None:
+            return
+        if restante <= 0:
+            raise PrazoExcedidoError()
+        if connection.dialect.name == "postgresql":
+            connection.exec_driver_sql(
+                f"SET LOCAL statement_timeout = {max(int(restante * 1000), 1)}"
+            )
+
+
+# ====================================================================================
+# ===== --- Middleware de Prazos ---                                             =====
+# ====================================================================================
+
+
+class DeadlineMiddleware:
+    """Define o prazo de cada requisição e responde 504 quando ele se esgota."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].endswith(
+            tuple(settings.LONG_LIVED_PATH_SUFFIXES)
+        ):
+            # Streams ficam abertos por tempo indeterminado: sem prazo
+            await self.app(scope, receive, send)
+            return
+
+        timeout = timeout_da_rota(scope["method"], scope["path"])
+        for chave, valor in scope.get("headers", []):
+            if chave == HEADER_TIMEOUT:
+                try:
+                    timeout = float(valor)
+                except ValueError:
+                    timeout = 0.0
+                if not 0 < timeout <= settings.REQUEST_TIMEOUT_MAX_SECONDS:
+                    await self._responder(
+                        send,
+                        400,
+                        "X-Request-Timeout deve ser um número de segundos entre 0 "
+                        f"e {settings.REQUEST_TIMEOUT_MAX_SECONDS}.",
+                    )
+                    return
+                break
+
+        resposta_iniciada = False
+
+        async def send_rastreando(mensagem: Message) -> None:
+            nonlocal resposta_iniciada
+            if mensagem["type"] == "http.response.start":
+                resposta_iniciada = True
+            await send(mensagem)
+
+        token = _prazo.set(time.monotonic() + timeout)
+        try:
+            await asyncio.wait_for(
+                self.app(scope, receive, send_rastreando), timeout + _FOLGA_SEGUNDOS
+            )
+        except (asyncio.TimeoutError, PrazoExcedidoError):
+            if not resposta_iniciada:
+                await self._responder(send, 504, "Prazo da requisição excedido.")
+        except OperationalError as exc:
+            if not _consulta_cancelada(exc) or resposta_iniciada:
+                raise
+            await self._responder(send, 504, "Prazo da requisição excedido.")
+        finally:
+            _prazo.reset(token)
+
+    @staticmethod
+    async def _responder(send: Send, status_code: int, detail: str) -> None:
+        corpo = json.dumps({"detail": detail}, ensure_ascii=False).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(corpo)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": corpo})
@@ -4,16 +4,19 @@
 # ===== --- Importações ---                                                      =====
 # ====================================================================================
 
-from typing import Annotated
+from datetime import date
+from typing import Annotated, List, Optional, Tuple
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from sqlalchemy.orm import Session
 
-from . import crud, models, security
+from . import auditoria, crud, models, security, tracing
+from .config import settings
 from .database import SessionLocal
 from .enums import UserRole
+from .especialidades import catalogo
 
 
 # ====================================================================================
@@ -31,6 +34,88 @@ def get_db():
         db.close()
 
 
+# ====================================================================================
+# ===== --- Dependências de Parâmetros ---                                       =====
+# ====================================================================================
+HEADER_IDS_NAO_ENCONTRADOS = "X-Ids-Nao-Encontrados"
+
+
+def get_ids_em_lote(
+    ids: Annotated[
+        Optional[str],
+        Query(
+            description="IDs separados por vírgula (ex: 1,2,3) para busca em lote.",
+            examples=["1,2,3"],
+        ),
+    ] = None,
+) -> Optional[List[int]]:
+    """
+    Converte o parâmetro `ids` ("1,2,3") em uma lista de inteiros sem repetições,
+    preservando a ordem informada.
+    Levanta HTTPException (422) se algum ID for inválido ou se o lote exceder
+    BATCH_MAX_IDS.
+    """
+    if ids is None:
+        return None
+    try:
+        lista = list(dict.fromkeys(int(parte) for parte in ids.split(",") if parte))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="O parâmetro 'ids' deve conter inteiros separados por vírgula.",
+        )
+    if len(lista) > settings.BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"No máximo {settings.BATCH_MAX_IDS} IDs por consulta em lote.",
+        )
+    return lista
+
+
+def get_janela_calendario(
+    inicio: Annotated[date, Query(examples=["2025-01-01"])],
+    fim: Annotated[date, Query(examples=["2025-01-31"])],
+) -> Tuple[date, date]:
+    """
+    Valida a janela (`inicio`, `fim`, inclusive) de uma consulta de calendário.
+    Levanta HTTPException (422) se `fim` for anterior a `inicio` ou se a janela
+    exceder CALENDAR_MAX_DAYS.
+    """
+    if fim < inicio:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="'fim' deve ser igual ou posterior a 'inicio'.",
+        )
+    if (fim - inicio).days + 1 > settings.CALENDAR_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"A janela do calendário é de no máximo "
+            f"{settings.CALENDAR_MAX_DAYS} dias.",
+        )
+    return inicio, fim
+
+
+def get_filtro_especialidade(
+    db: Annotated[Session, Depends(get_db)],
+    especialidade: Annotated[Optional[str], Query(examples=["Cardiologia"])] = None,
+    especialidade_id: Optional[int] = None,
+) -> Optional[int]:
+    """
+    Converte o filtro de especialidade (`especialidade_id` ou o nome, em
+    qualquer grafia) no ID do catálogo, comparado pelos índices por ID.
+    Levanta HTTPException (404) se o nome não está no catálogo.
+    """
+    if especialidade_id is not None or especialidade is None:
+        return especialidade_id
+    item = catalogo.obter(db, especialidade)
+    if item is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Especialidade '{especialidade}' não encontrada.",
+        )
+    return item[0]
+
+
 # ====================================================================================
 # ===== --- Dependências de Autenticação (Espaço Reservado para o Futuro) ---    =====
 # ====================================================================================
@@ -45,6 +130,7 @@ async def get_current_user(
     """
     Decodifica o token JWT, recupera o ID do usuário e busca o usuário no banco.
     Levanta HTTPException se o token for inválido ou o usuário não for encontrado.
+    O usuário passa a ser o ator dos eventos de auditoria da requisição.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -63,9 +149,11 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = crud.get_user_by_id(db, user_id=user_id)
+    with tracing.span("auth.carregar_usuario", user_id=user_id):
+        user = crud.get_user_by_id(db, user_id=user_id)
     if user is None:
         raise credentials_exception
+    auditoria.definir_ator(user)
     return user
 
 
@@ -0,0 +1,97 @@
+# app/distribuicao.py
+
+"""
+Distribuição automática de médicos para agendamentos feitos só com a
+especialidade (POST /agendamentos/ sem `medico_id`).
+
+Entre os médicos ativos da especialidade, descarta os que já têm
+AUTO_ASSIGN_MAX_PER_DAY consultas no dia e escolhe o de menor carga na janela
+de AUTO_ASSIGN_WINDOW_DAYS dias antes e depois da consulta. O médico do
+último agendamento do paciente na especialidade tem preferência (continuidade
+do acompanhamento) enquanto sua carga não passar da menor carga em mais de
+AUTO_ASSIGN_CONTINUITY_SLACK consultas.
+
+A carga vem dos contadores de 'carga_medicos' (`crud.get_carga_medicos`):
+uma consulta agregada sobre (médicos da especialidade x dias da janela).
+Essa leitura apenas ordena os candidatos; o limite diário é garantido no
+agendamento, por um incremento condicional do contador do dia
+(`crud.reservar_vaga_medico`) na mesma transação do INSERT. Se outra
+requisição ocupou a última vaga do escolhido, o próximo candidato é tentado.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+from datetime import date, timedelta
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from . import crud, models, schemas
+from .config import settings
+
+# ====================================================================================
+# ===== --- Escolha do Médico ---                                                =====
+# ====================================================================================
+
+
+def ordenar_candidatos(
+    db: Session, especialidade_id: int, data: date, paciente_id: Optional[int] = None
+) -> List[int]:
+    """
+    Ordena os médicos da especialidade com vaga em `data` pela preferência.
+
+    Returns:
+        Os IDs dos médicos, do preferido ao menos preferido; vazia se nenhum
+        médico da especialidade tem vaga no dia.
+    """
+    janela = timedelta(days=settings.AUTO_ASSIGN_WINDOW_DAYS)
+    carga = {
+        medico_id: carga_janela
+        for medico_id, carga_janela, carga_dia in crud.get_carga_medicos(
+            db, especialidade_id, data - janela, data + janela, data
+        )
+        if carga_dia < settings.AUTO_ASSIGN_MAX_PER_DAY
+    }
+    if not carga:
+        return []
+    candidatos = sorted(carga, key=lambda medico_id: (carga[medico_id], medico_id))
+    if paciente_id is not None:
+        anterior = crud.get_ultimo_medico_do_paciente(db, paciente_id, especialidade_id)
+        if (
+            anterior in carga
+            and carga[anterior]
+            <= carga[candidatos[0]] + settings.AUTO_ASSIGN_CONTINUITY_SLACK
+        ):
+            candidatos.remove(anterior)
+            candidatos.insert(0, anterior)
+    return candidatos
+
+
+def agendar(
+    db: Session, agendamento: schemas.AgendamentoCreate, especialidade_id: int
+) -> Optional[models.Agendamento]:
+    """
+    Cria o agendamento com o primeiro candidato que ainda tem vaga no dia.
+
+    A vaga é ocupada no contador de carga antes do INSERT, na mesma transação;
+    requisições concorrentes não ultrapassam AUTO_ASSIGN_MAX_PER_DAY.
+
+    Returns:
+        O agendamento criado, ou None se nenhum médico tem vaga no dia.
+    """
+    data = agendamento.data_primeira_consulta
+    for medico_id in ordenar_candidatos(
+        db, especialidade_id, data, paciente_id=agendamento.paciente_id
+    ):
+        if crud.reservar_vaga_medico(
+            db, medico_id, data, settings.AUTO_ASSIGN_MAX_PER_DAY
+        ):
+            return crud.create_agendamento(
+                db,
+                agendamento.model_copy(update={"medico_id": medico_id}),
+                vaga_reservada=True,
+            )
+    db.rollback()
+    return None
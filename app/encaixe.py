@@ -0,0 +1,68 @@
+# app/encaixe.py
+
+"""
+Encaixe de pacientes da lista de espera nas vagas de agendamentos removidos.
+
+As rotas que removem um agendamento agendam `preencher_vaga` como
+BackgroundTask: o encaixe roda logo depois do envio da resposta, sem atrasar
+quem cancelou. A escolha da entrada usa o índice parcial da fila
+(`ix_lista_espera_fila`) e `FOR UPDATE SKIP LOCKED` (ver
+`crud.encaixar_da_lista_espera`), então o custo não depende do tamanho da
+lista e cancelamentos simultâneos não disputam a mesma entrada.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import logging
+from datetime import date
+from typing import Optional
+
+from . import crud, models
+from .config import settings
+from .database import SessionLocal
+from .deadlines import sem_prazo
+
+logger = logging.getLogger(__name__)
+
+# ====================================================================================
+# ===== --- Encaixe ---                                                          =====
+# ====================================================================================
+
+
+def preencher_vaga(
+    vaga: models.Agendamento, hoje: Optional[date] = None
+) -> Optional[models.EntradaListaEspera]:
+    """
+    Oferece a vaga do agendamento removido à primeira entrada compatível da
+    lista de espera. Vagas em datas passadas são ignoradas.
+
+    Roda sem o prazo da requisição que cancelou: como BackgroundTask, herdaria
+    um prazo (e um statement_timeout) possivelmente já esgotado.
+
+    Returns:
+        A entrada encaixada, ou None se a vaga não foi preenchida.
+    """
+    if not settings.WAITLIST_MATCHING_ENABLED:
+        return None
+    if vaga.data_primeira_consulta < (hoje or date.today()):
+        return None
+    db = SessionLocal()
+    try:
+        with sem_prazo():
+            entrada = crud.encaixar_da_lista_espera(db, vaga)
+    except Exception:
+        # Falhar o encaixe não desfaz o cancelamento já respondido
+        logger.exception("Falha ao preencher a vaga do agendamento %d.", vaga.id)
+        return None
+    finally:
+        db.close()
+    if entrada is not None:
+        logger.info(
+            "Vaga do agendamento %d oferecida à espera %d (agendamento %d).",
+            vaga.id,
+            entrada.id,
+            entrada.agendamento_id,
+        )
+    return entrada
@@ -19,6 +19,31 @@ class UserRole(str, enum.Enum):
     MEDICO = "medico"
 
 
+class StatusJob(str, enum.Enum):
+    """Define os estados de um job da fila de tarefas em segundo plano."""
+
+    PENDENTE = "pendente"
+    EXECUTANDO = "executando"
+    CONCLUIDO = "concluido"
+    FALHOU = "falhou"
+
+
+class FrequenciaSerie(str, enum.Enum):
+    """Define a frequência de uma série de agendamentos recorrentes."""
+
+    SEMANAL = "semanal"
+    MENSAL = "mensal"
+
+
+class StatusListaEspera(str, enum.Enum):
+    """Define os estados de uma entrada da lista de espera."""
+
+    AGUARDANDO = "aguardando"
+    OFERECIDO = "oferecido"
+    CONFIRMADO = "confirmado"
+    CANCELADO = "cancelado"
+
+
 # class StatusAgendamento(str, enum.Enum):
 #     AGENDADO = "agendado"
 #     CONFIRMADO = "confirmado"
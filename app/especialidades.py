@@ -0,0 +1,94 @@
+# app/especialidades.py
+
+"""
+Catálogo de especialidades (tabela 'especialidades') com cache em memória.
+
+Cada especialidade tem um nome de exibição e uma chave normalizada — sem
+acentos, em minúsculas e com espaços simples —, única na tabela: "Cardiologia",
+"cardiologia " e "CARDIOLOGÍA" são a mesma especialidade. Médicos,
+agendamentos, séries e a lista de espera guardam o `especialidade_id` (filtros
+e agrupamentos comparam inteiros indexados) e, para exibição, o nome do
+catálogo.
+
+O catálogo é fechado: especialidades são cadastradas apenas pela migração
+(a partir das grafias existentes), pelo seed e por POST /especialidades
+(administradores). Escritas com um nome fora do catálogo são rejeitadas — um
+erro de digitação ("Cardiolgia") não vira uma especialidade nova.
+
+O cache mapeia chave -> (id, nome) e só cresce: especialidades não são
+renomeadas nem apagadas, então uma entrada em cache nunca fica desatualizada.
+Uma chave ausente (por exemplo, cadastrada por outro worker) é buscada no
+banco e, se existir, guardada; depois disso, obter um nome não consulta o
+banco.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import threading
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models
+
+# (id, nome de exibição)
+ItemDoCatalogo = Tuple[int, str]
+
+# ====================================================================================
+# ===== --- Normalização ---                                                     =====
+# ====================================================================================
+
+
+def chave(nome: str) -> str:
+    """Chave de comparação: sem acentos, casefold e espaços normalizados."""
+    sem_acentos = "".join(
+        caractere
+        for caractere in unicodedata.normalize("NFKD", nome)
+        if not unicodedata.combining(caractere)
+    )
+    return " ".join(sem_acentos.casefold().split())
+
+
+# ====================================================================================
+# ===== --- Catálogo ---                                                         =====
+# ====================================================================================
+
+
+class Catalogo:
+    """Cache de especialidades por chave normalizada, seguro entre threads."""
+
+    def __init__(self) -> None:
+        self._por_chave: Dict[str, ItemDoCatalogo] = {}
+        self._trava = threading.Lock()
+
+    def _guardar(self, chave_nome: str, item: ItemDoCatalogo) -> ItemDoCatalogo:
+        with self._trava:
+            return self._por_chave.setdefault(chave_nome, item)
+
+    def _buscar(self, db: Session, chave_nome: str) -> Optional[ItemDoCatalogo]:
+        linha = db.execute(
+            select(models.Especialidade.id, models.Especialidade.nome).where(
+                models.Especialidade.chave == chave_nome
+            )
+        ).first()
+        if linha is None:
+            return None
+        return self._guardar(chave_nome, (linha[0], linha[1]))
+
+    def obter(self, db: Session, nome: str) -> Optional[ItemDoCatalogo]:
+        """(id, nome) da especialidade equivalente a `nome`, ou None se não existe."""
+        chave_nome = chave(nome)
+        item = self._por_chave.get(chave_nome)
+        return item if item is not None else self._buscar(db, chave_nome)
+
+    def limpar(self) -> None:
+        """Esvazia o cache (por exemplo, ao trocar de banco nos testes)."""
+        with self._trava:
+            self._por_chave.clear()
+
+
+catalogo = Catalogo()
@@ -0,0 +1,363 @@
+# app/idempotency.py
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from . import crud
+from .config import settings
+from .database import SessionLocal
+from .deadlines import tempo_restante, timeout_da_rota
+
+# ====================================================================================
+# ===== --- Tipos e Constantes ---                                               =====
+# ====================================================================================
+
+# (status_code, headers, corpo) de uma resposta armazenada; os headers são
+# pares [nome, valor] já decodificados (latin-1), na ordem original
+RespostaArmazenada = Tuple[int, List[List[str]], bytes]
+
+HEADER_CHAVE = b"idempotency-key"
+TAMANHO_MAXIMO_CHAVE = 255
+INTERVALO_CONSULTA_SEGUNDOS = 0.1
+
+# Folga somada ao prazo da requisição na validade da reserva da chave
+FOLGA_RESERVA_SEGUNDOS = 5.0
+
+# Headers recalculados ou acrescentados pelo middleware a cada envio
+_HEADERS_NAO_ARMAZENADOS = {"content-length", "idempotency-key", "idempotent-replayed"}
+
+# Desfechos do processamento de uma requisição com chave
+EXECUTADA = "executada"
+REPETIDA = "repetida"
+REJEITADA = "rejeitada"
+
+
+# ====================================================================================
+# ===== --- Funções Auxiliares ---                                               =====
+# ====================================================================================
+
+
+def _header(scope: Scope, nome: bytes) -> Optional[str]:
+    """Retorna o valor de um header da requisição, se presente."""
+    for chave, valor in scope.get("headers", []):
+        if chave == nome:
+            return valor.decode("latin-1")
+    return None
+
+
+def _hash_requisicao(scope: Scope, corpo: bytes) -> str:
+    """
+    Calcula o hash que identifica a requisição associada a uma chave.
+
+    Inclui o header Authorization, de modo que a mesma chave usada por outro
+    usuário nunca receba a resposta armazenada de um terceiro.
+    """
+    digest = hashlib.sha256()
+    digest.update((_header(scope, b"authorization") or "").encode())
+    digest.update(b"\0")
+    digest.update(corpo)
+    return digest.hexdigest()
+
+
+def _lease_da_reserva(scope: Scope) -> float:
+    """
+    Validade da reserva de uma chave: o tempo restante da requisição (ou o
+    prazo padrão da rota, sem DeadlineMiddleware) mais uma folga.
+    """
+    restante = tempo_restante()
+    if restante is None:
+        restante = timeout_da_rota(scope["method"], scope["path"])
+    return max(restante, 0.0) + FOLGA_RESERVA_SEGUNDOS
+
+
+def _resposta_json(status_code: int, detail: str) -> RespostaArmazenada:
+    """Monta uma resposta de erro no mesmo formato das HTTPException da API."""
+    corpo = json.dumps({"detail": detail}, ensure_ascii=False).encode()
+    return status_code, [["content-type", "application/json"]], corpo
+
+
+async def _enviar(
+    send: Send, resposta: RespostaArmazenada, chave: str, repetida: bool
+) -> None:
+    """Envia uma resposta completa ao cliente."""
+    status_code, headers_armazenados, corpo = resposta
+    headers = [
+        (b"content-length", str(len(corpo)).encode()),
+        (b"idempotency-key", chave.encode("latin-1")),
+    ]
+    headers.extend(
+        (nome.encode("latin-1"), valor.encode("latin-1"))
+        for nome, valor in headers_armazenados
+    )
+    if repetida:
+        headers.append((b"idempotent-replayed", b"true"))
+    await send(
+        {"type": "http.response.start", "status": status_code, "headers": headers}
+    )
+    await send({"type": "http.response.body", "body": corpo})
+
+
+_RESPOSTA_CORPO_DIFERENTE = _resposta_json(
+    422, "Idempotency-Key já utilizado com uma requisição diferente."
+)
+
+
+# ====================================================================================
+# ===== --- Middleware de Idempotência ---                                       =====
+# ====================================================================================
+
+
+class IdempotencyMiddleware:
+    """
+    Middleware ASGI que honra o header `Idempotency-Key` em requisições POST.
+
+    - A primeira requisição com uma chave reserva-a no banco, executa a rota e
+      armazena a resposta (exceto erros 5xx, que liberam a chave). A reserva
+      vale só pelo prazo da requisição; a resposta armazenada, por
+      IDEMPOTENCY_TTL_SECONDS.
+    - Repetições com a mesma chave e o mesmo corpo recebem a resposta
+      armazenada (status, headers e corpo), com `Idempotent-Replayed: true`.
+    - Repetições concorrentes no mesmo worker aguardam a requisição original
+      em vez de consultar o banco; em outros workers, a reserva no banco faz o
+      papel de trava e a resposta é aguardada por até IDEMPOTENCY_WAIT_SECONDS.
+    - A mesma chave com um corpo diferente é rejeitada com 422.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._em_andamento: Dict[Tuple[str, str], Tuple[str, asyncio.Future]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        chave = _header(scope, HEADER_CHAVE)
+        rota = scope["path"]
+        if chave is None or rota in settings.IDEMPOTENCY_EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+        if not chave or len(chave) > TAMANHO_MAXIMO_CHAVE:
+            await _enviar(
+                send,
+                _resposta_json(400, "Idempotency-Key inválido."),
+                chave[:TAMANHO_MAXIMO_CHAVE],
+                repetida=False,
+            )
+            return
+
+        corpo = await self._ler_corpo(receive)
+        hash_requisicao = _hash_requisicao(scope, corpo)
+        limite = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+
+        while True:
+            em_andamento = self._em_andamento.get((chave, rota))
+            if em_andamento is not None:
+                hash_original, futuro_original = em_andamento
+                if hash_original != hash_requisicao:
+                    await _enviar(send, _RESPOSTA_CORPO_DIFERENTE, chave, False)
+                    return
+                resultado = await self._aguardar_local(futuro_original, limite)
+                if resultado is not None:
+                    await _enviar(send, resultado, chave, repetida=True)
+                    return
+                if time.monotonic() >= limite:
+                    break
+                continue
+
+            futuro = asyncio.get_running_loop().create_future()
+            self._em_andamento[(chave, rota)] = (hash_requisicao, futuro)
+            resposta: Optional[RespostaArmazenada] = None
+            desfecho = None
+            try:
+                resposta, desfecho = await self._processar(
+                    scope, corpo, send, chave, rota, hash_requisicao, limite
+                )
+            finally:
+                self._em_andamento.pop((chave, rota), None)
+                executada = desfecho == EXECUTADA and resposta is not None
+                futuro.set_result(resposta if executada and resposta[0] < 500 else None)
+            if desfecho != EXECUTADA:
+                await _enviar(send, resposta, chave, repetida=desfecho == REPETIDA)
+            return
+
+        await _enviar(
+            send,
+            _resposta_json(
+                409, "Uma requisição com este Idempotency-Key ainda está em andamento."
+            ),
+            chave,
+            repetida=False,
+        )
+
+    # --- Etapas ---
+
+    @staticmethod
+    async def _ler_corpo(receive: Receive) -> bytes:
+        """Lê o corpo completo da requisição."""
+        partes: List[bytes] = []
+        while True:
+            mensagem = await receive()
+            partes.append(mensagem.get("body", b""))
+            if not mensagem.get("more_body", False):
+                return b"".join(partes)
+
+    @staticmethod
+    async def _aguardar_local(
+        futuro: asyncio.Future, limite: float
+    ) -> Optional[RespostaArmazenada]:
+        """Aguarda a requisição original do mesmo worker até o limite."""
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(futuro), timeout=max(limite - time.monotonic(), 0)
+            )
+        except asyncio.TimeoutError:
+            return None
+
+    async def _processar(
+        self,
+        scope: Scope,
+        corpo: bytes,
+        send: Send,
+        chave: str,
+        rota: str,
+        hash_requisicao: str,
+        limite: float,
+    ) -> Tuple[Optional[RespostaArmazenada], str]:
+        """
+        Reserva a chave e executa a rota, ou obtém a resposta já armazenada.
+
+        Returns:
+            Uma tupla (resposta, desfecho). Apenas no desfecho EXECUTADA a
+            resposta já foi enviada ao cliente; nos demais (REPETIDA ou
+            REJEITADA) ela ainda precisa ser enviada.
+        """
+        while True:
+            registro, reservada = await run_in_threadpool(
+                self._reservar, chave, rota, hash_requisicao, _lease_da_reserva(scope)
+            )
+            if reservada:
+                try:
+                    resposta = await self._executar(scope, corpo, send)
+                except BaseException:
+                    await run_in_threadpool(self._concluir, chave, rota, None)
+                    raise
+                await run_in_threadpool(self._concluir, chave, rota, resposta)
+                return resposta, EXECUTADA
+            if registro.hash_requisicao != hash_requisicao:
+                return _RESPOSTA_CORPO_DIFERENTE, REJEITADA
+            if registro.status_code is not None:
+                armazenada = (
+                    registro.status_code,
+                    registro.headers or [],
+                    registro.corpo or b"",
+                )
+                return armazenada, REPETIDA
+            if time.monotonic() >= limite:
+                return (
+                    _resposta_json(
+                        409,
+                        "Uma requisição com este Idempotency-Key ainda está em "
+                        "andamento.",
+                    ),
+                    REJEITADA,
+                )
+            await asyncio.sleep(INTERVALO_CONSULTA_SEGUNDOS)
+
+    async def _executar(
+        self, scope: Scope, corpo: bytes, send: Send
+    ) -> Optional[RespostaArmazenada]:
+        """Executa a rota repassando a resposta ao cliente e capturando-a."""
+        corpo_entregue = False
+        status_code = 500
+        headers: List[List[str]] = []
+        partes: List[bytes] = []
+
+        async def receive_repetido() -> Message:
+            nonlocal corpo_entregue
+            if not corpo_entregue:
+                corpo_entregue = True
+                return {"type": "http.request", "body": corpo, "more_body": False}
+            return {"type": "http.disconnect"}
+
+        async def send_capturando(mensagem: Message) -> None:
+            nonlocal status_code
+            if mensagem["type"] == "http.response.start":
+                status_code = mensagem["status"]
+                for nome, valor in mensagem.get("headers", []):
+                    nome_str = nome.decode("latin-1").lower()
+                    if nome_str not in _HEADERS_NAO_ARMAZENADOS:
+                        headers.append([nome_str, valor.decode("latin-1")])
+            elif mensagem["type"] == "http.response.body":
+                partes.append(mensagem.get("body", b""))
+            await send(mensagem)
+
+        await self.app(scope, receive_repetido, send_capturando)
+        return status_code, headers, b"".join(partes)
+
+    # --- Acesso ao banco (executado no threadpool) ---
+
+    @staticmethod
+    def _reservar(chave: str, rota: str, hash_requisicao: str, lease: float):
+        db = SessionLocal()
+        try:
+            return crud.reservar_chave_idempotencia(
+                db,
+                chave=chave,
+                rota=rota,
+                hash_requisicao=hash_requisicao,
+                lease_segundos=lease,
+            )
+        finally:
+            db.close()
+
+    @staticmethod
+    def _concluir(
+        chave: str, rota: str, resposta: Optional[RespostaArmazenada]
+    ) -> None:
+        db = SessionLocal()
+        try:
+            if resposta is None or resposta[0] >= 500:
+                crud.liberar_chave_idempotencia(db, chave=chave, rota=rota)
+            else:
+                status_code, headers, corpo = resposta
+                crud.concluir_chave_idempotencia(
+                    db,
+                    chave=chave,
+                    rota=rota,
+                    status_code=status_code,
+                    headers=headers,
+                    corpo=corpo,
+                    ttl_segundos=settings.IDEMPOTENCY_TTL_SECONDS,
+                )
+        finally:
+            db.close()
+
+
+# ====================================================================================
+# ===== --- Purga Periódica ---                                                  =====
+# ====================================================================================
+
+
+def _purgar_uma_vez() -> int:
+    db = SessionLocal()
+    try:
+        return crud.purgar_chaves_idempotencia_expiradas(db)
+    finally:
+        db.close()
+
+
+async def purgar_chaves_expiradas_periodicamente() -> None:
+    """Tarefa de fundo que remove chaves expiradas a cada intervalo configurado."""
+    while True:
+        await asyncio.sleep(settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
+        await run_in_threadpool(_purgar_uma_vez)
@@ -0,0 +1,187 @@
+# app/jobs.py
+
+"""
+Tarefas em segundo plano executadas pela fila de jobs (tabela 'jobs').
+
+Cada tarefa é uma função `(contexto, parametros) -> resultado` registrada com
+`@tarefa("nome")`. A API apenas enfileira o job (POST /jobs); os processos
+`python -m app.worker` o executam, informando o progresso por
+`contexto.progresso(...)`. Uma tarefa pode ser executada mais de uma vez
+(nova tentativa após falha ou após a queda de um worker): as tarefas guardam
+em `contexto.estado` o ponto de retomada e continuam de onde pararam.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import csv
+import gzip
+import os
+from datetime import date
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from . import crud, models, schemas
+from .config import settings
+from .database import SessionLocal
+
+# ====================================================================================
+# ===== --- Registro de Tarefas ---                                              =====
+# ====================================================================================
+
+
+class ParametrosInvalidosError(Exception):
+    """Parâmetros inválidos: o job falha sem novas tentativas."""
+
+
+class ReservaPerdidaError(Exception):
+    """Levantada quando outro worker reassumiu o job (reserva vencida)."""
+
+
+class Contexto:
+    """Acesso da tarefa ao banco, ao ponto de retomada e ao progresso do job."""
+
+    def __init__(self, db: Session, job: models.Job, worker: str) -> None:
+        self.db = db
+        self.job_id = job.id
+        self.worker = worker
+        self.estado: Dict[str, Any] = dict(job.estado or {})
+
+    def progresso(
+        self, feitos: int, total: int, mensagem: Optional[str] = None
+    ) -> None:
+        """Grava o progresso e o `estado` atual; renova a reserva do job."""
+        percentual = 100 if total <= 0 else min(int(feitos * 100 / total), 99)
+        # Sessão própria: o commit não interrompe leituras em andamento da tarefa
+        db = SessionLocal()
+        try:
+            mantida = crud.atualizar_progresso_job(
+                db,
+                self.job_id,
+                self.worker,
+                percentual,
+                mensagem,
+                self.estado,
+                settings.JOBS_LEASE_SECONDS,
+            )
+        finally:
+            db.close()
+        if not mantida:
+            raise ReservaPerdidaError()
+
+
+Tarefa = Callable[[Contexto, Dict[str, Any]], Dict[str, Any]]
+
+TAREFAS: Dict[str, Tarefa] = {}
+
+
+def tarefa(nome: str) -> Callable[[Tarefa], Tarefa]:
+    """Registra a função como tarefa executável pela fila de jobs."""
+
+    def registrar(funcao: Tarefa) -> Tarefa:
+        TAREFAS[nome] = funcao
+        return funcao
+
+    return registrar
+
+
+# ====================================================================================
+# ===== --- Tarefas ---                                                          =====
+# ====================================================================================
+
+_itens_de_agendamento = TypeAdapter(list[schemas.AgendamentoEmLoteCreate])
+
+
+@tarefa("importar_agendamentos")
+def importar_agendamentos(contexto: Contexto, parametros: Dict[str, Any]) -> dict:
+    """
+    Cria os agendamentos de `parametros["itens"]` em lotes de BULK_MAX_ITENS,
+    um INSERT de múltiplas linhas (e uma transação) por lote.
+
+    Pacientes ou especialidades inexistentes fazem o job falhar antes de
+    qualquer inserção. Os IDs criados ficam no `estado`: uma nova tentativa
+    continua do primeiro lote não registrado (se o worker cair entre o commit
+    de um lote e o registro do progresso, esse lote é repetido).
+    """
+    itens = _itens_de_agendamento.validate_python(parametros.get("itens", []))
+    inexistentes = crud.get_pacientes_inexistentes(
+        contexto.db, paciente_ids=[item.paciente_id for item in itens]
+    )
+    if inexistentes:
+        raise ParametrosInvalidosError(f"Pacientes não encontrados: {inexistentes}.")
+    inexistentes = crud.get_especialidades_inexistentes(
+        contexto.db, nomes=[item.especialidade for item in itens]
+    )
+    if inexistentes:
+        raise ParametrosInvalidosError(
+            f"Especialidades não encontradas: {inexistentes}."
+        )
+    ids = contexto.estado.setdefault("ids", [])
+    for inicio in range(len(ids), len(itens), settings.BULK_MAX_ITENS):
+        lote = itens[inicio : inicio + settings.BULK_MAX_ITENS]
+        ids.extend(crud.create_agendamentos_em_lote(contexto.db, agendamentos=lote))
+        contexto.progresso(len(ids), len(itens))
+    return {"afetados": len(ids), "ids": ids}
+
+
+@tarefa("exportar_agendamentos")
+def exportar_agendamentos(contexto: Contexto, parametros: Dict[str, Any]) -> dict:
+    """
+    Exporta os agendamentos ativos (opcionalmente de `medico_id` entre
+    `data_inicio` e `data_fim`) para um CSV compactado em JOBS_OUTPUT_DIR.
+    """
+    filtro = schemas.FiltroExportacaoAgendamentos.model_validate(parametros)
+    consulta = select(models.Agendamento).where(models.Agendamento.deleted_at.is_(None))
+    if filtro.medico_id is not None:
+        consulta = consulta.where(models.Agendamento.medico_id == filtro.medico_id)
+    if filtro.data_inicio is not None:
+        consulta = consulta.where(
+            models.Agendamento.data_primeira_consulta >= filtro.data_inicio
+        )
+    if filtro.data_fim is not None:
+        consulta = consulta.where(
+            models.Agendamento.data_primeira_consulta <= filtro.data_fim
+        )
+    total = contexto.db.scalar(select(func.count()).select_from(consulta.subquery()))
+
+    os.makedirs(settings.JOBS_OUTPUT_DIR, exist_ok=True)
+    caminho = os.path.join(
+        settings.JOBS_OUTPUT_DIR, f"agendamentos_{contexto.job_id}.csv.gz"
+    )
+    colunas = [coluna.key for coluna in models.Agendamento.__table__.columns]
+    linhas = 0
+    # Reexecuções regravam o arquivo do início: a exportação é só leitura
+    with gzip.open(caminho, "wt", encoding="utf-8", newline="") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(colunas)
+        resultado = contexto.db.scalars(
+            consulta.order_by(models.Agendamento.id),
+            execution_options={"yield_per": 1000},
+        )
+        for agendamento in resultado:
+            escritor.writerow(_valor_csv(getattr(agendamento, c)) for c in colunas)
+            linhas += 1
+            if linhas % 10000 == 0:
+                contexto.progresso(linhas, total)
+    return {"arquivo": caminho, "linhas": linhas}
+
+
+def _valor_csv(valor: Any) -> Any:
+    return valor.isoformat() if isinstance(valor, date) else valor
+
+
+@tarefa("expurgo")
+def expurgo(contexto: Contexto, parametros: Dict[str, Any]) -> dict:
+    """Executa, sob demanda, os expurgos da manutenção periódica."""
+    from . import manutencao
+
+    removidos = manutencao.purgar_removidos()
+    contexto.progresso(1, 3)
+    outbox = manutencao.purgar_outbox()
+    contexto.progresso(2, 3)
+    lembretes = manutencao.purgar_lembretes()
+    return {"removidos": removidos, "outbox": outbox, "lembretes": lembretes}
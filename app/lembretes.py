@@ -0,0 +1,247 @@
+# app/lembretes.py
+
+"""
+Lembretes de consulta a partir de `Agendamento.data_proxima_consulta`.
+
+A cada REMINDER_RELOAD_INTERVAL_SECONDS o agendador carrega, pelo índice
+parcial em `data_proxima_consulta`, as consultas dos próximos
+REMINDER_WINDOW_DAYS dias ainda sem lembrete e as organiza em um heap pelo
+instante de envio (REMINDER_DAYS_BEFORE dias antes da consulta, às
+REMINDER_SEND_HOUR horas, no horário local do servidor). Entre as cargas, o
+agendador apenas dorme até o próximo instante do heap — não há varredura da
+tabela a cada tique.
+
+Os lembretes vencidos são processados em lotes de REMINDER_BATCH_SIZE: uma
+consulta relê os agendamentos do lote (descartando os remarcados ou
+removidos desde a carga), o notificador envia o lote e um INSERT de
+múltiplas linhas registra o envio em 'lembretes_enviados'. A entrega é "pelo
+menos uma vez": uma falha entre o envio e o registro repete o lote.
+
+Com vários workers, apenas o que obtém o advisory lock REMINDER_LOCK_KEY do
+PostgreSQL (mantido em uma conexão dedicada) agenda lembretes; se ele cair, a
+conexão fecha, o lock é liberado e outro worker assume na carga seguinte.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import asyncio
+import heapq
+import json
+import logging
+import time as relogio
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from starlette.concurrency import run_in_threadpool
+
+from . import crud
+from .config import settings
+from .database import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+# (instante de envio, ID do agendamento, data da consulta)
+ItemDoHeap = Tuple[datetime, int, date]
+
+# ====================================================================================
+# ===== --- Notificadores ---                                                    =====
+# ====================================================================================
+
+
+class Notificador:
+    """Envia um lote de lembretes (SMS, e-mail, WhatsApp...)."""
+
+    def enviar(self, lembretes: List[dict]) -> None:
+        raise NotImplementedError
+
+
+class NotificadorArquivo(Notificador):
+    """Grava um lembrete por linha (JSON) em um arquivo local."""
+
+    def __init__(self, caminho: str) -> None:
+        self.caminho = caminho
+
+    def enviar(self, lembretes: List[dict]) -> None:
+        with open(self.caminho, "a", encoding="utf-8") as arquivo:
+            for lembrete in lembretes:
+                arquivo.write(json.dumps(lembrete, default=str) + "\n")
+
+
+class NotificadorLog(Notificador):
+    """Registra os lembretes no log da aplicação."""
+
+    def enviar(self, lembretes: List[dict]) -> None:
+        for lembrete in lembretes:
+            logger.info("Lembrete de consulta: %s", json.dumps(lembrete, default=str))
+
+
+def configurar_notificador() -> Notificador:
+    """Cria o notificador definido em REMINDER_NOTIFIER."""
+    if settings.REMINDER_NOTIFIER == "log":
+        return NotificadorLog()
+    return NotificadorArquivo(settings.REMINDER_FILE)
+
+
+# ====================================================================================
+# ===== --- Liderança entre Workers ---                                          =====
+# ====================================================================================
+
+
+class Lideranca:
+    """Advisory lock de sessão do PostgreSQL mantido em uma conexão dedicada."""
+
+    def __init__(self, engine: Engine, chave: int) -> None:
+        self.engine = engine
+        self.chave = chave
+        self._conexao: Optional[Connection] = None
+
+    def verificar(self) -> bool:
+        """True se este worker é (ou acaba de se tornar) o líder."""
+        if self.engine.dialect.name != "postgresql":
+            # SQLite: um único processo escreve no banco
+            return True
+        if self._conexao is not None:
+            try:
+                self._conexao.exec_driver_sql("SELECT 1")
+                self._conexao.commit()
+                return True
+            except Exception:
+                logger.warning("Conexão do líder de lembretes perdida.")
+                self.liberar()
+        conexao = self.engine.connect()
+        # Fora do pool: o lock vive enquanto esta conexão estiver aberta
+        conexao.detach()
+        obtido = conexao.scalar(
+            text("SELECT pg_try_advisory_lock(:chave)"), {"chave": self.chave}
+        )
+        conexao.commit()
+        if not obtido:
+            conexao.close()
+            return False
+        logger.info("Este worker assumiu o envio de lembretes.")
+        self._conexao = conexao
+        return True
+
+    def liberar(self) -> None:
+        conexao, self._conexao = self._conexao, None
+        if conexao is not None:
+            try:
+                conexao.close()
+            except Exception:
+                logger.debug("Falha ao fechar a conexão do líder.", exc_info=True)
+
+
+# ====================================================================================
+# ===== --- Agendador ---                                                        =====
+# ====================================================================================
+
+
+def instante_do_lembrete(data_consulta: date) -> datetime:
+    """Instante de envio do lembrete de uma consulta (horário local)."""
+    return datetime.combine(
+        data_consulta - timedelta(days=settings.REMINDER_DAYS_BEFORE),
+        time(settings.REMINDER_SEND_HOUR),
+    )
+
+
+class AgendadorDeLembretes:
+    """Heap de lembretes da janela atual, recarregado periodicamente."""
+
+    def __init__(self, notificador: Notificador, lideranca: Lideranca) -> None:
+        self.notificador = notificador
+        self.lideranca = lideranca
+        self.heap: List[ItemDoHeap] = []
+        self.enviados = 0
+
+    def carregar(self, hoje: date) -> None:
+        """Substitui o heap pelas consultas da janela ainda sem lembrete."""
+        db = SessionLocal()
+        try:
+            consultas = crud.get_consultas_a_lembrar(
+                db, hoje, hoje + timedelta(days=settings.REMINDER_WINDOW_DAYS)
+            )
+        finally:
+            db.close()
+        heap = [
+            (instante_do_lembrete(data_consulta), agendamento_id, data_consulta)
+            for agendamento_id, data_consulta in consultas
+        ]
+        heapq.heapify(heap)
+        self.heap = heap
+
+    def processar_vencidos(self, agora: datetime) -> int:
+        """Envia um lote de lembretes vencidos; retorna o tamanho do lote."""
+        lote = []
+        while (
+            self.heap
+            and self.heap[0][0] <= agora
+            and len(lote) < settings.REMINDER_BATCH_SIZE
+        ):
+            _, agendamento_id, data_consulta = heapq.heappop(self.heap)
+            lote.append((agendamento_id, data_consulta))
+        if not lote:
+            return 0
+        db = SessionLocal()
+        try:
+            lembretes = crud.get_lembretes_validos(db, lote)
+            if lembretes:
+                self.notificador.enviar(lembretes)
+                enviados = [
+                    (item["agendamento_id"], item["data_consulta"])
+                    for item in lembretes
+                ]
+                crud.marcar_lembretes_enviados(db, enviados)
+        except Exception:
+            # Devolve o lote ao heap; ele é tentado de novo no próximo ciclo
+            for agendamento_id, data_consulta in lote:
+                heapq.heappush(self.heap, (agora, agendamento_id, data_consulta))
+            raise
+        finally:
+            db.close()
+        self.enviados += len(lembretes)
+        return len(lote)
+
+    def segundos_ate_o_proximo(self, agora: datetime) -> Optional[float]:
+        if not self.heap:
+            return None
+        return max((self.heap[0][0] - agora).total_seconds(), 0.0)
+
+
+async def executar_lembretes_periodicamente() -> None:
+    """Tarefa de fundo: recarrega a janela e envia os lembretes no horário."""
+    agendador = AgendadorDeLembretes(
+        configurar_notificador(), Lideranca(engine, settings.REMINDER_LOCK_KEY)
+    )
+    proxima_carga = 0.0
+    try:
+        while True:
+            if relogio.monotonic() >= proxima_carga:
+                proxima_carga = (
+                    relogio.monotonic() + settings.REMINDER_RELOAD_INTERVAL_SECONDS
+                )
+                try:
+                    if await run_in_threadpool(agendador.lideranca.verificar):
+                        await run_in_threadpool(agendador.carregar, date.today())
+                    else:
+                        agendador.heap = []
+                except Exception:
+                    logger.exception("Falha ao carregar os lembretes de consulta.")
+            try:
+                while await run_in_threadpool(
+                    agendador.processar_vencidos, datetime.now()
+                ):
+                    pass
+            except Exception:
+                logger.exception("Falha ao enviar lembretes de consulta.")
+                await asyncio.sleep(settings.REMINDER_RETRY_SECONDS)
+            espera = proxima_carga - relogio.monotonic()
+            proximo = agendador.segundos_ate_o_proximo(datetime.now())
+            if proximo is not None:
+                espera = min(espera, proximo)
+            await asyncio.sleep(max(espera, 0.0))
+    finally:
+        await run_in_threadpool(agendador.lideranca.liberar)
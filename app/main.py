@@ -4,12 +4,28 @@
 # ===== --- Importações ---                                                      =====
 # ====================================================================================
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
+from starlette.middleware.gzip import GZipMiddleware
 
-from .database import create_db_and_tables
-from .routers import agendamentos, auth, medicos, pacientes
+from .config import settings
+from .database import SessionLocal, engine
+from .idempotency import IdempotencyMiddleware
+from .routers import (
+    agendamentos,
+    auth,
+    especialidades,
+    health,
+    jobs,
+    lista_espera,
+    medicos,
+    mudancas,
+    pacientes,
+    series,
+    sincronizacao,
+)
 
 # ====================================================================================
 # ===== --- Rotas ---                                                          =====
@@ -17,10 +33,40 @@ from .routers import agendamentos, auth, medicos, pacientes
 
 
 # --- Lifepan ---
+# O que só é usado na inicialização e no encerramento é importado aqui, e não
+# no topo do módulo: `import app.main` fica restrito ao necessário para montar
+# as rotas e as middlewares (ver benchmarks/import_time.py)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    create_db_and_tables()
+    from . import pubsub
+    from .auditoria import encerrar_gravador, iniciar_gravador
+    from .idempotency import purgar_chaves_expiradas_periodicamente
+    from .manutencao import executar_manutencao_periodicamente
+    from .migrations import verificar_revisao
+
+    verificar_revisao(engine, settings.MIGRATIONS_CHECK)
+    iniciar_gravador()
+    pubsub.iniciar(asyncio.get_running_loop(), engine)
+    tarefas = [
+        asyncio.create_task(purgar_chaves_expiradas_periodicamente()),
+        asyncio.create_task(executar_manutencao_periodicamente()),
+    ]
+    if settings.REMINDERS_ENABLED:
+        from .lembretes import executar_lembretes_periodicamente
+
+        tarefas.append(asyncio.create_task(executar_lembretes_periodicamente()))
     yield
+    for tarefa in tarefas:
+        tarefa.cancel()
+    for tarefa in tarefas:
+        with suppress(asyncio.CancelledError):
+            await tarefa
+    pubsub.encerrar()
+    encerrar_gravador()
+    if settings.TRACING_ENABLED:
+        from .tracing import encerrar_exportador
+
+        encerrar_exportador()
 
 
 # --- App ---
@@ -31,11 +77,49 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# --- Middlewares ---
+# Recursos opcionais são importados apenas quando habilitados
+app.add_middleware(IdempotencyMiddleware)
+if settings.ADMISSION_ENABLED:
+    from .admission import AdmissionControlMiddleware
+
+    app.add_middleware(AdmissionControlMiddleware)
+# O prazo envolve a admissão: o tempo em fila conta para o prazo da requisição
+if settings.REQUEST_TIMEOUT_ENABLED:
+    from .deadlines import DeadlineMiddleware, instrumentar_sessoes
+
+    instrumentar_sessoes(SessionLocal, engine)
+    app.add_middleware(DeadlineMiddleware)
+if settings.PROFILING_ENABLED:
+    from .profiling import ProfilingMiddleware
+
+    app.add_middleware(ProfilingMiddleware)
+if settings.TRACING_ENABLED:
+    from .tracing import TracingMiddleware, instrumentar_engine, instrumentar_fastapi
+
+    instrumentar_engine(engine)
+    instrumentar_fastapi()
+    app.add_middleware(TracingMiddleware)
+# Compactação por último (mais externa): as demais middlewares, inclusive a de
+# idempotência, veem e armazenam o corpo sem compactação
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
 # --- Includes ---
+app.include_router(health.router)
 app.include_router(pacientes.router)
 app.include_router(agendamentos.router)
 app.include_router(medicos.router)
 app.include_router(auth.router)
+app.include_router(mudancas.router)
+app.include_router(sincronizacao.router)
+app.include_router(jobs.router)
+app.include_router(series.router)
+app.include_router(lista_espera.router)
+app.include_router(especialidades.router)
+if settings.PROFILING_ENABLED:
+    from .routers import admin
+
+    app.include_router(admin.router)
 
 
 # --- App Get ---
@@ -0,0 +1,153 @@
+# app/manutencao.py
+
+"""
+Manutenção periódica do banco: expurgo de registros removidos, do outbox,
+dos registros de lembretes enviados e dos jobs finalizados.
+
+A remoção pela API apenas marca `deleted_at`; esta tarefa de fundo apaga
+fisicamente, depois de SOFT_DELETE_RETENTION_DAYS, agendamentos, pacientes
+(com seus endereços) e médicos — nessa ordem, para respeitar as chaves
+estrangeiras. Eventos do outbox (feed /changes) são apagados depois de
+OUTBOX_RETENTION_DAYS, os lembretes enviados depois da data da consulta e os
+jobs finalizados depois de JOBS_RETENTION_DAYS.
+Cada lote tem no máximo SOFT_DELETE_PURGE_BATCH linhas e é confirmado em sua
+própria transação, mantendo curtos os bloqueios e o volume de WAL de cada
+commit.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict
+
+from starlette.concurrency import run_in_threadpool
+
+from . import crud
+from .config import settings
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Ordem de expurgo: dependentes antes das tabelas referenciadas
+_EXPURGOS = (
+    ("agendamentos", crud.purgar_agendamentos_removidos),
+    ("series_agendamento", crud.purgar_series_removidas),
+    ("pacientes", crud.purgar_pacientes_removidos),
+    ("medicos", crud.purgar_medicos_removidos),
+)
+
+
+# ====================================================================================
+# ===== --- Expurgo ---                                                          =====
+# ====================================================================================
+
+
+def _purgar_em_lotes(db, purgar: Callable[..., int], antes_de: datetime | date) -> int:
+    limite = settings.SOFT_DELETE_PURGE_BATCH
+    total = 0
+    while True:
+        lote = purgar(db, antes_de=antes_de, limite=limite)
+        total += lote
+        if lote < limite:
+            return total
+
+
+def purgar_removidos(agora: datetime | None = None) -> Dict[str, int]:
+    """
+    Apaga, em lotes, os registros removidos há mais tempo que a retenção.
+
+    Returns:
+        Quantidade de linhas apagadas por tabela.
+    """
+    antes_de = (agora or datetime.now(timezone.utc)) - timedelta(
+        days=settings.SOFT_DELETE_RETENTION_DAYS
+    )
+    db = SessionLocal()
+    try:
+        apagados = {
+            tabela: _purgar_em_lotes(db, purgar, antes_de)
+            for tabela, purgar in _EXPURGOS
+        }
+    finally:
+        db.close()
+    if any(apagados.values()):
+        logger.info("Expurgo de registros removidos: %s", apagados)
+    return apagados
+
+
+def purgar_outbox(agora: datetime | None = None) -> int:
+    """Apaga, em lotes, os eventos do outbox mais antigos que a retenção."""
+    antes_de = (agora or datetime.now(timezone.utc)) - timedelta(
+        days=settings.OUTBOX_RETENTION_DAYS
+    )
+    db = SessionLocal()
+    try:
+        return _purgar_em_lotes(db, crud.purgar_eventos_outbox, antes_de)
+    finally:
+        db.close()
+
+
+def purgar_lembretes(agora: datetime | None = None) -> int:
+    """Apaga, em lotes, os registros de lembretes de consultas já passadas."""
+    antes_de = (agora or datetime.now(timezone.utc)).date()
+    db = SessionLocal()
+    try:
+        return _purgar_em_lotes(db, crud.purgar_lembretes_enviados, antes_de)
+    finally:
+        db.close()
+
+
+def purgar_jobs(agora: datetime | None = None) -> int:
+    """Apaga, em lotes, os jobs finalizados há mais tempo que a retenção."""
+    antes_de = (agora or datetime.now(timezone.utc)) - timedelta(
+        days=settings.JOBS_RETENTION_DAYS
+    )
+    db = SessionLocal()
+    try:
+        return _purgar_em_lotes(db, crud.purgar_jobs_finalizados, antes_de)
+    finally:
+        db.close()
+
+
+def purgar_carga_medicos(agora: datetime | None = None) -> int:
+    """Apaga, em lotes, os contadores de carga de dias já passados."""
+    antes_de = (agora or datetime.now(timezone.utc)).date()
+    db = SessionLocal()
+    try:
+        return _purgar_em_lotes(db, crud.purgar_carga_medicos, antes_de)
+    finally:
+        db.close()
+
+
+def purgar_lista_espera(agora: datetime | None = None) -> int:
+    """Apaga, em lotes, as esperas finalizadas há mais tempo que a retenção."""
+    antes_de = (agora or datetime.now(timezone.utc)) - timedelta(
+        days=settings.WAITLIST_RETENTION_DAYS
+    )
+    db = SessionLocal()
+    try:
+        return _purgar_em_lotes(db, crud.purgar_lista_espera_finalizada, antes_de)
+    finally:
+        db.close()
+
+
+async def executar_manutencao_periodicamente() -> None:
+    """Tarefa de fundo que executa os expurgos a cada intervalo configurado."""
+    while True:
+        await asyncio.sleep(settings.SOFT_DELETE_PURGE_INTERVAL_SECONDS)
+        for expurgo in (
+            purgar_removidos,
+            purgar_outbox,
+            purgar_lembretes,
+            purgar_jobs,
+            purgar_lista_espera,
+            purgar_carga_medicos,
+        ):
+            try:
+                await run_in_threadpool(expurgo)
+            except Exception:
+                logger.exception("Falha na manutenção (%s).", expurgo.__name__)
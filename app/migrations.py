@@ -0,0 +1,103 @@
+# app/migrations.py
+
+"""
+Verificação rápida de que o banco está na revisão head do alembic.
+
+O schema é de responsabilidade do alembic (`alembic upgrade head`); na
+inicialização, cada worker apenas confere a revisão aplicada. A head é obtida
+lendo os identificadores dos arquivos de `alembic/versions` com uma expressão
+regular, sem importar o alembic nem executar os scripts de migração.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import logging
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import FrozenSet, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# ====================================================================================
+# ===== --- Constantes ---                                                       =====
+# ====================================================================================
+
+DIRETORIO_VERSOES = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+
+_REVISION = re.compile(r"^revision\b[^=]*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision\b[^=]*=\s*(.+)$", re.MULTILINE)
+_IDENTIFICADOR = re.compile(r"['\"]([^'\"]+)['\"]")
+
+
+class MigracoesPendentesError(RuntimeError):
+    """Levantada quando o banco não está na revisão head do alembic."""
+
+
+# ====================================================================================
+# ===== --- Revisões ---                                                         =====
+# ====================================================================================
+
+
+@lru_cache(maxsize=1)
+def revisoes_head() -> FrozenSet[str]:
+    """Revisões head do alembic, lidas dos arquivos de `alembic/versions`."""
+    revisoes: Set[str] = set()
+    anteriores: Set[str] = set()
+    for arquivo in DIRETORIO_VERSOES.glob("*.py"):
+        conteudo = arquivo.read_text(encoding="utf-8")
+        revisao = _REVISION.search(conteudo)
+        if revisao is None:
+            continue
+        revisoes.add(revisao.group(1))
+        down_revision = _DOWN_REVISION.search(conteudo)
+        if down_revision is not None:
+            anteriores.update(_IDENTIFICADOR.findall(down_revision.group(1)))
+    return frozenset(revisoes - anteriores)
+
+
+def revisoes_da_conexao(conexao: Connection) -> FrozenSet[str]:
+    """Revisões registradas na tabela `alembic_version` (vazio se não existir)."""
+    try:
+        linhas = conexao.execute(text("SELECT version_num FROM alembic_version"))
+    except Exception:
+        return frozenset()
+    return frozenset(linha[0] for linha in linhas)
+
+
+def revisoes_aplicadas(engine: Engine) -> FrozenSet[str]:
+    """Revisões aplicadas ao banco da engine informada."""
+    with engine.connect() as conexao:
+        return revisoes_da_conexao(conexao)
+
+
+def verificar_revisao(engine: Engine, modo: str) -> None:
+    """
+    Confere se o banco está na revisão head do alembic.
+
+    Args:
+        engine: Engine do banco a verificar.
+        modo: "error" levanta MigracoesPendentesError em caso de divergência,
+            "warn" apenas registra um aviso e "off" não faz nada.
+
+    Raises:
+        MigracoesPendentesError: Se o modo for "error" e as revisões divergirem.
+    """
+    if modo == "off":
+        return
+    esperadas = revisoes_head()
+    aplicadas = revisoes_aplicadas(engine)
+    if aplicadas == esperadas:
+        return
+    mensagem = (
+        f"Banco na revisão {sorted(aplicadas) or 'nenhuma'}, mas a head do alembic "
+        f"é {sorted(esperadas)}. Execute `alembic upgrade head`."
+    )
+    if modo == "error":
+        raise MigracoesPendentesError(mensagem)
+    logger.warning(mensagem)
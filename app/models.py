@@ -3,18 +3,47 @@
 # ====================================================================================
 # ===== --- Importações ---                                                      =====
 # ====================================================================================
+from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import Boolean
+from sqlalchemy import JSON, BigInteger, Boolean, DateTime
 from sqlalchemy import Enum as SAEnum
-from sqlalchemy import ForeignKey, Integer, Numeric, String
+from sqlalchemy import ForeignKey, Index, Integer, LargeBinary, Numeric, String, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import Date as SQLDateType
 
 from .database import Base
 from .enums import UserRole
 
+# ====================================================================================
+# ===== --- Remoção Lógica ---                                                   =====
+# ====================================================================================
+
+# Pacientes, médicos e agendamentos são removidos logicamente (deleted_at) e
+# apagados fisicamente mais tarde, em lotes (app.manutencao). As restrições de
+# unicidade e os índices das consultas padrão valem apenas para linhas ativas.
+APENAS_ATIVOS = text("deleted_at IS NULL")
+
+
+def _indice_ativos(nome: str, *colunas: str, unique: bool = False) -> Index:
+    """Índice parcial sobre as linhas não removidas (PostgreSQL e SQLite)."""
+    return Index(
+        nome,
+        *colunas,
+        unique=unique,
+        postgresql_where=APENAS_ATIVOS,
+        sqlite_where=APENAS_ATIVOS,
+    )
+
+
+# Fila da lista de espera: só as entradas aguardando vaga entram no índice, e
+# a busca do encaixe usa exatamente esta condição (com o valor literal, para
+# que o planejador possa usar o índice parcial)
+APENAS_AGUARDANDO = text("status = 'aguardando'")
+
+
 # ====================================================================================
 # ===== --- Modelos ---                                                          =====
 # ====================================================================================
@@ -45,20 +74,39 @@ class Paciente(Base):
     """
 
     __tablename__ = "pacientes"
+    __table_args__ = (
+        _indice_ativos("ix_pacientes_cpf_ativo", "cpf", unique=True),
+        _indice_ativos("ix_pacientes_cns_ativo", "cns", unique=True),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     nome_completo: Mapped[str] = mapped_column(String, index=True)
     data_nascimento: Mapped[SQLDateType] = mapped_column(SQLDateType)
     nome_da_mae: Mapped[str] = mapped_column(String)
-    cpf: Mapped[str] = mapped_column(String, unique=True, index=True)
-    cns: Mapped[str | None] = mapped_column(
-        String, unique=True, nullable=True, index=True
-    )
+    cpf: Mapped[str] = mapped_column(String)
+    cns: Mapped[str | None] = mapped_column(String, nullable=True)
     telefone: Mapped[str] = mapped_column(String)
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     endereco: Mapped[Endereco | None] = relationship(
         back_populates="paciente", uselist=False, cascade="all, delete-orphan"
     )
 
 
+class Especialidade(Base):
+    """
+    Modelo da tabela 'especialidades' (catálogo).
+    `chave` é o nome sem acentos, em minúsculas e com espaços simples
+    (`app.especialidades.chave`): variações de grafia resolvem para a mesma
+    especialidade.
+    """
+
+    __tablename__ = "especialidades"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    nome: Mapped[str] = mapped_column(String)
+    chave: Mapped[str] = mapped_column(String, unique=True, index=True)
+
+
 class Medico(Base):
     """
     Modelo da tabela 'medicos'.
@@ -66,10 +114,18 @@ class Medico(Base):
     """
 
     __tablename__ = "medicos"
+    __table_args__ = (
+        _indice_ativos("ix_medicos_nome_ativo", "nome", unique=True),
+        _indice_ativos("ix_medicos_especialidade_id_ativo", "especialidade_id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    nome: Mapped[str] = mapped_column(String, unique=True, index=True)
+    nome: Mapped[str] = mapped_column(String)
     especialidade: Mapped[str] = mapped_column(String)
+    especialidade_id: Mapped[int] = mapped_column(ForeignKey("especialidades.id"))
     telefone: Mapped[str] = mapped_column(String)
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     user_account: Mapped[Optional["User"]] = relationship(
         back_populates="medico_profile"
     )
@@ -79,11 +135,27 @@ class Agendamento(Base):
     """
     Modelo da tabela 'agendamentos'.
     Registra os agendamentos de consultas dos pacientes com os médicos.
+
+    No PostgreSQL a tabela é particionada por mês de 'data_primeira_consulta'
+    (migração 7c4e2b9a1f63; manutenção em `app.tools.particoes`) e a chave
+    primária física é (id, data_primeira_consulta). O id continua único e é a
+    identidade usada pelo ORM.
     """
 
     __tablename__ = "agendamentos"
+    __table_args__ = (
+        _indice_ativos("ix_agendamentos_paciente_id_ativo", "paciente_id"),
+        _indice_ativos(
+            "ix_agendamentos_medico_id_data_ativo",
+            "medico_id",
+            "data_primeira_consulta",
+        ),
+        _indice_ativos("ix_agendamentos_data_proxima_ativo", "data_proxima_consulta"),
+        _indice_ativos("ix_agendamentos_especialidade_id_ativo", "especialidade_id"),
+    )
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     especialidade: Mapped[str] = mapped_column(String)
+    especialidade_id: Mapped[int] = mapped_column(ForeignKey("especialidades.id"))
     data_primeira_consulta: Mapped[SQLDateType] = mapped_column(SQLDateType)
     data_proxima_consulta: Mapped[SQLDateType | None] = mapped_column(
         SQLDateType, nullable=True
@@ -95,6 +167,9 @@ class Agendamento(Base):
     paciente: Mapped[Paciente] = relationship()
     medico_id: Mapped[int] = mapped_column(ForeignKey("medicos.id"))
     medico: Mapped[Medico] = relationship()
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
 
 class User(Base):
@@ -116,3 +191,266 @@ class User(Base):
     medico_profile: Mapped[Optional[Medico]] = relationship(
         back_populates="user_account"
     )
+
+
+class ChaveIdempotencia(Base):
+    """
+    Modelo da tabela 'idempotency_keys'.
+    Guarda a resposta de uma requisição POST associada a um `Idempotency-Key`,
+    para que repetições da mesma requisição recebam a resposta original.
+    Linhas com `status_code` nulo representam requisições ainda em andamento:
+    sua `expira_em` é um prazo curto (o da requisição), estendido ao TTL
+    quando a resposta é armazenada. `headers` guarda os headers da resposta
+    como pares [nome, valor].
+    """
+
+    __tablename__ = "idempotency_keys"
+    chave: Mapped[str] = mapped_column(String(255), primary_key=True)
+    rota: Mapped[str] = mapped_column(String(255), primary_key=True)
+    hash_requisicao: Mapped[str] = mapped_column(String(64))
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    headers: Mapped[list | None] = mapped_column(
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"),
+        nullable=True,
+    )
+    corpo: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    expira_em: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+
+
+class RegistroAuditoria(Base):
+    """
+    Modelo da tabela 'auditoria' (somente inserção).
+    Cada linha registra quem (ator) leu, criou, alterou ou removeu um paciente
+    ou agendamento, e quando. `diff` guarda os valores gravados (criação e
+    alteração). Os registros são gravados em lote por app.auditoria.
+
+    No PostgreSQL a tabela é particionada por mês de `ocorrido_em` (chave
+    primária (id, ocorrido_em)); as partições são mantidas por
+    `python -m app.tools.particoes --tabela auditoria`.
+    """
+
+    __tablename__ = "auditoria"
+    __table_args__ = (
+        Index(
+            "ix_auditoria_entidade_id_tempo", "entidade", "entidade_id", "ocorrido_em"
+        ),
+    )
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True
+    )
+    ocorrido_em: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    ator_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    ator_email: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    acao: Mapped[str] = mapped_column(String(16))
+    entidade: Mapped[str] = mapped_column(String(32))
+    entidade_id: Mapped[int] = mapped_column(Integer)
+    diff: Mapped[dict | None] = mapped_column(
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"),
+        nullable=True,
+    )
+
+
+class EventoOutbox(Base):
+    """
+    Modelo da tabela 'outbox' (transactional outbox).
+    Cada criação, alteração ou remoção de paciente ou agendamento grava aqui,
+    na mesma transação, um evento com o estado resultante do registro. O feed
+    `GET /changes` lê os eventos em ordem de (transacao, seq).
+
+    `transacao` é o id da transação que gravou o evento no PostgreSQL
+    (pg_current_xact_id); no SQLite, que tem um único escritor, é sempre 0.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (Index("ix_outbox_transacao_seq", "transacao", "seq"),)
+    seq: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True
+    )
+    transacao: Mapped[int] = mapped_column(BigInteger, default=0)
+    ocorrido_em: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    entidade: Mapped[str] = mapped_column(String(32))
+    entidade_id: Mapped[int] = mapped_column(Integer)
+    operacao: Mapped[str] = mapped_column(String(16))
+    dados: Mapped[dict] = mapped_column(JSON().with_variant(JSONB(), "postgresql"))
+
+
+class LembreteEnviado(Base):
+    """
+    Modelo da tabela 'lembretes_enviados'.
+    Registra os lembretes de consulta já enviados, por agendamento e data da
+    próxima consulta: um agendamento remarcado recebe um novo lembrete.
+
+    Sem chave estrangeira: no PostgreSQL a chave primária de 'agendamentos' é
+    (id, data_primeira_consulta), por causa do particionamento.
+    """
+
+    __tablename__ = "lembretes_enviados"
+    __table_args__ = (
+        Index(
+            "ix_lembretes_enviados_agendamento_data",
+            "agendamento_id",
+            "data_consulta",
+            unique=True,
+        ),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    agendamento_id: Mapped[int] = mapped_column(Integer)
+    data_consulta: Mapped[SQLDateType] = mapped_column(SQLDateType, index=True)
+    enviado_em: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class Job(Base):
+    """
+    Modelo da tabela 'jobs' (fila de tarefas em segundo plano).
+    Importações, exportações e expurgos são enfileirados aqui e executados
+    pelos processos `python -m app.worker`, que reservam os jobs com
+    `FOR UPDATE SKIP LOCKED`.
+
+    `travado_ate` é o prazo da reserva do worker, renovado a cada progresso:
+    um job em execução com a reserva vencida (worker interrompido) volta a
+    ser reservável. `estado` guarda o ponto de retomada entre tentativas.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status_executar_apos", "status", "executar_apos"),)
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True
+    )
+    tipo: Mapped[str] = mapped_column(String(64))
+    parametros: Mapped[dict] = mapped_column(JSON().with_variant(JSONB(), "postgresql"))
+    status: Mapped[str] = mapped_column(String(16))
+    tentativas: Mapped[int] = mapped_column(Integer, default=0)
+    max_tentativas: Mapped[int] = mapped_column(Integer)
+    executar_apos: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    travado_ate: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    worker: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    progresso: Mapped[int] = mapped_column(Integer, default=0)
+    mensagem: Mapped[str | None] = mapped_column(String, nullable=True)
+    estado: Mapped[dict | None] = mapped_column(
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"),
+        nullable=True,
+    )
+    resultado: Mapped[dict | None] = mapped_column(
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"),
+        nullable=True,
+    )
+    erro: Mapped[str | None] = mapped_column(String, nullable=True)
+    criado_em: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    iniciado_em: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    concluido_em: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class SerieAgendamento(Base):
+    """
+    Modelo da tabela 'series_agendamento'.
+    Agendamentos recorrentes (semanais ou mensais) de pacientes crônicos: a
+    série guarda apenas a regra de recorrência, e as ocorrências são
+    calculadas sob demanda (`app.recorrencia`) nas consultas de calendário.
+    Somente as exceções — ocorrências canceladas ou remarcadas — são gravadas,
+    em 'excecoes_serie'.
+    """
+
+    __tablename__ = "series_agendamento"
+    __table_args__ = (
+        _indice_ativos("ix_series_agendamento_paciente_id_ativo", "paciente_id"),
+        _indice_ativos("ix_series_agendamento_medico_id_ativo", "medico_id"),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    paciente_id: Mapped[int] = mapped_column(ForeignKey("pacientes.id"))
+    medico_id: Mapped[int] = mapped_column(ForeignKey("medicos.id"))
+    especialidade: Mapped[str] = mapped_column(String)
+    especialidade_id: Mapped[int] = mapped_column(ForeignKey("especialidades.id"))
+    valor_consulta: Mapped[Decimal] = mapped_column(Numeric(precision=10, scale=2))
+    descricao: Mapped[str | None] = mapped_column(String, nullable=True)
+    frequencia: Mapped[str] = mapped_column(String(16))
+    intervalo: Mapped[int] = mapped_column(Integer, default=1)
+    data_inicio: Mapped[SQLDateType] = mapped_column(SQLDateType)
+    data_fim: Mapped[SQLDateType | None] = mapped_column(SQLDateType, nullable=True)
+    ocorrencias: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    criado_em: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class ExcecaoSerie(Base):
+    """
+    Modelo da tabela 'excecoes_serie'.
+    Uma ocorrência de série que não segue a regra: cancelada
+    (`agendamento_id` nulo) ou remarcada, quando passa a existir como um
+    agendamento comum (`agendamento_id`).
+    """
+
+    __tablename__ = "excecoes_serie"
+    __table_args__ = (
+        Index(
+            "ix_excecoes_serie_serie_id_data", "serie_id", "data_original", unique=True
+        ),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    serie_id: Mapped[int] = mapped_column(ForeignKey("series_agendamento.id"))
+    data_original: Mapped[SQLDateType] = mapped_column(SQLDateType)
+    agendamento_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    criado_em: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class EntradaListaEspera(Base):
+    """
+    Modelo da tabela 'lista_espera'.
+    Pacientes aguardando uma vaga em uma especialidade, com prioridade (1 é a
+    mais urgente), período de datas aceitas e, opcionalmente, um médico
+    preferido. Quando um agendamento é removido, a vaga é oferecida à
+    primeira entrada compatível da fila (índice parcial `ix_lista_espera_fila`,
+    na ordem de prioridade e de chegada).
+
+    `agendamento_id` é o agendamento criado no encaixe (status `oferecido`),
+    a confirmar ou recusar pela recepção.
+    """
+
+    __tablename__ = "lista_espera"
+    __table_args__ = (
+        Index(
+            "ix_lista_espera_fila",
+            "especialidade_id",
+            "prioridade",
+            "criado_em",
+            "id",
+            postgresql_where=APENAS_AGUARDANDO,
+            sqlite_where=APENAS_AGUARDANDO,
+        ),
+    )
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    paciente_id: Mapped[int] = mapped_column(ForeignKey("pacientes.id"), index=True)
+    especialidade: Mapped[str] = mapped_column(String)
+    especialidade_id: Mapped[int] = mapped_column(ForeignKey("especialidades.id"))
+    medico_id: Mapped[int | None] = mapped_column(
+        ForeignKey("medicos.id"), nullable=True
+    )
+    prioridade: Mapped[int] = mapped_column(Integer)
+    data_inicio: Mapped[SQLDateType | None] = mapped_column(SQLDateType, nullable=True)
+    data_fim: Mapped[SQLDateType | None] = mapped_column(SQLDateType, nullable=True)
+    status: Mapped[str] = mapped_column(String(16))
+    agendamento_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    criado_em: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    atualizado_em: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class CargaMedico(Base):
+    """
+    Modelo da tabela 'carga_medicos'.
+    Contador de agendamentos ativos por médico e dia, mantido (com upsert) na
+    mesma transação de cada criação, alteração e remoção de agendamento. A
+    distribuição automática de médicos (`app.distribuicao`) lê a carga da
+    janela nestes contadores, sem contar agendamentos.
+    """
+
+    __tablename__ = "carga_medicos"
+    medico_id: Mapped[int] = mapped_column(ForeignKey("medicos.id"), primary_key=True)
+    data: Mapped[SQLDateType] = mapped_column(SQLDateType, primary_key=True)
+    total: Mapped[int] = mapped_column(Integer, default=0)
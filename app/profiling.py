@@ -0,0 +1,274 @@
+# app/profiling.py
+
+"""
+Profiler por amostragem de pilhas, sem dependências externas.
+
+Uma thread auxiliar lê periodicamente `sys._current_frames()` e agrega as
+pilhas das demais threads do processo. Nada é instrumentado: enquanto nenhuma
+amostragem está ativa, o custo é zero; com o middleware habilitado, o custo
+por requisição comum é apenas a procura do header `X-Profile`.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import settings
+
+# ====================================================================================
+# ===== --- Tipos e Constantes ---                                               =====
+# ====================================================================================
+
+# (nome da função, arquivo, linha de definição)
+Quadro = Tuple[str, str, int]
+Pilha = Tuple[Quadro, ...]
+
+HEADER_PROFILE = b"x-profile"
+
+# Pontos em que uma thread está apenas esperando trabalho; pilhas que terminam
+# aqui são descartadas para não diluir o perfil.
+_FUNCOES_OCIOSAS = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+
+# ====================================================================================
+# ===== --- Amostrador ---                                                       =====
+# ====================================================================================
+
+
+def _pilha(frame) -> Pilha:
+    """Converte um frame na pilha correspondente, da raiz para a folha."""
+    quadros: List[Quadro] = []
+    while frame is not None:
+        codigo = frame.f_code
+        nome = getattr(codigo, "co_qualname", codigo.co_name)
+        quadros.append((nome, codigo.co_filename, codigo.co_firstlineno))
+        frame = frame.f_back
+    quadros.reverse()
+    return tuple(quadros)
+
+
+def _ociosa(pilha: Pilha) -> bool:
+    nome, arquivo, _ = pilha[-1]
+    return (os.path.basename(arquivo), nome.rsplit(".", 1)[-1]) in _FUNCOES_OCIOSAS
+
+
+class AmostradorDePilhas:
+    """
+    Amostra as pilhas de todas as threads do processo em intervalos fixos.
+
+    Uso:
+        amostrador = AmostradorDePilhas(intervalo=0.005)
+        amostrador.iniciar()
+        ...
+        amostrador.parar()
+        texto = amostrador.pilhas_colapsadas()
+    """
+
+    def __init__(self, intervalo: float) -> None:
+        self.intervalo = intervalo
+        self.amostras: Counter = Counter()
+        self.inicio = 0.0
+        self.duracao = 0.0
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def iniciar(self) -> None:
+        self.inicio = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._executar, name="amostrador-de-pilhas", daemon=True
+        )
+        self._thread.start()
+
+    def parar(self) -> None:
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duracao = time.perf_counter() - self.inicio
+
+    def _executar(self) -> None:
+        propria = threading.get_ident()
+        while not self._parar.wait(self.intervalo):
+            for ident, frame in sys._current_frames().items():
+                if ident == propria:
+                    continue
+                pilha = _pilha(frame)
+                if pilha and not _ociosa(pilha):
+                    self.amostras[pilha] += 1
+
+    # --- Exportação ---
+
+    def pilhas_colapsadas(self) -> str:
+        """Formato "collapsed stacks" (flamegraph.pl, speedscope, inferno)."""
+        linhas = []
+        for pilha, contagem in self.amostras.most_common():
+            nomes = ";".join(
+                f"{nome} ({os.path.basename(arquivo)}:{linha})"
+                for nome, arquivo, linha in pilha
+            )
+            linhas.append(f"{nomes} {contagem}")
+        return "\n".join(linhas) + "\n"
+
+    def speedscope(self, nome: str) -> Dict:
+        """Perfil no formato JSON do speedscope (tipo "sampled")."""
+        indices: Dict[Quadro, int] = {}
+        quadros: List[Dict] = []
+        amostras: List[List[int]] = []
+        pesos: List[float] = []
+        intervalo_ms = self.intervalo * 1000
+        for pilha, contagem in self.amostras.items():
+            caminho = []
+            for quadro in pilha:
+                if quadro not in indices:
+                    indices[quadro] = len(quadros)
+                    quadros.append(
+                        {"name": quadro[0], "file": quadro[1], "line": quadro[2]}
+                    )
+                caminho.append(indices[quadro])
+            amostras.append(caminho)
+            pesos.append(contagem * intervalo_ms)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": nome,
+            "exporter": settings.APP_NAME,
+            "shared": {"frames": quadros},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": nome,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": sum(pesos),
+                    "samples": amostras,
+                    "weights": pesos,
+                }
+            ],
+        }
+
+
+# Apenas uma amostragem por processo: duas simultâneas veriam as pilhas uma
+# da outra e dobrariam o custo.
+trava_amostragem = threading.Lock()
+
+
+# ====================================================================================
+# ===== --- Tokens de Profiling ---                                              =====
+# ====================================================================================
+
+
+def _assinar(expira_em: int) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode(), f"profile:{expira_em}".encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def criar_token_profiling(ttl_segundos: int) -> Tuple[str, int]:
+    """Cria o valor assinado do header `X-Profile` e o instante em que expira."""
+    expira_em = int(time.time()) + ttl_segundos
+    return f"{expira_em}.{_assinar(expira_em)}", expira_em
+
+
+def token_profiling_valido(token: str) -> bool:
+    """Verifica a assinatura e a validade de um token de profiling."""
+    expira_em, _, assinatura = token.partition(".")
+    if not expira_em.isdigit() or int(expira_em) < time.time():
+        return False
+    return hmac.compare_digest(assinatura, _assinar(int(expira_em)))
+
+
+# ====================================================================================
+# ===== --- Middleware de Profiling por Requisição ---                           =====
+# ====================================================================================
+
+
+class ProfilingMiddleware:
+    """
+    Perfila uma única requisição quando ela traz um header `X-Profile` válido.
+
+    A rota é executada normalmente, mas a resposta é substituída pelo perfil
+    no formato speedscope; o status original vai no header `X-Profiled-Status`.
+    Como o amostrador vê todas as threads do worker, requisições concorrentes
+    podem aparecer no perfil — use-o preferencialmente em um worker dedicado.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = None
+        for chave, valor in scope.get("headers", []):
+            if chave == HEADER_PROFILE:
+                token = valor.decode("latin-1")
+                break
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not token_profiling_valido(token):
+            await self._responder(send, 403, {"detail": "Token de profiling inválido."})
+            return
+        if not trava_amostragem.acquire(blocking=False):
+            await self._responder(
+                send, 409, {"detail": "Já existe uma amostragem em andamento."}
+            )
+            return
+
+        status_code = 500
+
+        async def send_descartando(mensagem) -> None:
+            nonlocal status_code
+            if mensagem["type"] == "http.response.start":
+                status_code = mensagem["status"]
+
+        amostrador = AmostradorDePilhas(settings.PROFILING_REQUEST_INTERVAL_SECONDS)
+        amostrador.iniciar()
+        try:
+            await self.app(scope, receive, send_descartando)
+        finally:
+            amostrador.parar()
+            trava_amostragem.release()
+
+        perfil = amostrador.speedscope(f"{scope['method']} {scope['path']}")
+        await self._responder(
+            send, 200, perfil, [(b"x-profiled-status", str(status_code).encode())]
+        )
+
+    @staticmethod
+    async def _responder(
+        send: Send,
+        status_code: int,
+        conteudo: Dict,
+        headers: Optional[List[Tuple[bytes, bytes]]] = None,
+    ) -> None:
+        corpo = json.dumps(conteudo, ensure_ascii=False).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(corpo)).encode()),
+                    *(headers or []),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": corpo})
@@ -0,0 +1,250 @@
+# app/pubsub.py
+
+"""
+Publicação de mudanças de agenda para os streams SSE dos médicos.
+
+As funções de escrita do `crud` chamam `publicar_agenda(db, ...)`, que apenas
+anexa a mensagem à sessão. No commit:
+
+- PostgreSQL: antes do commit, as mensagens são enviadas com `pg_notify` na
+  própria transação — o banco só as entrega se o commit acontecer. Cada worker
+  mantém uma única conexão em LISTEN (thread `OuvinteDeNotificacoes`) e
+  distribui o que recebe aos assinantes locais; assim um agendamento gravado
+  em qualquer worker chega a todas as telas.
+- Demais bancos (SQLite, um processo): as mensagens são entregues localmente
+  depois do commit.
+
+Cada assinante é só uma fila limitada no event loop do worker: sem consulta ao
+banco nem conexão do pool enquanto o stream está aberto. Um assinante lento
+demais (fila cheia) tem o stream encerrado e deve reconectar.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import asyncio
+import json
+import logging
+import select
+import threading
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_PENDENTES = "pubsub_pendentes"
+
+# ====================================================================================
+# ===== --- Barramento Local ---                                                 =====
+# ====================================================================================
+
+
+class Assinatura:
+    """Um stream aberto: fila de mensagens de um médico no event loop."""
+
+    __slots__ = ("medico_id", "fila", "encerrada")
+
+    def __init__(self, medico_id: int) -> None:
+        self.medico_id = medico_id
+        self.fila: "asyncio.Queue[Optional[str]]" = asyncio.Queue(
+            settings.SSE_QUEUE_SIZE
+        )
+        self.encerrada = False
+
+
+class Barramento:
+    """Assinaturas por médico; as entregas sempre ocorrem no event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.assinaturas: Dict[int, Set[Assinatura]] = defaultdict(set)
+
+    def assinar(self, medico_id: int) -> Assinatura:
+        assinatura = Assinatura(medico_id)
+        self.assinaturas[medico_id].add(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura: Assinatura) -> None:
+        do_medico = self.assinaturas.get(assinatura.medico_id)
+        if do_medico is not None:
+            do_medico.discard(assinatura)
+            if not do_medico:
+                del self.assinaturas[assinatura.medico_id]
+
+    def publicar(self, mensagem: str) -> None:
+        """Entrega a mensagem aos assinantes locais (seguro a partir de threads)."""
+        self.loop.call_soon_threadsafe(self._entregar, mensagem)
+
+    def _entregar(self, mensagem: str) -> None:
+        try:
+            medico_id = json.loads(mensagem)["medico_id"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Mensagem de agenda inválida descartada: %r", mensagem)
+            return
+        for assinatura in list(self.assinaturas.get(medico_id, ())):
+            try:
+                assinatura.fila.put_nowait(mensagem)
+            except asyncio.QueueFull:
+                # O stream termina depois de esvaziar a fila; o cliente reconecta
+                assinatura.encerrada = True
+                self.cancelar(assinatura)
+
+    def encerrar(self) -> None:
+        """Encerra todos os streams (desligamento do worker)."""
+        for do_medico in list(self.assinaturas.values()):
+            for assinatura in list(do_medico):
+                assinatura.encerrada = True
+                if not assinatura.fila.full():
+                    assinatura.fila.put_nowait(None)
+        self.assinaturas.clear()
+
+
+# ====================================================================================
+# ===== --- Canal entre Workers (PostgreSQL LISTEN/NOTIFY) ---                   =====
+# ====================================================================================
+
+
+class OuvinteDeNotificacoes:
+    """Thread com uma conexão dedicada em LISTEN, fora do pool de conexões."""
+
+    def __init__(self, engine: Engine, barramento: Barramento) -> None:
+        self.engine = engine
+        self.barramento = barramento
+        self._parar = threading.Event()
+        self._thread = threading.Thread(
+            target=self._executar, name="ouvinte-de-agenda", daemon=True
+        )
+        self._thread.start()
+
+    def encerrar(self) -> None:
+        self._parar.set()
+        self._thread.join(timeout=5)
+
+    def _executar(self) -> None:
+        while not self._parar.is_set():
+            try:
+                self._escutar()
+            except Exception:
+                logger.exception("Conexão de LISTEN perdida; reconectando.")
+                self._parar.wait(2)
+
+    def _escutar(self) -> None:
+        conexao = self.engine.raw_connection()
+        # Desvincula a conexão do pool: ela não ocupa vaga das requisições
+        conexao.detach()
+        dbapi = conexao.dbapi_connection
+        try:
+            dbapi.autocommit = True
+            with dbapi.cursor() as cursor:
+                cursor.execute(f"LISTEN {settings.PUBSUB_CHANNEL}")
+            while not self._parar.is_set():
+                prontos, _, _ = select.select([dbapi], [], [], 1.0)
+                if not prontos:
+                    continue
+                dbapi.poll()
+                while dbapi.notifies:
+                    self.barramento.publicar(dbapi.notifies.pop(0).payload)
+        finally:
+            dbapi.close()
+
+
+# ====================================================================================
+# ===== --- Publicação a partir do crud ---                                      =====
+# ====================================================================================
+
+_barramento: Optional[Barramento] = None
+_ouvinte: Optional[OuvinteDeNotificacoes] = None
+
+
+def publicar_agenda(db: Session, medico_id: int, operacao: str, dados: dict) -> None:
+    """Agenda, para o commit da sessão, o aviso de mudança na agenda do médico."""
+    mensagem = json.dumps(
+        {"medico_id": medico_id, "operacao": operacao, "agendamento": dados},
+        separators=(",", ":"),
+    )
+    db.info.setdefault(_PENDENTES, []).append(mensagem)
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _notificar_no_commit(session: Session) -> None:
+    mensagens: List[str] = session.info.get(_PENDENTES)
+    if not mensagens or session.get_bind().dialect.name != "postgresql":
+        return
+    session.execute(
+        text(
+            "SELECT pg_notify(:canal, mensagem) "
+            "FROM unnest(CAST(:mensagens AS text[])) AS mensagem"
+        ),
+        {"canal": settings.PUBSUB_CHANNEL, "mensagens": mensagens},
+    )
+    del session.info[_PENDENTES]
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publicar_depois_do_commit(session: Session) -> None:
+    mensagens = session.info.pop(_PENDENTES, None)
+    if mensagens and _barramento is not None:
+        for mensagem in mensagens:
+            _barramento.publicar(mensagem)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _descartar_no_rollback(session: Session) -> None:
+    session.info.pop(_PENDENTES, None)
+
+
+# ====================================================================================
+# ===== --- Ciclo de Vida e Streams ---                                          =====
+# ====================================================================================
+
+
+def iniciar(loop: asyncio.AbstractEventLoop, engine: Engine) -> None:
+    """Cria o barramento do worker e, no PostgreSQL, a thread de LISTEN."""
+    global _barramento, _ouvinte
+    _barramento = Barramento(loop)
+    if engine.dialect.name == "postgresql":
+        _ouvinte = OuvinteDeNotificacoes(engine, _barramento)
+
+
+def encerrar() -> None:
+    """Para a thread de LISTEN e encerra os streams abertos."""
+    global _barramento, _ouvinte
+    if _ouvinte is not None:
+        _ouvinte.encerrar()
+        _ouvinte = None
+    if _barramento is not None:
+        _barramento.encerrar()
+        _barramento = None
+
+
+def assinar(medico_id: int) -> Optional[Assinatura]:
+    """Abre uma assinatura da agenda do médico (None se o barramento não existe)."""
+    return None if _barramento is None else _barramento.assinar(medico_id)
+
+
+async def eventos_sse(assinatura: Assinatura) -> AsyncIterator[str]:
+    """Gera o stream SSE da assinatura, com comentários periódicos de keep-alive."""
+    try:
+        yield f"retry: {settings.SSE_RETRY_MILLISECONDS}\n\n"
+        while not (assinatura.encerrada and assinatura.fila.empty()):
+            try:
+                mensagem = await asyncio.wait_for(
+                    assinatura.fila.get(), timeout=settings.SSE_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if mensagem is None:
+                break
+            yield f"event: agendamento\ndata: {mensagem}\n\n"
+    finally:
+        if _barramento is not None:
+            _barramento.cancelar(assinatura)
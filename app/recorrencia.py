@@ -0,0 +1,86 @@
+# app/recorrencia.py
+
+"""
+Expansão das séries de agendamentos recorrentes (regra de recorrência).
+
+Uma série guarda apenas a regra — frequência (semanal ou mensal), intervalo,
+data de início e, opcionalmente, data final e/ou número de ocorrências. As
+ocorrências são calculadas sob demanda para a janela consultada: o índice da
+primeira ocorrência na janela é obtido por aritmética de datas, sem percorrer
+as ocorrências anteriores, então o custo é proporcional às ocorrências da
+janela e não à idade da série.
+
+Na recorrência mensal, dias que não existem no mês (29 a 31) caem no último
+dia do mês, sem deslocar as ocorrências seguintes.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import calendar
+from datetime import date, timedelta
+from typing import Any, Iterator
+
+from .enums import FrequenciaSerie
+
+# ====================================================================================
+# ===== --- Expansão ---                                                         =====
+# ====================================================================================
+
+
+def _somar_meses(data: date, meses: int) -> date:
+    total = data.year * 12 + data.month - 1 + meses
+    ano, mes = divmod(total, 12)
+    mes += 1
+    return date(ano, mes, min(data.day, calendar.monthrange(ano, mes)[1]))
+
+
+def ocorrencia(frequencia: str, intervalo: int, data_inicio: date, indice: int) -> date:
+    """Data da ocorrência de número `indice` (0 é a própria data de início)."""
+    if frequencia == FrequenciaSerie.SEMANAL.value:
+        return data_inicio + timedelta(weeks=indice * intervalo)
+    return _somar_meses(data_inicio, indice * intervalo)
+
+
+def _primeiro_indice(
+    frequencia: str, intervalo: int, data_inicio: date, inicio: date
+) -> int:
+    """Menor índice cuja ocorrência é >= `inicio` (estimativa + ajuste)."""
+    if inicio <= data_inicio:
+        return 0
+    if frequencia == FrequenciaSerie.SEMANAL.value:
+        return -(-(inicio - data_inicio).days // (7 * intervalo))
+    meses = (inicio.year - data_inicio.year) * 12 + inicio.month - data_inicio.month
+    indice = max(meses // intervalo, 0)
+    while ocorrencia(frequencia, intervalo, data_inicio, indice) < inicio:
+        indice += 1
+    return indice
+
+
+def expandir(serie: Any, inicio: date, fim: date) -> Iterator[date]:
+    """
+    Gera as datas das ocorrências da série entre `inicio` e `fim` (inclusive).
+
+    Args:
+        serie: Objeto com `frequencia`, `intervalo`, `data_inicio`, `data_fim`
+            (opcional) e `ocorrencias` (opcional), como models.SerieAgendamento.
+        inicio: Início da janela consultada.
+        fim: Fim da janela consultada.
+    """
+    if serie.data_fim is not None and serie.data_fim < fim:
+        fim = serie.data_fim
+    indice = _primeiro_indice(
+        serie.frequencia, serie.intervalo, serie.data_inicio, inicio
+    )
+    while serie.ocorrencias is None or indice < serie.ocorrencias:
+        data = ocorrencia(serie.frequencia, serie.intervalo, serie.data_inicio, indice)
+        if data > fim:
+            return
+        yield data
+        indice += 1
+
+
+def e_ocorrencia(serie: Any, data: date) -> bool:
+    """True se `data` é uma das ocorrências da série."""
+    return any(expandir(serie, data, data))
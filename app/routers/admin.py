@@ -0,0 +1,77 @@
+# app/routers/admin.py
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+import asyncio
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from .. import models, schemas
+from ..config import settings
+from ..dependencies import require_admin_user
+from ..profiling import AmostradorDePilhas, criar_token_profiling, trava_amostragem
+
+# ====================================================================================
+# ===== --- Configuração do Router ---                                           =====
+# ====================================================================================
+router = APIRouter(
+    prefix="/admin",
+    tags=["Administração"],
+    dependencies=[Depends(require_admin_user)],
+)
+
+
+# ====================================================================================
+# ===== --- Endpoints de Profiling ---                                           =====
+# ====================================================================================
+
+
+@router.post("/profiling/token", response_model=schemas.TokenProfiling)
+async def criar_token_de_profiling(
+    _current_admin: models.User = Depends(require_admin_user),
+):
+    """
+    Gera um token assinado para o header `X-Profile`.
+
+    Uma requisição com `X-Profile: <token>` é executada normalmente, mas
+    retorna o perfil (formato speedscope) no lugar da resposta.
+    """
+    token, expira_em = criar_token_profiling(settings.PROFILING_TOKEN_TTL_SECONDS)
+    return {"token": token, "expira_em": expira_em}
+
+
+@router.get("/profiling/amostragem")
+async def amostrar_worker(
+    segundos: Annotated[float, Query(gt=0)] = 10,
+    formato: Literal["collapsed", "speedscope"] = "collapsed",
+) -> Response:
+    """
+    Amostra as pilhas de todas as threads deste worker por `segundos`.
+
+    Retorna as pilhas agregadas em formato "collapsed" (texto, uma pilha por
+    linha seguida da contagem) ou o perfil JSON do speedscope.
+    """
+    if segundos > settings.PROFILING_MAX_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Duração máxima: {settings.PROFILING_MAX_SECONDS} segundos.",
+        )
+    if not trava_amostragem.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Já existe uma amostragem em andamento.",
+        )
+    amostrador = AmostradorDePilhas(settings.PROFILING_INTERVAL_SECONDS)
+    amostrador.iniciar()
+    try:
+        await asyncio.sleep(segundos)
+    finally:
+        amostrador.parar()
+        trava_amostragem.release()
+
+    if formato == "speedscope":
+        return JSONResponse(amostrador.speedscope(f"worker ({segundos:g}s)"))
+    return PlainTextResponse(amostrador.pilhas_colapsadas())
@@ -3,24 +3,137 @@
 # ====================================================================================
 # ===== --- Importações ---                                                      =====
 # ====================================================================================
-from typing import List
+from datetime import date
+from typing import Annotated, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from .. import crud, schemas
-from ..dependencies import get_db
+from .. import crud, distribuicao, encaixe, models, schemas
+from ..dependencies import (
+    get_db,
+    get_filtro_especialidade,
+    get_janela_calendario,
+    require_login_ativo,
+    require_secretaria_user,
+)
+from ..especialidades import catalogo
 
 # ====================================================================================
 # ===== --- Configuração do Router ---                                           =====
 # ====================================================================================
+# Leituras e alterações de agendamentos são auditadas (LGPD): exigem um usuário
+# autenticado, registrado como ator de cada evento
 router = APIRouter(
     prefix="/agendamentos",
     tags=["Agendamentos"],
+    dependencies=[Depends(require_login_ativo)],
     responses={404: {"description": "Agendamento não encontrado"}},
 )
 
 
+# ====================================================================================
+# ===== --- Operações em Lote ---                                                =====
+# ====================================================================================
+
+
+@router.post(
+    "/bulk",
+    response_model=schemas.ResultadoOperacaoEmLote,
+    status_code=status.HTTP_201_CREATED,
+)
+async def criar_agendamentos_em_lote(
+    lote: schemas.AgendamentosEmLoteCreate,
+    db: Annotated[Session, Depends(get_db)],
+    _current_user: Annotated[models.User, Depends(require_secretaria_user)],
+    dry_run: bool = False,
+):
+    """
+    Cria vários agendamentos em uma única transação, com um INSERT de
+    múltiplas linhas.
+
+    Todos os pacientes e especialidades referenciados precisam existir. Com
+    `dry_run=true`, apenas valida o lote e informa quantos agendamentos seriam
+    criados.
+    """
+    inexistentes = crud.get_pacientes_inexistentes(
+        db, paciente_ids=[item.paciente_id for item in lote.itens]
+    )
+    if inexistentes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Pacientes não encontrados: {inexistentes}.",
+        )
+    inexistentes = crud.get_especialidades_inexistentes(
+        db, nomes=[item.especialidade for item in lote.itens]
+    )
+    if inexistentes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Especialidades não encontradas: {inexistentes}.",
+        )
+    if dry_run:
+        return {"afetados": len(lote.itens), "dry_run": True}
+    ids = crud.create_agendamentos_em_lote(db, agendamentos=lote.itens)
+    return {"afetados": len(ids), "dry_run": False, "ids": ids}
+
+
+@router.patch("/bulk", response_model=schemas.ResultadoOperacaoEmLote)
+async def reagendar_agendamentos_em_lote(
+    reagendamento: schemas.AgendamentosReagendamentoEmLote,
+    db: Annotated[Session, Depends(get_db)],
+    _current_user: Annotated[models.User, Depends(require_secretaria_user)],
+    dry_run: bool = False,
+):
+    """
+    Reagenda, com um único UPDATE, todos os agendamentos de um médico em um
+    intervalo de datas: transfere-os para `novo_medico_id` e/ou desloca as datas
+    de consulta em `deslocamento_dias`.
+
+    Com `dry_run=true`, apenas informa quantos agendamentos seriam afetados.
+    """
+    if reagendamento.novo_medico_id is not None:
+        if crud.get_medico_by_id(db, medico_id=reagendamento.novo_medico_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Médico com id {reagendamento.novo_medico_id} não encontrado.",
+            )
+    filtro = reagendamento.model_dump(include={"medico_id", "data_inicio", "data_fim"})
+    if dry_run:
+        afetados = crud.contar_agendamentos_em_lote(db, **filtro)
+        return {"afetados": afetados, "dry_run": True}
+    ids = crud.reagendar_agendamentos_em_lote(
+        db,
+        **filtro,
+        novo_medico_id=reagendamento.novo_medico_id,
+        deslocamento_dias=reagendamento.deslocamento_dias,
+    )
+    return {"afetados": len(ids), "dry_run": False, "ids": ids}
+
+
+@router.delete("/bulk", response_model=schemas.ResultadoOperacaoEmLote)
+async def cancelar_agendamentos_em_lote(
+    db: Annotated[Session, Depends(get_db)],
+    _current_user: Annotated[models.User, Depends(require_secretaria_user)],
+    medico_id: int,
+    data_inicio: Optional[date] = None,
+    data_fim: Optional[date] = None,
+    dry_run: bool = False,
+):
+    """
+    Cancela (remove logicamente), com um único UPDATE, todos os agendamentos
+    de um médico no intervalo de datas informado.
+
+    Com `dry_run=true`, apenas informa quantos agendamentos seriam removidos.
+    """
+    filtro = {"medico_id": medico_id, "data_inicio": data_inicio, "data_fim": data_fim}
+    if dry_run:
+        afetados = crud.contar_agendamentos_em_lote(db, **filtro)
+        return {"afetados": afetados, "dry_run": True}
+    ids = crud.cancelar_agendamentos_em_lote(db, **filtro)
+    return {"afetados": len(ids), "dry_run": False, "ids": ids}
+
+
 # ====================================================================================
 # ===== --- Endpoints para Agendamentos ---                                      =====
 # ====================================================================================
@@ -36,7 +149,11 @@ async def criar_novo_agendamento(
     Cria um novo agendamento para um paciente.
 
     Verifica se o paciente associado ao `paciente_id` existe antes de criar
-    o agendamento.
+    o agendamento. Sem `medico_id`, o médico é escolhido entre os da
+    `especialidade` pela menor carga na semana, com vaga no dia e com
+    preferência pelo médico anterior do paciente; retorna 409 se nenhum médico
+    da especialidade tem vaga na data. Retorna 404 se a especialidade não está
+    no catálogo.
     """
     db_paciente = crud.get_paciente_by_id(db, paciente_id=agendamento.paciente_id)
     if not db_paciente:
@@ -44,19 +161,40 @@ async def criar_novo_agendamento(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Paciente com id {agendamento.paciente_id} não encontrado.",
         )
+    especialidade = catalogo.obter(db, agendamento.especialidade)
+    if especialidade is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Especialidade '{agendamento.especialidade}' não encontrada.",
+        )
+    if agendamento.medico_id is None:
+        db_agendamento = distribuicao.agendar(db, agendamento, especialidade[0])
+        if db_agendamento is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Nenhum médico de {agendamento.especialidade} com vaga em "
+                f"{agendamento.data_primeira_consulta.isoformat()}.",
+            )
+        return db_agendamento
     # Adicionar outras validações se necessário (ex: disponibilidade do médico)
     return crud.create_agendamento(db=db, agendamento=agendamento)
 
 
 @router.get("/", response_model=List[schemas.Agendamento])
 async def listar_todos_agendamentos(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    especialidade_id: Optional[int] = Depends(get_filtro_especialidade),
 ):
     """
     Retorna uma lista de todos os agendamentos no sistema.
-    Suporta paginação.
+    Suporta paginação e filtro por especialidade (`especialidade_id` ou
+    `especialidade`, o nome em qualquer grafia).
     """
-    agendamentos = crud.get_agendamentos_all(db, skip=skip, limit=limit)
+    agendamentos = crud.get_agendamentos_all(
+        db, skip=skip, limit=limit, especialidade_id=especialidade_id
+    )
     return agendamentos
 
 
@@ -80,6 +218,28 @@ async def listar_agendamentos_do_paciente(
     return agendamentos
 
 
+@router.get(
+    "/paciente/{paciente_id}/calendario", response_model=List[schemas.ItemCalendario]
+)
+async def calendario_do_paciente(
+    paciente_id: int,
+    janela: Annotated[Tuple[date, date], Depends(get_janela_calendario)],
+    db: Session = Depends(get_db),
+):
+    """
+    Retorna as consultas do paciente entre `inicio` e `fim`: os agendamentos e
+    as ocorrências das séries recorrentes (calculadas sob demanda), por data.
+    """
+    db_paciente = crud.get_paciente_by_id(db, paciente_id=paciente_id)
+    if not db_paciente:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Paciente com id {paciente_id} não encontrado.",
+        )
+    inicio, fim = janela
+    return crud.get_calendario(db, inicio, fim, paciente_id=paciente_id)
+
+
 @router.get("/{agendamento_id}", response_model=schemas.Agendamento)
 async def obter_agendamento_por_id(agendamento_id: int, db: Session = Depends(get_db)):
     """
@@ -106,25 +266,31 @@ async def atualizar_dados_agendamento(
     Apenas os campos fornecidos na requisição serão alterados.
     Não permite alterar o paciente_id de um agendamento.
     """
-    db_agendamento_existente = crud.get_agendamento_by_id(
-        db, agendamento_id=agendamento_id
-    )
-    if db_agendamento_existente is None:
+    try:
+        updated_agendamento = crud.update_agendamento(
+            db=db, agendamento_id=agendamento_id, agendamento_update=agendamento_update
+        )
+    except crud.EspecialidadeNaoEncontradaError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    if updated_agendamento is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Agendamento não encontrado para atualização",
         )
-
-    updated_agendamento = crud.update_agendamento(
-        db=db, agendamento_id=agendamento_id, agendamento_update=agendamento_update
-    )
     return updated_agendamento
 
 
 @router.delete("/{agendamento_id}", response_model=schemas.Agendamento)
-async def remover_agendamento(agendamento_id: int, db: Session = Depends(get_db)):
+async def remover_agendamento(
+    agendamento_id: int,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     """
-    Remove um agendamento do sistema.
+    Remove (logicamente) um agendamento do sistema.
+
+    Logo após a resposta, a vaga liberada é oferecida à lista de espera da
+    especialidade (veja /lista-espera).
     """
     db_agendamento_removido = crud.delete_agendamento(db, agendamento_id=agendamento_id)
     if db_agendamento_removido is None:
@@ -132,4 +298,5 @@ async def remover_agendamento(agendamento_id: int, db: Session = Depends(get_db)
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Agendamento não encontrado para remoção",
         )
+    background_tasks.add_task(encaixe.preencher_vaga, db_agendamento_removido)
     return db_agendamento_removido
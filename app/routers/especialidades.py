@@ -0,0 +1,58 @@
+# app/routers/especialidades.py
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+from typing import Annotated, List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from .. import crud, models, schemas
+from ..dependencies import get_db, require_admin_user, require_login_ativo
+
+# ====================================================================================
+# ===== --- Configuração do Router ---                                           =====
+# ====================================================================================
+router = APIRouter(
+    prefix="/especialidades",
+    tags=["Especialidades"],
+    dependencies=[Depends(require_login_ativo)],
+)
+
+
+# ====================================================================================
+# ===== --- Endpoints de Especialidades ---                                      =====
+# ====================================================================================
+
+
+@router.get("", response_model=List[schemas.Especialidade])
+async def listar_especialidades(
+    db: Annotated[Session, Depends(get_db)],
+) -> List[models.Especialidade]:
+    """
+    Lista o catálogo de especialidades. Médicos, agendamentos, séries e
+    entradas da lista de espera só aceitam especialidades do catálogo, em
+    qualquer grafia equivalente ("Cardiologia", "cardiologia").
+    """
+    return crud.get_especialidades(db)
+
+
+@router.post(
+    "", response_model=schemas.Especialidade, status_code=status.HTTP_201_CREATED
+)
+async def cadastrar_especialidade(
+    especialidade: schemas.EspecialidadeCreate,
+    db: Annotated[Session, Depends(get_db)],
+    _current_admin: Annotated[models.User, Depends(require_admin_user)],
+) -> models.Especialidade:
+    """
+    Cadastra uma especialidade no catálogo (apenas administradores).
+
+    Retorna 409 se já existe uma especialidade equivalente (mesmo nome sem
+    acentos, maiúsculas ou espaços extras).
+    """
+    try:
+        return crud.create_especialidade(db, especialidade=especialidade)
+    except crud.EspecialidadeDuplicadaError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
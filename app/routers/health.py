@@ -0,0 +1,129 @@
+# app/routers/health.py
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..database import engine
+from ..migrations import revisoes_da_conexao, revisoes_head
+
+# ====================================================================================
+# ===== --- Configuração do Router ---                                           =====
+# ====================================================================================
+router = APIRouter(tags=["Saúde"])
+
+# (instante monotônico, status_code, corpo) da última verificação de prontidão
+_cache: Optional[Tuple[float, int, Dict[str, Any]]] = None
+_trava = asyncio.Lock()
+
+
+# ====================================================================================
+# ===== --- Verificações ---                                                     =====
+# ====================================================================================
+
+
+def _verificar_pool() -> Dict[str, Any]:
+    """Saturação do pool: conexões em uso sobre a capacidade (size + overflow)."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"ok": True, "em_uso": None, "capacidade": None, "saturacao": None}
+    em_uso = pool.checkedout()
+    capacidade = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    saturacao = em_uso / capacidade if capacidade else 0.0
+    return {
+        "ok": saturacao < settings.HEALTH_POOL_SATURATION_MAX,
+        "em_uso": em_uso,
+        "capacidade": capacidade,
+        "saturacao": round(saturacao, 3),
+    }
+
+
+def _verificar_banco() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Obtém uma conexão do pool, executa SELECT 1 e lê a revisão do alembic."""
+    inicio = time.perf_counter()
+    with engine.connect() as conexao:
+        conexao.execute(text("SELECT 1"))
+        latencia_ms = round((time.perf_counter() - inicio) * 1000, 2)
+        aplicadas = revisoes_da_conexao(conexao)
+    esperadas = revisoes_head()
+    banco = {"ok": True, "latencia_ms": latencia_ms}
+    migracoes = {
+        "ok": aplicadas == esperadas,
+        "aplicadas": sorted(aplicadas),
+        "esperadas": sorted(esperadas),
+    }
+    return banco, migracoes
+
+
+async def _verificar_prontidao() -> Tuple[int, Dict[str, Any]]:
+    """Executa as verificações de prontidão; 503 se alguma falhar."""
+    # O pool é lido antes de a própria verificação ocupar uma conexão.
+    verificacoes: Dict[str, Any] = {"pool": _verificar_pool()}
+    try:
+        banco, migracoes = await asyncio.wait_for(
+            run_in_threadpool(_verificar_banco),
+            timeout=settings.HEALTH_DB_TIMEOUT_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        banco = {
+            "ok": False,
+            "erro": f"Sem conexão em {settings.HEALTH_DB_TIMEOUT_SECONDS}s.",
+        }
+        migracoes = {"ok": False, "erro": "Banco indisponível."}
+    except Exception as exc:
+        banco = {"ok": False, "erro": type(exc).__name__}
+        migracoes = {"ok": False, "erro": "Banco indisponível."}
+    verificacoes["banco"] = banco
+    verificacoes["migracoes"] = migracoes
+
+    pronto = all(item["ok"] for item in verificacoes.values())
+    corpo = {
+        "status": "ok" if pronto else "indisponivel",
+        "verificacoes": verificacoes,
+        "verificado_em": datetime.now(timezone.utc).isoformat(),
+    }
+    return (200 if pronto else 503), corpo
+
+
+# ====================================================================================
+# ===== --- Endpoints de Saúde ---                                               =====
+# ====================================================================================
+
+
+@router.get("/healthz")
+async def liveness():
+    """
+    Verificação de vivacidade: responde enquanto o processo atende requisições.
+    Não acessa o banco.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readiness() -> JSONResponse:
+    """
+    Verificação de prontidão: conexão do pool com tempo limitado, paridade da
+    revisão do alembic e saturação do pool abaixo do limite.
+
+    O resultado é reaproveitado por HEALTH_CACHE_SECONDS, de modo que probes
+    frequentes (ou de vários orquestradores) não geram carga no banco.
+    """
+    global _cache
+    async with _trava:
+        agora = time.monotonic()
+        if _cache is not None and agora - _cache[0] < settings.HEALTH_CACHE_SECONDS:
+            _, status_code, corpo = _cache
+            return JSONResponse({**corpo, "cache": True}, status_code=status_code)
+        status_code, corpo = await _verificar_prontidao()
+        _cache = (time.monotonic(), status_code, corpo)
+    return JSONResponse({**corpo, "cache": False}, status_code=status_code)
@@ -0,0 +1,74 @@
+# app/routers/jobs.py
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from .. import crud, jobs, models, schemas
+from ..config import settings
+from ..dependencies import get_db, require_secretaria_user
+
+# ====================================================================================
+# ===== --- Configuração do Router ---                                           =====
+# ====================================================================================
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"],
+    dependencies=[Depends(require_secretaria_user)],
+    responses={404: {"description": "Job não encontrado"}},
+)
+
+
+# ====================================================================================
+# ===== --- Endpoints da Fila de Jobs ---                                        =====
+# ====================================================================================
+
+
+@router.post("", response_model=schemas.Job, status_code=status.HTTP_202_ACCEPTED)
+async def enfileirar_job(
+    job: schemas.JobCreate,
+    response: Response,
+    db: Annotated[Session, Depends(get_db)],
+) -> models.Job:
+    """
+    Enfileira uma operação pesada para execução pelos workers
+    (`python -m app.worker`), fora do ciclo da requisição.
+
+    Tipos: `importar_agendamentos` (`{"itens": [...]}`),
+    `exportar_agendamentos` (`{"medico_id", "data_inicio", "data_fim"}`,
+    opcionais) e `expurgo`. Acompanhe o andamento em `GET /jobs/{id}`.
+    """
+    if job.tipo not in jobs.TAREFAS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Tipo de job desconhecido. Tipos: {sorted(jobs.TAREFAS)}.",
+        )
+    db_job = crud.create_job(
+        db,
+        tipo=job.tipo,
+        parametros=job.parametros,
+        max_tentativas=settings.JOBS_MAX_ATTEMPTS,
+    )
+    response.headers["Location"] = f"/jobs/{db_job.id}"
+    return db_job
+
+
+@router.get("/{job_id}", response_model=schemas.Job)
+async def obter_job(
+    job_id: int,
+    db: Annotated[Session, Depends(get_db)],
+) -> models.Job:
+    """
+    Retorna o estado de um job: `status`, `progresso` (0 a 100), tentativas,
+    o último erro e, quando concluído, o `resultado`.
+    """
+    db_job = crud.get_job(db, job_id=job_id)
+    if db_job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job não encontrado"
+        )
+    return db_job
@@ -0,0 +1,157 @@
+# app/routers/lista_espera.py
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from .. import crud, encaixe, models, schemas
+from ..dependencies import get_db, get_filtro_especialidade, require_secretaria_user
+from ..enums import StatusListaEspera
+
+# ====================================================================================
+# ===== --- Configuração do Router ---                                           =====
+# ====================================================================================
+router = APIRouter(
+    prefix="/lista-espera",
+    tags=["Lista de Espera"],
+    dependencies=[Depends(require_secretaria_user)],
+    responses={404: {"description": "Entrada da lista de espera não encontrada"}},
+)
+
+
+# ====================================================================================
+# ===== --- Endpoints da Lista de Espera ---                                     =====
+# ====================================================================================
+
+
+@router.post(
+    "", response_model=schemas.EntradaListaEspera, status_code=status.HTTP_201_CREATED
+)
+async def entrar_na_lista_espera(
+    entrada: schemas.EntradaListaEsperaCreate,
+    db: Annotated[Session, Depends(get_db)],
+) -> models.EntradaListaEspera:
+    """
+    Coloca um paciente na lista de espera de uma especialidade.
+
+    Quando um agendamento compatível (especialidade, data no período aceito
+    e, se informado, o médico preferido) é removido, a vaga é oferecida à
+    entrada de maior prioridade e, no empate, à mais antiga.
+    """
+    if crud.get_paciente_by_id(db, paciente_id=entrada.paciente_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Paciente com id {entrada.paciente_id} não encontrado.",
+        )
+    if (
+        entrada.medico_id is not None
+        and crud.get_medico_by_id(db, medico_id=entrada.medico_id) is None
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Médico com id {entrada.medico_id} não encontrado.",
+        )
+    try:
+        return crud.create_entrada_lista_espera(db, entrada=entrada)
+    except crud.EspecialidadeNaoEncontradaError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+
+@router.get("", response_model=List[schemas.EntradaListaEspera])
+async def listar_lista_espera(
+    db: Annotated[Session, Depends(get_db)],
+    especialidade_id: Annotated[Optional[int], Depends(get_filtro_especialidade)],
+    status_entrada: Annotated[
+        StatusListaEspera, Query(alias="status")
+    ] = StatusListaEspera.AGUARDANDO,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[models.EntradaListaEspera]:
+    """
+    Lista as entradas (padrão: aguardando vaga) na ordem da fila, opcionalmente
+    de uma especialidade (`especialidade_id` ou `especialidade`).
+    """
+    return crud.get_lista_espera(
+        db,
+        especialidade_id=especialidade_id,
+        status=status_entrada,
+        skip=skip,
+        limit=limit,
+    )
+
+
+@router.get("/{entrada_id}", response_model=schemas.EntradaListaEspera)
+async def obter_entrada_lista_espera(
+    entrada_id: int,
+    db: Annotated[Session, Depends(get_db)],
+) -> models.EntradaListaEspera:
+    """
+    Obtém uma entrada da lista de espera pelo seu ID.
+    """
+    db_entrada = crud.get_entrada_lista_espera(db, entrada_id=entrada_id)
+    if db_entrada is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Entrada da lista de espera não encontrada",
+        )
+    return db_entrada
+
+
+@router.delete("/{entrada_id}", response_model=schemas.EntradaListaEspera)
+async def sair_da_lista_espera(
+    entrada_id: int,
+    db: Annotated[Session, Depends(get_db)],
+) -> models.EntradaListaEspera:
+    """
+    Retira da fila uma entrada que aguarda vaga.
+    """
+    db_entrada = crud.cancelar_entrada_lista_espera(db, entrada_id=entrada_id)
+    if db_entrada is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Nenhuma entrada aguardando vaga com este ID",
+        )
+    return db_entrada
+
+
+@router.post("/{entrada_id}/confirmar", response_model=schemas.EntradaListaEspera)
+async def confirmar_encaixe(
+    entrada_id: int,
+    db: Annotated[Session, Depends(get_db)],
+) -> models.EntradaListaEspera:
+    """
+    Confirma o encaixe oferecido: o agendamento criado é mantido.
+    """
+    db_entrada = crud.confirmar_oferta_lista_espera(db, entrada_id=entrada_id)
+    if db_entrada is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Nenhum encaixe pendente para esta entrada",
+        )
+    return db_entrada
+
+
+@router.post("/{entrada_id}/recusar", response_model=schemas.EntradaListaEspera)
+async def recusar_encaixe(
+    entrada_id: int,
+    background_tasks: BackgroundTasks,
+    db: Annotated[Session, Depends(get_db)],
+) -> models.EntradaListaEspera:
+    """
+    Recusa o encaixe oferecido: o agendamento criado é removido, a entrada
+    volta à fila na mesma posição e a vaga é oferecida à próxima entrada.
+    """
+    recusa = crud.recusar_oferta_lista_espera(db, entrada_id=entrada_id)
+    if recusa is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Nenhum encaixe pendente para esta entrada",
+        )
+    db_entrada, vaga = recusa
+    if vaga is not None:
+        background_tasks.add_task(encaixe.preencher_vaga, vaga)
+    return db_entrada
@@ -3,13 +3,23 @@
 # ====================================================================================
 # ===== --- Importações ---                                                      =====
 # ====================================================================================
-from typing import Annotated, List
+from datetime import date
+from typing import Annotated, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from .. import crud, models, schemas
-from ..dependencies import get_db, require_admin_user, require_login_ativo
+from .. import crud, models, pubsub, schemas
+from ..dependencies import (
+    HEADER_IDS_NAO_ENCONTRADOS,
+    get_db,
+    get_filtro_especialidade,
+    get_ids_em_lote,
+    get_janela_calendario,
+    require_admin_user,
+    require_login_ativo,
+)
 
 # ====================================================================================
 # ===== --- Configuração do Router ---                                           =====
@@ -44,21 +54,46 @@ async def criar_novo_medico(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Já existe um médico cadastrado com este nome.",
         )
-    return crud.create_medico(db=db, medico=medico)
+    try:
+        return crud.create_medico(db=db, medico=medico)
+    except crud.MedicoDuplicadoError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    except crud.EspecialidadeNaoEncontradaError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
 
 
 @router.get("/", response_model=List[schemas.Medico])
 async def listar_medicos(
+    response: Response,
     db: Annotated[Session, Depends(get_db)],
     _current_user: Annotated[models.User, Depends(require_login_ativo)],
+    ids: Annotated[Optional[List[int]], Depends(get_ids_em_lote)],
+    especialidade_id: Annotated[Optional[int], Depends(get_filtro_especialidade)],
     skip: int = 0,
     limit: int = 100,
 ) -> List[models.Medico]:
     """
     Retorna uma lista de todos os médicos cadastrados no sistema.
-    Suporta paginação.
+    Suporta paginação e filtro por especialidade (`especialidade_id` ou
+    `especialidade`, o nome em qualquer grafia).
+
+    Com `ids=1,2,3`, retorna apenas esses médicos, na ordem informada e em uma
+    única consulta; IDs inexistentes são informados no header
+    `X-Ids-Nao-Encontrados`.
     """
-    medicos = crud.get_medicos(db, skip=skip, limit=limit)
+    if ids is not None:
+        medicos = crud.get_medicos_by_ids(db, ids=ids)
+        encontrados = {medico.id for medico in medicos}
+        response.headers[HEADER_IDS_NAO_ENCONTRADOS] = ",".join(
+            str(i) for i in ids if i not in encontrados
+        )
+        return medicos
+    medicos = crud.get_medicos(
+        db, skip=skip, limit=limit, especialidade_id=especialidade_id
+    )
     return medicos
 
 
@@ -79,6 +114,59 @@ async def obter_medico_por_id(
     return db_medico
 
 
+@router.get("/{medico_id}/calendario", response_model=List[schemas.ItemCalendario])
+async def calendario_do_medico(
+    medico_id: int,
+    janela: Annotated[Tuple[date, date], Depends(get_janela_calendario)],
+    db: Annotated[Session, Depends(get_db)],
+    _current_user: Annotated[models.User, Depends(require_login_ativo)],
+) -> List[dict]:
+    """
+    Retorna a agenda do médico entre `inicio` e `fim`: os agendamentos e as
+    ocorrências das séries recorrentes (calculadas sob demanda), por data.
+    """
+    if crud.get_medico_by_id(db, medico_id=medico_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Médico não encontrado"
+        )
+    inicio, fim = janela
+    return crud.get_calendario(db, inicio, fim, medico_id=medico_id)
+
+
+@router.get("/{medico_id}/agenda/stream", response_class=StreamingResponse)
+async def acompanhar_agenda_medico(
+    medico_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    _current_user: Annotated[models.User, Depends(require_login_ativo)],
+) -> StreamingResponse:
+    """
+    Stream (Server-Sent Events) das mudanças na agenda de um médico.
+
+    Cada agendamento criado, alterado ou removido gera um evento `agendamento`
+    com `{"medico_id", "operacao", "agendamento"}`; transferências para outro
+    médico chegam à agenda anterior como `removido`. Comentários `: ping`
+    mantêm a conexão viva. Eventos não são reenviados após uma reconexão: o
+    cliente deve recarregar a agenda (ou usar GET /changes) ao reconectar.
+    """
+    if crud.get_medico_by_id(db, medico_id=medico_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Médico não encontrado"
+        )
+    # Libera a conexão do pool: o stream não consulta mais o banco
+    db.close()
+    assinatura = pubsub.assinar(medico_id)
+    if assinatura is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Streams de agenda indisponíveis.",
+        )
+    return StreamingResponse(
+        pubsub.eventos_sse(assinatura),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.put("/{medico_id}", response_model=schemas.Medico)
 async def atualizar_dados_medico(
     medico_id: int,
@@ -91,19 +179,16 @@ async def atualizar_dados_medico(
     Permite a atualização parcial dos dados do médico (nome, especialidade, telefone).
     Apenas os campos fornecidos na requisição serão alterados.
     """
-    db_medico_existente = crud.get_medico_by_id(db, medico_id=medico_id)
-    if db_medico_existente is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Médico não encontrado para atualização",
+    try:
+        updated_medico = crud.update_medico(
+            db=db, medico_id=medico_id, medico_update=medico_update
         )
-    updated_medico = crud.update_medico(
-        db=db, medico_id=medico_id, medico_update=medico_update
-    )
+    except crud.EspecialidadeNaoEncontradaError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
     if updated_medico is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Erro ao atualizar médico ou médico não encontrado",
+            detail="Médico não encontrado para atualização",
         )
     return updated_medico
 
@@ -115,17 +200,13 @@ async def remover_medico(
     _current_admin: Annotated[models.User, Depends(require_admin_user)],
 ) -> models.Medico:
     """
-    Remove um médico do sistema.
+    Remove (logicamente) um médico do sistema.
 
-    NOTA: Esta é uma deleção física. Em um sistema real, pode ser preferível
-    "inativar" um médico para preservar o histórico de agendamentos.
-    Se um médico for removido, deve-se considerar o que acontece com
-    seus agendamentos futuros e passados (ex: desassociar, reatribuir, arquivar).
+    O médico deixa de aparecer nas consultas e o nome fica livre para um novo
+    cadastro, mas a linha é mantida — preservando o histórico de agendamentos —
+    e só é apagada pelo expurgo quando não houver mais agendamentos nem conta
+    de usuário que a referenciem.
     """
-    # Validação adicional: verificar se o médico possui agendamentos ativos
-    # Se sim, talvez impedir a deleção ou exigir uma ação confirmatória.
-    # Por ora, faremos a deleção direta se ele for encontrado.
-
     db_medico_removido = crud.delete_medico(db, medico_id=medico_id)
     if db_medico_removido is None:
         raise HTTPException(
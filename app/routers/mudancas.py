@@ -0,0 +1,74 @@
+# app/routers/mudancas.py
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from .. import crud, schemas
+from ..config import settings
+from ..dependencies import get_db, require_secretaria_user
+
+# ====================================================================================
+# ===== --- Configuração do Router ---                                           =====
+# ====================================================================================
+router = APIRouter(
+    prefix="/changes",
+    tags=["Mudanças"],
+    dependencies=[Depends(require_secretaria_user)],
+)
+
+
+# ====================================================================================
+# ===== --- Endpoints do Feed de Mudanças ---                                    =====
+# ====================================================================================
+
+
+@router.get("", response_model=schemas.PaginaMudancas)
+async def listar_mudancas(
+    db: Annotated[Session, Depends(get_db)],
+    since: Annotated[
+        Optional[str],
+        Query(description="Cursor retornado pela página anterior (vazio: início)."),
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.CHANGES_MAX_LIMIT)] = 100,
+):
+    """
+    Feed ordenado de criações, alterações e remoções de pacientes e agendamentos.
+
+    Cada evento traz o estado do registro após a mudança. O consumidor guarda o
+    `cursor` da resposta e o envia como `since` na próxima chamada, recebendo
+    apenas os eventos posteriores; `mais=true` indica que há outra página
+    disponível de imediato.
+    """
+    try:
+        desde = crud.ler_cursor(since)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Cursor inválido.",
+        )
+    eventos = crud.get_mudancas(db, desde=desde, limite=limit + 1)
+    mais = len(eventos) > limit
+    eventos = eventos[:limit]
+    cursor = since or "0"
+    if eventos:
+        cursor = crud.formatar_cursor(eventos[-1].transacao, eventos[-1].seq)
+    return {
+        "eventos": [
+            {
+                "cursor": crud.formatar_cursor(evento.transacao, evento.seq),
+                "ocorrido_em": evento.ocorrido_em,
+                "entidade": evento.entidade,
+                "entidade_id": evento.entidade_id,
+                "operacao": evento.operacao,
+                "dados": evento.dados,
+            }
+            for evento in eventos
+        ],
+        "cursor": cursor,
+        "mais": mais,
+    }
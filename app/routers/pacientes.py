@@ -4,21 +4,31 @@
 # ===== --- Importações ---                                                      =====
 # ====================================================================================
 
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from .. import crud, models, schemas
-from ..dependencies import get_db, require_admin_user, require_secretaria_user
+from ..dependencies import (
+    HEADER_IDS_NAO_ENCONTRADOS,
+    get_db,
+    get_ids_em_lote,
+    require_admin_user,
+    require_login_ativo,
+    require_secretaria_user,
+)
 
 # ====================================================================================
 # ===== --- Configuração do Router ---                                           =====
 # ====================================================================================
 
+# Leituras e alterações de pacientes são auditadas (LGPD): exigem um usuário
+# autenticado, registrado como ator de cada evento
 router = APIRouter(
     prefix="/pacientes",
     tags=["Pacientes"],
+    dependencies=[Depends(require_login_ativo)],
     responses={404: {"description": "Não encontrado"}},
 )
 
@@ -39,34 +49,43 @@ async def criar_novo_paciente(
 
     Permite o cadastro completo de um paciente, incluindo seus dados pessoais
     e informações de endereço. A validação de CPF (se ativada no schema)
-    garante a integridade do dado.
+    garante a integridade do dado. CPF ou CNS já cadastrados são detectados
+    pelas restrições de unicidade do banco na própria inserção.
     """
-    db_paciente_por_cpf = crud.get_paciente_by_cpf(db, cpf=paciente.cpf)
-    if db_paciente_por_cpf:
+    try:
+        return crud.create_paciente(db=db, paciente=paciente)
+    except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="CPF já cadastrado no sistema.",
+            detail=str(exc),
         )
-    if paciente.cns:
-        db_paciente_por_cns = crud.get_paciente_by_cns(db, cns=paciente.cns)
-        if db_paciente_por_cns:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="CNS já cadastrado no sistema.",
-            )
-    return crud.create_paciente(db=db, paciente=paciente)
 
 
 @router.get("/", response_model=List[schemas.Paciente])
 async def listar_pacientes(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    ids: Optional[List[int]] = Depends(get_ids_em_lote),
+    db: Session = Depends(get_db),
 ):
     """
     Retorna uma lista de pacientes cadastrados.
 
     Suporta paginação através dos parâmetros `skip` (pular N registros)
     e `limit` (máximo de M registros por página).
+
+    Com `ids=1,2,3`, retorna apenas esses pacientes, na ordem informada e em
+    uma única consulta; `skip` e `limit` são ignorados. IDs inexistentes são
+    informados no header `X-Ids-Nao-Encontrados`.
     """
+    if ids is not None:
+        pacientes = crud.get_pacientes_by_ids(db, ids=ids)
+        encontrados = {paciente.id for paciente in pacientes}
+        response.headers[HEADER_IDS_NAO_ENCONTRADOS] = ",".join(
+            str(i) for i in ids if i not in encontrados
+        )
+        return pacientes
     pacientes = crud.get_pacientes(db, skip=skip, limit=limit)
     return pacientes
 
@@ -124,15 +143,13 @@ async def atualizar_dados_paciente(
     Permite a atualização de telefone e/ou endereço.
     Apenas os campos fornecidos na requisição serão alterados.
     """
-    db_paciente = crud.get_paciente_by_id(db, paciente_id=paciente_id)
-    if db_paciente is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Paciente não encontrado"
-        )
-
     updated_paciente = crud.update_paciente(
         db=db, paciente_id=paciente_id, paciente_update=paciente_update
     )
+    if updated_paciente is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Paciente não encontrado"
+        )
     return updated_paciente
 
 
@@ -143,10 +160,11 @@ async def remover_paciente(
     current_admin: Annotated[models.User, Depends(require_admin_user)],
 ):
     """
-    Remove um paciente do sistema.
+    Remove (logicamente) um paciente do sistema.
 
-    Ao remover um paciente, seu endereço associado também será removido
-    devido à configuração de cascata no banco de dados.
+    O CPF e o CNS ficam livres para um novo cadastro imediatamente; o paciente
+    e seu endereço são apagados fisicamente pelo expurgo periódico, depois do
+    período de retenção.
     """
     db_paciente = crud.delete_paciente(db, paciente_id=paciente_id)
     if db_paciente is None:
@@ -0,0 +1,155 @@
+# app/routers/series.py
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from .. import crud, models, recorrencia, schemas
+from ..dependencies import get_db, require_secretaria_user
+
+# ====================================================================================
+# ===== --- Configuração do Router ---                                           =====
+# ====================================================================================
+router = APIRouter(
+    prefix="/series",
+    tags=["Séries de Agendamentos"],
+    dependencies=[Depends(require_secretaria_user)],
+    responses={404: {"description": "Série não encontrada"}},
+)
+
+
+def _get_serie_ou_404(db: Session, serie_id: int) -> models.SerieAgendamento:
+    db_serie = crud.get_serie_by_id(db, serie_id=serie_id)
+    if db_serie is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Série não encontrada"
+        )
+    return db_serie
+
+
+def _validar_ocorrencia(serie: models.SerieAgendamento, data: date) -> None:
+    if not recorrencia.e_ocorrencia(serie, data):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"A série não tem ocorrência em {data.isoformat()}.",
+        )
+
+
+# ====================================================================================
+# ===== --- Endpoints de Séries ---                                              =====
+# ====================================================================================
+
+
+@router.post(
+    "", response_model=schemas.SerieAgendamento, status_code=status.HTTP_201_CREATED
+)
+async def criar_serie(
+    serie: schemas.SerieAgendamentoCreate,
+    db: Annotated[Session, Depends(get_db)],
+) -> models.SerieAgendamento:
+    """
+    Cria uma série de agendamentos recorrentes (semanal ou mensal, a cada
+    `intervalo` semanas/meses), até `data_fim` e/ou por `ocorrencias` vezes.
+
+    As ocorrências não são gravadas: aparecem nos calendários do paciente e do
+    médico, calculadas sob demanda.
+    """
+    if crud.get_paciente_by_id(db, paciente_id=serie.paciente_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Paciente com id {serie.paciente_id} não encontrado.",
+        )
+    if crud.get_medico_by_id(db, medico_id=serie.medico_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Médico com id {serie.medico_id} não encontrado.",
+        )
+    try:
+        return crud.create_serie(db, serie=serie)
+    except crud.EspecialidadeNaoEncontradaError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+
+@router.get("/{serie_id}", response_model=schemas.SerieAgendamento)
+async def obter_serie(
+    serie_id: int,
+    db: Annotated[Session, Depends(get_db)],
+) -> models.SerieAgendamento:
+    """
+    Obtém a regra de recorrência de uma série pelo seu ID.
+    """
+    return _get_serie_ou_404(db, serie_id)
+
+
+@router.delete("/{serie_id}", response_model=schemas.SerieAgendamento)
+async def remover_serie(
+    serie_id: int,
+    db: Annotated[Session, Depends(get_db)],
+) -> models.SerieAgendamento:
+    """
+    Remove (logicamente) uma série. Agendamentos criados por remarcações de
+    ocorrências são mantidos.
+    """
+    db_serie = crud.delete_serie(db, serie_id=serie_id)
+    if db_serie is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Série não encontrada para remoção",
+        )
+    return db_serie
+
+
+@router.put("/{serie_id}/ocorrencias/{data}", response_model=schemas.Agendamento)
+async def remarcar_ocorrencia(
+    serie_id: int,
+    data: date,
+    ocorrencia: schemas.OcorrenciaUpdate,
+    db: Annotated[Session, Depends(get_db)],
+) -> models.Agendamento:
+    """
+    Remarca uma ocorrência da série: ela passa a ser um agendamento comum em
+    `nova_data` (opcionalmente com outro médico), e as demais ocorrências
+    seguem inalteradas.
+
+    Retorna 409 se a ocorrência já foi cancelada ou remarcada.
+    """
+    db_serie = _get_serie_ou_404(db, serie_id)
+    _validar_ocorrencia(db_serie, data)
+    if (
+        ocorrencia.medico_id is not None
+        and crud.get_medico_by_id(db, medico_id=ocorrencia.medico_id) is None
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Médico com id {ocorrencia.medico_id} não encontrado.",
+        )
+    try:
+        return crud.mover_ocorrencia(
+            db, db_serie, data, ocorrencia.nova_data, ocorrencia.medico_id
+        )
+    except crud.OcorrenciaAlteradaError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+
+
+@router.delete("/{serie_id}/ocorrencias/{data}", status_code=status.HTTP_204_NO_CONTENT)
+async def cancelar_ocorrencia(
+    serie_id: int,
+    data: date,
+    db: Annotated[Session, Depends(get_db)],
+) -> None:
+    """
+    Cancela uma ocorrência da série, sem afetar as demais.
+
+    Retorna 409 se a ocorrência já foi cancelada ou remarcada.
+    """
+    db_serie = _get_serie_ou_404(db, serie_id)
+    _validar_ocorrencia(db_serie, data)
+    try:
+        crud.cancelar_ocorrencia(db, db_serie, data)
+    except crud.OcorrenciaAlteradaError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
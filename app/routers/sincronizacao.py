@@ -0,0 +1,171 @@
+# app/routers/sincronizacao.py
+
+"""
+Sincronização incremental para clientes offline (tablets das unidades).
+
+O cliente envia o `token` da última resposta e recebe apenas os pacientes
+(com endereços), médicos e agendamentos criados, alterados ou removidos
+desde então, lidos do outbox em ordem de (transacao, seq). Sem token — ou com
+um token mais antigo que a retenção do outbox — a resposta traz `reset=true`
+e começa um snapshot paginado por id das tabelas; o token final do snapshot
+aponta para a posição do outbox capturada no início, e a partir dele seguem
+os deltas. As respostas são compactadas (gzip) pelo GZipMiddleware.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+import base64
+import binascii
+import json
+import time
+from typing import Annotated, Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from .. import crud, schemas
+from ..config import settings
+from ..dependencies import get_db, require_secretaria_user
+
+# ====================================================================================
+# ===== --- Configuração do Router ---                                           =====
+# ====================================================================================
+router = APIRouter(
+    prefix="/sync",
+    tags=["Sincronização"],
+    dependencies=[Depends(require_secretaria_user)],
+)
+
+_ORDEM_SNAPSHOT = list(crud.ENTIDADES_SINCRONIZADAS)
+_COLECOES = {
+    crud.PACIENTE: "pacientes",
+    crud.MEDICO: "medicos",
+    crud.AGENDAMENTO: "agendamentos",
+}
+
+# ====================================================================================
+# ===== --- Token de Sincronização ---                                           =====
+# ====================================================================================
+
+# Fases do token:
+#   ["s", indice_entidade, apos_id, transacao, seq, emitido_em]  (snapshot)
+#   ["d", transacao, seq, emitido_em]                            (deltas)
+
+
+def _codificar_token(*partes: Any) -> str:
+    bruto = json.dumps(partes, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+
+def _decodificar_token(token: str) -> List[Any]:
+    try:
+        bruto = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        partes = json.loads(bruto)
+    except (binascii.Error, ValueError):
+        partes = None
+    if not (
+        isinstance(partes, list)
+        and partes
+        and (partes[0], len(partes)) in {("s", 6), ("d", 4)}
+        and all(isinstance(parte, int) for parte in partes[1:])
+        and (partes[0] == "d" or 0 <= partes[1] < len(_ORDEM_SNAPSHOT))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Token de sincronização inválido.",
+        )
+    return partes
+
+
+def _expirado(emitido_em: int) -> bool:
+    # Eventos mais antigos que a retenção já podem ter sido expurgados
+    idade_maxima = settings.SYNC_TOKEN_MAX_AGE_DAYS * 24 * 60 * 60
+    return time.time() - emitido_em > idade_maxima
+
+
+# ====================================================================================
+# ===== --- Endpoints de Sincronização ---                                       =====
+# ====================================================================================
+
+
+@router.get("", response_model=schemas.PaginaSincronizacao)
+async def sincronizar(
+    db: Annotated[Session, Depends(get_db)],
+    token: Annotated[
+        Optional[str],
+        Query(description="Token da resposta anterior (vazio: sincronização total)."),
+    ] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.CHANGES_MAX_LIMIT)] = (
+        settings.SYNC_PAGE_SIZE
+    ),
+):
+    """
+    Retorna os registros alterados desde o `token` informado.
+
+    Com `reset=true`, o cliente deve descartar os dados locais antes de aplicar
+    a página. `removidos` lista os ids removidos por coleção; `mais=true`
+    indica que há outra página disponível de imediato.
+    """
+    agora = int(time.time())
+    partes = _decodificar_token(token) if token else None
+    reset = partes is None or _expirado(partes[-1])
+    if reset:
+        transacao, seq = crud.posicao_atual_outbox(db)
+        partes = ["s", 0, 0, transacao, seq, agora]
+
+    pagina: Dict[str, Any] = {
+        "reset": reset,
+        "mais": True,
+        "pacientes": [],
+        "enderecos": [],
+        "medicos": [],
+        "agendamentos": [],
+        "removidos": {},
+    }
+    if partes[0] == "s":
+        _, indice, apos_id, transacao, seq, emitido_em = partes
+        entidade = _ORDEM_SNAPSHOT[indice]
+        registros = crud.get_snapshot_sync(db, entidade, apos_id, limit)
+        _adicionar(pagina, entidade, registros)
+        if len(registros) == limit:
+            pagina["token"] = _codificar_token(
+                "s", indice, registros[-1]["id"], transacao, seq, emitido_em
+            )
+        elif indice + 1 < len(_ORDEM_SNAPSHOT):
+            pagina["token"] = _codificar_token(
+                "s", indice + 1, 0, transacao, seq, emitido_em
+            )
+        else:
+            pagina["token"] = _codificar_token("d", transacao, seq, emitido_em)
+        return pagina
+
+    _, transacao, seq, _emitido_em = partes
+    eventos = crud.get_mudancas(db, desde=(transacao, seq), limite=limit + 1)
+    pagina["mais"] = len(eventos) > limit
+    eventos = eventos[:limit]
+    # Apenas o estado mais recente de cada registro dentro da página
+    ultimos = {(evento.entidade, evento.entidade_id): evento for evento in eventos}
+    for (entidade, entidade_id), evento in sorted(
+        ultimos.items(), key=lambda item: (item[1].transacao, item[1].seq)
+    ):
+        if evento.operacao == crud.REMOVIDO:
+            colecao = _COLECOES[entidade]
+            pagina["removidos"].setdefault(colecao, []).append(entidade_id)
+        else:
+            _adicionar(pagina, entidade, [evento.dados])
+    if eventos:
+        transacao, seq = eventos[-1].transacao, eventos[-1].seq
+    pagina["token"] = _codificar_token("d", transacao, seq, agora)
+    return pagina
+
+
+def _adicionar(pagina: Dict[str, Any], entidade: str, registros: List[dict]) -> None:
+    """Distribui os registros nas coleções da página (endereços à parte)."""
+    for registro in registros:
+        if entidade == crud.PACIENTE:
+            registro = dict(registro)
+            endereco = registro.pop("endereco", None)
+            if endereco is not None:
+                pagina["enderecos"].append(endereco)
+        pagina[_COLECOES[entidade]].append(registro)
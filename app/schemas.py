@@ -5,13 +5,13 @@
 # ====================================================================================
 
 import re
-from datetime import date
-from typing import Annotated, Optional, Type
+from datetime import date, datetime
+from typing import Annotated, Dict, List, Optional, Type
 
-from pydantic import BaseModel, Field, field_validator
-from validate_docbr import CNS, CPF
+from pydantic import BaseModel, Field, field_validator, model_validator
 
-from .enums import UserRole
+from .config import settings
+from .enums import FrequenciaSerie, StatusJob, StatusListaEspera, UserRole
 
 # ====================================================================================
 # ===== --- Funções Validadoras Auxiliares ---                                   =====
@@ -110,6 +110,8 @@ class PacienteCreate(PacienteBase):
     @field_validator("cpf")
     def validar_e_formatar_cpf(cls, v: str) -> str:
         """Valida o CPF."""
+        from validate_docbr import CPF  # importado sob demanda (inicialização)
+
         cpf_validator = CPF()
         if not cpf_validator.validate(v):
             raise ValueError("CPF inválido")
@@ -120,6 +122,8 @@ class PacienteCreate(PacienteBase):
         """Valida o CNS, se fornecido."""
         if v is None:
             return None
+        from validate_docbr import CNS  # importado sob demanda (inicialização)
+
         cns_validator = CNS()
         if not cns_validator.validate(v):
             raise ValueError("CNS inválido")
@@ -166,6 +170,37 @@ class Paciente(PacienteBase):
         from_attributes = True
 
 
+# ====================================================================================
+# ===== --- Schemas de Especialidade ---                                         =====
+# ====================================================================================
+
+
+class EspecialidadeCreate(BaseModel):
+    """Schema para cadastro de uma especialidade no catálogo."""
+
+    nome: Annotated[
+        str, Field(min_length=1, json_schema_extra={"example": "Cardiologia"})
+    ]
+
+    @field_validator("nome")
+    @classmethod
+    def validar_nome(cls: Type["EspecialidadeCreate"], v: str) -> str:
+        """Rejeita nomes só com espaços."""
+        if not v.strip():
+            raise ValueError("O nome da especialidade não pode ser vazio.")
+        return v
+
+
+class Especialidade(BaseModel):
+    """Schema para leitura de uma especialidade do catálogo."""
+
+    id: int
+    nome: str
+
+    class Config:
+        from_attributes = True
+
+
 # ====================================================================================
 # ===== --- Schemas de Médico ---                                                =====
 # ====================================================================================
@@ -217,6 +252,7 @@ class Medico(MedicoBase):
     """Schema para leitura/retorno de um médico."""
 
     id: int
+    especialidade_id: int
 
     class Config:
         from_attributes = True
@@ -261,11 +297,22 @@ class AgendamentoBase(BaseModel):
 
 
 class AgendamentoCreate(AgendamentoBase):
-    """Schema para criação de um novo agendamento."""
+    """
+    Schema para criação de um novo agendamento. Sem `medico_id`, o médico da
+    especialidade é escolhido automaticamente (carga, vagas no dia e
+    continuidade com o médico anterior do paciente).
+    """
 
+    medico_id: Annotated[Optional[int], Field(default=None)]
     paciente_id: int
 
 
+class AgendamentoEmLoteCreate(AgendamentoCreate):
+    """Item de criação em lote: o médico deve ser informado."""
+
+    medico_id: int
+
+
 class AgendamentoUpdate(BaseModel):
     """Schema para atualização de um agendamento."""
 
@@ -295,6 +342,7 @@ class Agendamento(AgendamentoBase):
     """Schema para leitura/retorno de um agendamento."""
 
     id: int
+    especialidade_id: int
     paciente_id: int
     medico: MedicoParaAgendamento
 
@@ -302,6 +350,266 @@ class Agendamento(AgendamentoBase):
         from_attributes = True
 
 
+class AgendamentosEmLoteCreate(BaseModel):
+    """Schema para criação de vários agendamentos em uma única operação."""
+
+    itens: Annotated[
+        List[AgendamentoEmLoteCreate],
+        Field(min_length=1, max_length=settings.BULK_MAX_ITENS),
+    ]
+
+
+class FiltroAgendamentosEmLote(BaseModel):
+    """Filtro que seleciona os agendamentos de um médico em um intervalo de datas."""
+
+    medico_id: int
+    data_inicio: Annotated[
+        date | None, Field(default=None, json_schema_extra={"example": "2025-01-06"})
+    ]
+    data_fim: Annotated[
+        date | None, Field(default=None, json_schema_extra={"example": "2025-01-06"})
+    ]
+
+
+class AgendamentosReagendamentoEmLote(FiltroAgendamentosEmLote):
+    """
+    Schema para reagendamento em lote: os agendamentos selecionados pelo filtro
+    podem ser transferidos para outro médico e/ou deslocados em N dias.
+    """
+
+    novo_medico_id: Annotated[Optional[int], Field(default=None)]
+    deslocamento_dias: Annotated[
+        Optional[int], Field(default=None, json_schema_extra={"example": 7})
+    ]
+
+    @model_validator(mode="after")
+    def validar_alteracao(self) -> "AgendamentosReagendamentoEmLote":
+        """Exige ao menos uma alteração (novo médico ou deslocamento de datas)."""
+        if self.novo_medico_id is None and not self.deslocamento_dias:
+            raise ValueError("Informe 'novo_medico_id' e/ou 'deslocamento_dias'.")
+        return self
+
+
+class ResultadoOperacaoEmLote(BaseModel):
+    """Schema para o resultado de uma operação em lote sobre agendamentos."""
+
+    afetados: int
+    dry_run: bool
+    ids: List[int] = []
+
+
+# ====================================================================================
+# ===== --- Schemas de Séries de Agendamentos ---                                =====
+# ====================================================================================
+class SerieAgendamentoBase(BaseModel):
+    """Schema base para uma série de agendamentos recorrentes."""
+
+    paciente_id: int
+    medico_id: int
+    especialidade: Annotated[str, Field(json_schema_extra={"example": "Cardiologia"})]
+    valor_consulta: Annotated[float, Field(gt=0, json_schema_extra={"example": 150.75})]
+    descricao: Annotated[
+        str | None,
+        Field(default=None, json_schema_extra={"example": "Acompanhamento mensal"}),
+    ]
+    frequencia: FrequenciaSerie
+    intervalo: Annotated[int, Field(default=1, ge=1, json_schema_extra={"example": 1})]
+    data_inicio: Annotated[date, Field(json_schema_extra={"example": "2025-01-06"})]
+    data_fim: Annotated[
+        date | None, Field(default=None, json_schema_extra={"example": "2025-12-31"})
+    ]
+    ocorrencias: Annotated[
+        int | None, Field(default=None, ge=1, json_schema_extra={"example": 12})
+    ]
+
+
+class SerieAgendamentoCreate(SerieAgendamentoBase):
+    """
+    Schema para criação de uma série. Sem `data_fim` nem `ocorrencias`, a série
+    não tem fim (até ser removida).
+    """
+
+    @model_validator(mode="after")
+    def validar_periodo(self) -> "SerieAgendamentoCreate":
+        """Exige `data_fim` igual ou posterior a `data_inicio`."""
+        if self.data_fim is not None and self.data_fim < self.data_inicio:
+            raise ValueError("'data_fim' deve ser igual ou posterior a 'data_inicio'.")
+        return self
+
+
+class SerieAgendamento(SerieAgendamentoBase):
+    """Schema para leitura/retorno de uma série de agendamentos."""
+
+    id: int
+    especialidade_id: int
+    criado_em: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class OcorrenciaUpdate(BaseModel):
+    """
+    Schema para remarcar uma ocorrência de série: ela passa a ser um
+    agendamento comum na nova data (e, opcionalmente, com outro médico).
+    """
+
+    nova_data: Annotated[date, Field(json_schema_extra={"example": "2025-02-07"})]
+    medico_id: Annotated[Optional[int], Field(default=None)]
+
+
+class ItemCalendario(BaseModel):
+    """
+    Uma consulta do calendário: um agendamento (`agendamento_id`) ou uma
+    ocorrência calculada de série (`serie_id`), ainda sem agendamento próprio.
+    """
+
+    data: date
+    agendamento_id: Optional[int] = None
+    serie_id: Optional[int] = None
+    paciente_id: int
+    medico_id: int
+    especialidade: str
+    valor_consulta: float
+    descricao: Optional[str] = None
+
+
+# ====================================================================================
+# ===== --- Schemas da Lista de Espera ---                                       =====
+# ====================================================================================
+class EntradaListaEsperaBase(BaseModel):
+    """Schema base para uma entrada da lista de espera."""
+
+    paciente_id: int
+    especialidade: Annotated[str, Field(json_schema_extra={"example": "Cardiologia"})]
+    medico_id: Annotated[
+        Optional[int],
+        Field(default=None, description="Médico preferido (qualquer um se vazio)."),
+    ]
+    prioridade: Annotated[
+        int,
+        Field(
+            default=3,
+            ge=1,
+            le=5,
+            description="1 é a mais urgente; empates seguem a ordem de chegada.",
+        ),
+    ]
+    data_inicio: Annotated[
+        date | None, Field(default=None, json_schema_extra={"example": "2025-01-06"})
+    ]
+    data_fim: Annotated[
+        date | None, Field(default=None, json_schema_extra={"example": "2025-01-31"})
+    ]
+
+
+class EntradaListaEsperaCreate(EntradaListaEsperaBase):
+    """
+    Schema para colocar um paciente na lista de espera. Sem `data_inicio` e
+    `data_fim`, qualquer data de vaga é aceita.
+    """
+
+    @model_validator(mode="after")
+    def validar_periodo(self) -> "EntradaListaEsperaCreate":
+        """Exige `data_fim` igual ou posterior a `data_inicio`."""
+        if (
+            self.data_inicio is not None
+            and self.data_fim is not None
+            and self.data_fim < self.data_inicio
+        ):
+            raise ValueError("'data_fim' deve ser igual ou posterior a 'data_inicio'.")
+        return self
+
+
+class EntradaListaEspera(EntradaListaEsperaBase):
+    """Schema para leitura de uma entrada; `agendamento_id` é o encaixe oferecido."""
+
+    id: int
+    especialidade_id: int
+    status: StatusListaEspera
+    agendamento_id: Optional[int] = None
+    criado_em: datetime
+    atualizado_em: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# ====================================================================================
+# ===== --- Schemas do Feed de Mudanças ---                                      =====
+# ====================================================================================
+class EventoMudanca(BaseModel):
+    """Schema de um evento do feed de mudanças (outbox)."""
+
+    cursor: str
+    ocorrido_em: datetime
+    entidade: str
+    entidade_id: int
+    operacao: str
+    dados: dict
+
+
+class PaginaMudancas(BaseModel):
+    """Página do feed de mudanças; `cursor` é o valor para o próximo `since`."""
+
+    eventos: List[EventoMudanca]
+    cursor: str
+    mais: bool
+
+
+class PaginaSincronizacao(BaseModel):
+    """Página da sincronização incremental; `token` vai na próxima chamada."""
+
+    token: str
+    reset: bool
+    mais: bool
+    pacientes: List[dict] = []
+    enderecos: List[dict] = []
+    medicos: List[dict] = []
+    agendamentos: List[dict] = []
+    removidos: Dict[str, List[int]] = {}
+
+
+# ====================================================================================
+# ===== --- Schemas da Fila de Jobs ---                                          =====
+# ====================================================================================
+class JobCreate(BaseModel):
+    """Schema para enfileirar um job (importação, exportação, expurgo)."""
+
+    tipo: Annotated[str, Field(json_schema_extra={"example": "exportar_agendamentos"})]
+    parametros: Annotated[
+        dict, Field(default_factory=dict, json_schema_extra={"example": {}})
+    ]
+
+
+class Job(BaseModel):
+    """Schema de estado de um job; `progresso` vai de 0 a 100."""
+
+    id: int
+    tipo: str
+    status: StatusJob
+    progresso: int
+    mensagem: Optional[str] = None
+    tentativas: int
+    max_tentativas: int
+    resultado: Optional[dict] = None
+    erro: Optional[str] = None
+    criado_em: datetime
+    iniciado_em: Optional[datetime] = None
+    concluido_em: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FiltroExportacaoAgendamentos(BaseModel):
+    """Parâmetros do job `exportar_agendamentos` (todos opcionais)."""
+
+    medico_id: Optional[int] = None
+    data_inicio: Optional[date] = None
+    data_fim: Optional[date] = None
+
+
 # ====================================================================================
 # ===== --- Schemas de Usuário ---                                               =====
 # ====================================================================================
@@ -361,6 +669,13 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class TokenProfiling(BaseModel):
+    """Schema do token assinado para o header `X-Profile`."""
+
+    token: str
+    expira_em: int = Field(description="Instante de expiração (epoch, segundos).")
+
+
 class TokenData(BaseModel):
     """Schema para os dados contidos dentro de um token JWT."""
 
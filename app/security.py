@@ -5,18 +5,29 @@
 # ====================================================================================
 
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
+from . import tracing
 from .config import settings
 
 # ====================================================================================
 # ===== --- Configuração de Hashing de Senha ---                                 =====
 # ====================================================================================
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    """
+    Contexto de hashing criado no primeiro uso: o passlib só é necessário no
+    login e na criação de usuários, não na inicialização dos workers.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 
 # ====================================================================================
 # ===== --- Funções de Senha ---                                                 =====
@@ -25,12 +36,14 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica se a senha em texto plano corresponde à senha com hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    with tracing.span("bcrypt.verify"):
+        return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Gera o hash de uma senha em texto plano."""
-    return pwd_context.hash(password)
+    with tracing.span("bcrypt.hash"):
+        return get_pwd_context().hash(password)
 
 
 # ====================================================================================
@@ -74,9 +87,10 @@ def decode_token_sub(
     Usado para obter o identificador do usuário do token.
     """
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        with tracing.span("jwt.decode"):
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            )
         # 'sub' é o campo padrão para o identificador do sujeito (ex: user_id ou email)
         subject: Any = payload.get("sub")
         if subject is None:
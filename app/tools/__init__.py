@@ -0,0 +1 @@
+# app/tools/__init__.py
@@ -0,0 +1,140 @@
+# app/tools/coletor_traces.py
+
+"""
+Coletor local de traces, substituto de um coletor OTLP para desenvolvimento.
+
+Recebe POST /v1/traces no formato OTLP/JSON (o mesmo enviado por
+TRACING_EXPORTER=otlp), grava os spans em JSONL no formato do exportador de
+arquivo e imprime um resumo por trace. Também resume um arquivo JSONL já
+existente, mostrando a árvore de spans de cada trace.
+
+Uso:
+    python -m app.tools.coletor_traces --porta 4318 --saida traces.jsonl
+    python -m app.tools.coletor_traces --resumo traces.jsonl
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import argparse
+import json
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional
+
+# ====================================================================================
+# ===== --- Conversão e Resumo ---                                               =====
+# ====================================================================================
+
+
+def _valor(valor: Dict[str, Any]) -> Any:
+    for tipo in ("stringValue", "boolValue", "doubleValue"):
+        if tipo in valor:
+            return valor[tipo]
+    if "intValue" in valor:
+        return int(valor["intValue"])
+    return None
+
+
+def spans_do_otlp(corpo: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Converte um corpo OTLP/JSON nos spans do formato do exportador de arquivo."""
+    spans = []
+    for recurso in corpo.get("resourceSpans", []):
+        for escopo in recurso.get("scopeSpans", []):
+            for span in escopo.get("spans", []):
+                inicio = int(span["startTimeUnixNano"])
+                fim = int(span["endTimeUnixNano"])
+                spans.append(
+                    {
+                        "trace_id": span["traceId"],
+                        "span_id": span["spanId"],
+                        "parent_span_id": span.get("parentSpanId") or None,
+                        "name": span["name"],
+                        "start_ns": inicio,
+                        "end_ns": fim,
+                        "duration_ms": (fim - inicio) / 1e6,
+                        "attributes": {
+                            item["key"]: _valor(item["value"])
+                            for item in span.get("attributes", [])
+                        },
+                    }
+                )
+    return spans
+
+
+def imprimir_resumo(spans: Iterable[Dict[str, Any]]) -> None:
+    """Imprime a árvore de spans de cada trace, com as durações em ms."""
+    por_trace: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for span in spans:
+        por_trace[span["trace_id"]].append(span)
+
+    for trace_id, itens in por_trace.items():
+        filhos: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+        for span in sorted(itens, key=lambda s: s["start_ns"]):
+            filhos[span["parent_span_id"]].append(span)
+        print(f"trace {trace_id}")
+        pendentes = [(span, 1) for span in reversed(filhos[None])]
+        while pendentes:
+            span, nivel = pendentes.pop()
+            print(f"{'  ' * nivel}{span['duration_ms']:9.2f} ms  {span['name']}")
+            pendentes.extend(
+                (filho, nivel + 1) for filho in reversed(filhos[span["span_id"]])
+            )
+
+
+# ====================================================================================
+# ===== --- Servidor ---                                                         =====
+# ====================================================================================
+
+
+def servir(porta: int, saida: str) -> None:
+    """Atende POST /v1/traces até ser interrompido (Ctrl+C)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            if self.path != "/v1/traces":
+                self.send_error(404)
+                return
+            tamanho = int(self.headers.get("Content-Length", 0))
+            spans = spans_do_otlp(json.loads(self.rfile.read(tamanho)))
+            with open(saida, "a", encoding="utf-8") as arquivo:
+                for span in spans:
+                    arquivo.write(json.dumps(span) + "\n")
+            imprimir_resumo(spans)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    servidor = ThreadingHTTPServer(("0.0.0.0", porta), Handler)
+    print(f"Coletor ouvindo em http://0.0.0.0:{porta}/v1/traces -> {saida}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--porta", type=int, default=4318)
+    parser.add_argument("--saida", default="traces.jsonl")
+    parser.add_argument("--resumo", help="Apenas resume um arquivo JSONL de spans.")
+    args = parser.parse_args(argv)
+
+    if args.resumo:
+        with open(args.resumo, encoding="utf-8") as arquivo:
+            imprimir_resumo(json.loads(linha) for linha in arquivo if linha.strip())
+        return
+    servir(args.porta, args.saida)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+# app/tools/particoes.py
+
+"""
+Manutenção das partições mensais de 'agendamentos' e 'auditoria' (PostgreSQL).
+
+Comandos:
+    listar     mostra as partições existentes e o número aproximado de linhas
+    criar      cria antecipadamente as partições dos próximos meses; linhas que
+               tenham caído na partição DEFAULT são movidas para a nova partição
+    arquivar   desanexa as partições mais antigas que a retenção, exporta cada
+               uma para CSV compactado (gzip) com um manifesto JSON e remove a
+               tabela
+
+Uso:
+    python -m app.tools.particoes criar --meses 3
+    python -m app.tools.particoes arquivar --retencao-meses 24 --destino /backups
+    python -m app.tools.particoes listar
+    python -m app.tools.particoes --tabela auditoria criar --meses 3
+
+Recomenda-se agendar `criar` (diário) e `arquivar` (mensal) via cron.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+
+# ====================================================================================
+# ===== --- Constantes ---                                                       =====
+# ====================================================================================
+
+# Tabelas particionadas por mês e a coluna da chave de particionamento
+TABELAS = {
+    "agendamentos": "data_primeira_consulta",
+    "auditoria": "ocorrido_em",
+}
+TABELA = "agendamentos"
+
+# Evita que o DETACH fique bloqueado (e bloqueando) atrás de transações longas
+LOCK_TIMEOUT = "5s"
+
+
+# ====================================================================================
+# ===== --- Funções Auxiliares ---                                               =====
+# ====================================================================================
+
+
+def _proximo_mes(mes: date) -> date:
+    return date(mes.year + mes.month // 12, mes.month % 12 + 1, 1)
+
+
+def _somar_meses(mes: date, meses: int) -> date:
+    indice = mes.year * 12 + mes.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def nome_particao(mes: date, tabela: str = TABELA) -> str:
+    """Nome da partição do mês: <tabela>_pAAAAMM."""
+    return f"{tabela}_p{mes:%Y%m}"
+
+
+def particoes_mensais(
+    conexao: Connection, tabela: str = TABELA
+) -> List[Tuple[str, date]]:
+    """Partições mensais anexadas à tabela, com o mês de cada uma."""
+    nomes = conexao.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:tabela AS regclass) ORDER BY c.relname"
+        ),
+        {"tabela": tabela},
+    ).scalars()
+    padrao = re.compile(rf"^{tabela}_p(\d{{4}})(\d{{2}})$")
+    particoes = []
+    for nome in nomes:
+        encontrado = padrao.match(nome)
+        if encontrado:
+            ano, mes = map(int, encontrado.groups())
+            particoes.append((nome, date(ano, mes, 1)))
+    return particoes
+
+
+def _verificar_postgres(engine: Engine) -> None:
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("O particionamento de tabelas só existe no PostgreSQL.")
+
+
+# ====================================================================================
+# ===== --- Comandos ---                                                         =====
+# ====================================================================================
+
+
+def listar(engine: Engine, tabela: str = TABELA) -> None:
+    """Imprime as partições e a estimativa de linhas (pg_class.reltuples)."""
+    with engine.connect() as conexao:
+        linhas = conexao.execute(
+            text(
+                "SELECT c.relname, c.reltuples::bigint FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:tabela AS regclass) ORDER BY c.relname"
+            ),
+            {"tabela": tabela},
+        )
+        for nome, estimativa in linhas:
+            print(f"{nome:<28} ~{max(estimativa, 0):>12,} linhas")
+
+
+def criar_particoes(
+    engine: Engine, meses: int, hoje: Optional[date] = None, tabela: str = TABELA
+) -> int:
+    """
+    Garante as partições do mês atual e dos `meses` seguintes.
+
+    Se a partição DEFAULT contiver linhas do mês a criar, ela é desanexada,
+    as linhas são movidas para a nova partição e ela é anexada de novo — tudo
+    na mesma transação.
+
+    Returns:
+        Quantidade de partições criadas.
+    """
+    coluna = TABELAS[tabela]
+    particao_default = f"{tabela}_default"
+    inicio = (hoje or date.today()).replace(day=1)
+    criadas = 0
+    with engine.begin() as conexao:
+        conexao.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        existentes = {mes for _, mes in particoes_mensais(conexao, tabela)}
+        for deslocamento in range(meses + 1):
+            mes = _somar_meses(inicio, deslocamento)
+            if mes in existentes:
+                continue
+            seguinte = _proximo_mes(mes)
+            faixa = {"inicio": mes, "fim": seguinte}
+            linhas_default = conexao.execute(
+                text(
+                    f"SELECT count(*) FROM {particao_default} "
+                    f"WHERE {coluna} >= :inicio AND {coluna} < :fim"
+                ),
+                faixa,
+            ).scalar_one()
+            if linhas_default:
+                conexao.execute(
+                    text(f"ALTER TABLE {tabela} DETACH PARTITION {particao_default}")
+                )
+            conexao.execute(
+                text(
+                    f"CREATE TABLE {nome_particao(mes, tabela)} PARTITION OF {tabela} "
+                    f"FOR VALUES FROM ('{mes.isoformat()}') "
+                    f"TO ('{seguinte.isoformat()}')"
+                )
+            )
+            if linhas_default:
+                conexao.execute(
+                    text(
+                        f"WITH movidas AS (DELETE FROM {particao_default} "
+                        f"WHERE {coluna} >= :inicio AND {coluna} < :fim "
+                        f"RETURNING *) INSERT INTO {tabela} SELECT * FROM movidas"
+                    ),
+                    faixa,
+                )
+                conexao.execute(
+                    text(
+                        f"ALTER TABLE {tabela} ATTACH PARTITION {particao_default} "
+                        "DEFAULT"
+                    )
+                )
+            print(
+                f"criada   {nome_particao(mes, tabela)} "
+                f"({linhas_default} linhas movidas)"
+            )
+            criadas += 1
+    return criadas
+
+
+def arquivar_particoes(
+    engine: Engine,
+    retencao_meses: int,
+    destino: Path,
+    manter_tabela: bool = False,
+    hoje: Optional[date] = None,
+    tabela: str = TABELA,
+) -> List[Path]:
+    """
+    Arquiva as partições cujo mês termina antes do início da retenção.
+
+    Cada partição é desanexada (transação curta), exportada com COPY para
+    `<destino>/<particao>.csv.gz` com um manifesto `<particao>.json` (linhas,
+    faixa de datas) e, se a exportação conferir, removida.
+
+    Returns:
+        Os arquivos gerados.
+    """
+    destino.mkdir(parents=True, exist_ok=True)
+    corte = _somar_meses((hoje or date.today()).replace(day=1), -retencao_meses)
+    with engine.connect() as conexao:
+        antigas = [(n, m) for n, m in particoes_mensais(conexao, tabela) if m < corte]
+
+    arquivos = []
+    for nome, mes in antigas:
+        with engine.begin() as conexao:
+            conexao.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+            conexao.execute(text(f"ALTER TABLE {tabela} DETACH PARTITION {nome}"))
+
+        arquivo = destino / f"{nome}.csv.gz"
+        conexao_bruta = engine.raw_connection()
+        try:
+            cursor = conexao_bruta.cursor()
+            cursor.execute(f"SELECT count(*) FROM {nome}")
+            (linhas,) = cursor.fetchone()
+            with gzip.open(arquivo, "wt", encoding="utf-8", newline="") as saida:
+                cursor.copy_expert(
+                    f"COPY {nome} TO STDOUT WITH (FORMAT csv, HEADER)", saida
+                )
+            conexao_bruta.commit()
+        finally:
+            conexao_bruta.close()
+
+        with gzip.open(arquivo, "rt", encoding="utf-8", newline="") as entrada:
+            exportadas = sum(1 for _ in csv.reader(entrada)) - 1
+        if exportadas < linhas:
+            raise SystemExit(
+                f"{nome}: {exportadas} linhas exportadas de {linhas}; "
+                "a partição foi desanexada, mas não removida."
+            )
+        manifesto = destino / f"{nome}.json"
+        manifesto.write_text(
+            json.dumps(
+                {
+                    "particao": nome,
+                    "de": mes.isoformat(),
+                    "ate": _proximo_mes(mes).isoformat(),
+                    "linhas": linhas,
+                    "arquivo": arquivo.name,
+                },
+                indent=2,
+            )
+        )
+        if not manter_tabela:
+            with engine.begin() as conexao:
+                conexao.execute(text(f"DROP TABLE {nome}"))
+        print(f"arquivada {nome}: {linhas:,} linhas -> {arquivo}")
+        arquivos.extend([arquivo, manifesto])
+    return arquivos
+
+
+# ====================================================================================
+# ===== --- Execução ---                                                         =====
+# ====================================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Ponto de entrada da manutenção de partições."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--tabela", choices=sorted(TABELAS), default=TABELA)
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    comandos.add_parser("listar", help="Lista as partições.")
+    criar = comandos.add_parser("criar", help="Cria as partições futuras.")
+    criar.add_argument("--meses", type=int, default=3)
+    arquivar = comandos.add_parser("arquivar", help="Arquiva partições antigas.")
+    arquivar.add_argument("--retencao-meses", type=int, required=True)
+    arquivar.add_argument("--destino", type=Path, required=True)
+    arquivar.add_argument(
+        "--manter-tabela",
+        action="store_true",
+        help="Não remove a tabela desanexada após a exportação.",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.database_url:
+        raise SystemExit("Informe --database-url ou defina DATABASE_URL.")
+    engine = create_engine(args.database_url)
+    _verificar_postgres(engine)
+
+    if args.comando == "listar":
+        listar(engine, args.tabela)
+    elif args.comando == "criar":
+        criar_particoes(engine, args.meses, tabela=args.tabela)
+    else:
+        arquivar_particoes(
+            engine,
+            args.retencao_meses,
+            args.destino,
+            args.manter_tabela,
+            tabela=args.tabela,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,659 @@
+# app/tools/seed.py
+
+"""
+Gerador de massa de dados sintética em escala de produção.
+
+Gera pacientes (com CPF e CNS válidos e endereço), médicos, agendamentos com
+distribuição enviesada (poucos pacientes e médicos concentram muitas consultas)
+e usuários de teste, e os carrega em lote no banco: COPY no PostgreSQL e
+executemany em transação única no SQLite. A saída é determinística para a mesma
+combinação de --seed e --data-referencia.
+
+Uso:
+    python -m app.tools.seed --pacientes 2000000 --agendamentos 15000000
+    python -m app.tools.seed --database-url sqlite:///seed.db --criar-tabelas
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import argparse
+import csv
+import io
+import os
+import random
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import date, timedelta
+from itertools import islice
+from operator import mul
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import Table, create_engine, select
+from sqlalchemy.orm import Session
+
+# ====================================================================================
+# ===== --- Dados de Referência ---                                              =====
+# ====================================================================================
+
+DATA_REFERENCIA_PADRAO = date(2025, 6, 2)
+SENHA_PADRAO = "senha-seed-123"
+
+# Tabelas mantidas em colunas, à mão, fora da formatação do black
+# fmt: off
+PRIMEIROS_NOMES = (
+    "Ana", "Maria", "Francisca", "Antônia", "Adriana", "Juliana", "Márcia",
+    "Fernanda", "Patrícia", "Aline", "José", "João", "Antônio", "Francisco",
+    "Carlos", "Paulo", "Pedro", "Lucas", "Luiz", "Marcos", "Gabriel", "Rafael",
+    "Daniel", "Marcelo", "Bruno", "Eduardo", "Felipe", "Raimundo", "Rodrigo",
+    "Sandra", "Camila", "Luciana", "Beatriz", "Larissa", "Vanessa", "Letícia",
+)
+SOBRENOMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves",
+    "Pereira", "Lima", "Gomes", "Costa", "Ribeiro", "Martins", "Carvalho",
+    "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa", "Rocha",
+    "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado",
+    "Mendes", "Freitas", "Cardoso", "Ramos", "Gonçalves", "Santana", "Teixeira",
+)
+LOGRADOUROS = (
+    "Rua das Flores", "Rua São João", "Avenida Brasil", "Rua Sete de Setembro",
+    "Rua Quinze de Novembro", "Avenida Getúlio Vargas", "Rua Tiradentes",
+    "Rua Dom Pedro II", "Rua Santos Dumont", "Avenida Paulista", "Rua da Paz",
+    "Rua Rui Barbosa", "Travessa do Comércio", "Rua das Palmeiras",
+)
+BAIRROS = (
+    "Centro", "Jardim América", "Vila Nova", "Boa Vista", "São José",
+    "Santa Cruz", "Planalto", "Industrial", "Bela Vista", "Liberdade",
+    "Jardim Primavera", "Cidade Nova", "Vila Operária", "Alto da Glória",
+)
+# (cidade, estado, DDD, prefixo de CEP)
+CIDADES = (
+    ("São Paulo", "SP", "11", "01"), ("Campinas", "SP", "19", "13"),
+    ("Rio de Janeiro", "RJ", "21", "20"), ("Belo Horizonte", "MG", "31", "30"),
+    ("Salvador", "BA", "71", "40"), ("Fortaleza", "CE", "85", "60"),
+    ("Recife", "PE", "81", "50"), ("Porto Alegre", "RS", "51", "90"),
+    ("Curitiba", "PR", "41", "80"), ("Manaus", "AM", "92", "69"),
+    ("Belém", "PA", "91", "66"), ("Goiânia", "GO", "62", "74"),
+    ("São Luís", "MA", "98", "65"), ("Teresina", "PI", "86", "64"),
+    ("Natal", "RN", "84", "59"), ("Cuiabá", "MT", "65", "78"),
+)
+# (especialidade, valor base da consulta)
+ESPECIALIDADES = (
+    ("Clínica Geral", 150), ("Cardiologia", 320), ("Pediatria", 220),
+    ("Ginecologia", 260), ("Ortopedia", 300), ("Dermatologia", 280),
+    ("Psiquiatria", 350), ("Oftalmologia", 250), ("Endocrinologia", 310),
+    ("Neurologia", 380), ("Urologia", 290), ("Otorrinolaringologia", 270),
+)
+DESCRICOES = (
+    "Consulta de rotina", "Retorno", "Primeira consulta", "Avaliação de exames",
+    "Acompanhamento", None, None,
+)
+# fmt: on
+
+# Multiplicadores coprimos com 10, usados para mapear índices sequenciais em
+# documentos únicos e de aparência aleatória (bijeção em Z/10^n).
+_MULTIPLICADOR_CPF = 387_420_489
+_MULTIPLICADOR_CNS = 1_162_261_467
+_MODULO_CPF = 10**9
+_MODULO_CNS = 10**13
+# Deslocamentos fixos (independentes de --seed): como os documentos derivam do
+# ID do paciente, cargas incrementais nunca repetem um CPF/CNS já gerado.
+_DESLOCAMENTO_CPF = 104_729_311
+_DESLOCAMENTO_CNS = 3_141_592_653_589
+_MAXIMO_PACIENTES = _MODULO_CPF // 2
+
+
+# ====================================================================================
+# ===== --- Geradores de Documentos ---                                          =====
+# ====================================================================================
+
+
+_PESOS_CPF_1 = tuple(range(10, 1, -1))
+_PESOS_CPF_2 = tuple(range(11, 1, -1))
+_PESOS_CNS_CORPO = tuple(range(14, 1, -1))
+_TAMANHO_POOL_NOMES = 8192
+
+
+def _digito_cpf(digitos: Sequence[int], pesos: Sequence[int]) -> int:
+    """Calcula um dígito verificador de CPF para os dígitos e pesos informados."""
+    resto = (sum(map(mul, digitos, pesos)) * 10) % 11
+    return 0 if resto == 10 else resto
+
+
+def gerar_cpf(indice: int, deslocamento: int) -> str:
+    """
+    Gera o CPF (11 dígitos, válido) correspondente a um índice de paciente.
+
+    Índices distintos abaixo de _MAXIMO_PACIENTES produzem CPFs distintos. Bases
+    com todos os dígitos iguais (rejeitadas pelo validate_docbr) são desviadas
+    para a metade superior do espaço, que nunca é usada diretamente.
+    """
+    base = f"{(indice * _MULTIPLICADOR_CPF + deslocamento) % _MODULO_CPF:09d}"
+    while base == base[0] * 9:
+        indice += _MAXIMO_PACIENTES
+        base = f"{(indice * _MULTIPLICADOR_CPF + deslocamento) % _MODULO_CPF:09d}"
+    digitos = [ord(c) - 48 for c in base]
+    primeiro = _digito_cpf(digitos, _PESOS_CPF_1)
+    digitos.append(primeiro)
+    segundo = _digito_cpf(digitos, _PESOS_CPF_2)
+    return f"{base}{primeiro}{segundo}"
+
+
+def gerar_cns(indice: int, deslocamento: int) -> str:
+    """
+    Gera um CNS provisório (iniciado em 7, 8 ou 9, válido) para um índice.
+
+    O corpo de 13 dígitos é único por índice; o primeiro dígito é o primeiro
+    dentre 7, 8 e 9 que permite um dígito verificador entre 0 e 9 (como os
+    três prefixos têm restos distintos módulo 11, ao menos dois funcionam).
+    """
+    corpo = f"{(indice * _MULTIPLICADOR_CNS + deslocamento) % _MODULO_CNS:013d}"
+    soma_corpo = sum(map(mul, (ord(c) - 48 for c in corpo), _PESOS_CNS_CORPO))
+    for prefixo in (7, 8, 9):
+        verificador = -(prefixo * 15 + soma_corpo) % 11
+        if verificador < 10:
+            return f"{prefixo}{corpo}{verificador}"
+    raise AssertionError("Nenhum prefixo de CNS provisório válido.")
+
+
+def gerar_telefone(rng: random.Random, ddd: str) -> str:
+    """Gera um telefone que passa em schemas._validate_and_clean_br_phone."""
+    if rng.random() < 0.8:
+        return f"{ddd}9{int(rng.random() * 10**8):08d}"
+    return f"{ddd}{2 + int(rng.random() * 4)}{int(rng.random() * 10**7):07d}"
+
+
+def _nome(rng: random.Random) -> str:
+    """Gera um nome completo com dois sobrenomes."""
+    return (
+        f"{rng.choice(PRIMEIROS_NOMES)} {rng.choice(SOBRENOMES)} "
+        f"{rng.choice(SOBRENOMES)}"
+    )
+
+
+def _indice_enviesado(rng: random.Random, total: int, expoente: float) -> int:
+    """
+    Sorteia um índice em [0, total) concentrado nos primeiros valores.
+
+    Com expoente > 1 a distribuição tem cauda longa: uma pequena fração dos
+    índices recebe a maior parte dos sorteios.
+    """
+    return min(int(total * rng.random() ** expoente), total - 1)
+
+
+# ====================================================================================
+# ===== --- Geradores de Linhas ---                                              =====
+# ====================================================================================
+
+# Os geradores abaixo sorteiam com `rng.random()` e indexação direta em vez de
+# `rng.choice`/`rng.randrange`: é a parte quente da geração de milhões de linhas.
+
+
+def gerar_pacientes(
+    rng: random.Random, primeiro_id: int, quantidade: int, data_referencia: date
+) -> Iterator[Tuple[tuple, tuple]]:
+    """Gera pares (linha de paciente, linha de endereço)."""
+    nomes = [_nome(rng) for _ in range(_TAMANHO_POOL_NOMES)]
+    # Datas de nascimento possíveis (até 95 anos), pré-formatadas.
+    nascimentos = [
+        (data_referencia - timedelta(days=dias)).isoformat() for dias in range(95 * 365)
+    ]
+    sortear = rng.random
+    n_nomes, n_nasc = len(nomes), len(nascimentos)
+    n_cidades, n_logr, n_bairros = len(CIDADES), len(LOGRADOUROS), len(BAIRROS)
+    for paciente_id in range(primeiro_id, primeiro_id + quantidade):
+        cidade, estado, ddd, prefixo_cep = CIDADES[int(sortear() * n_cidades)]
+        if sortear() < 0.8:
+            telefone = f"{ddd}9{int(sortear() * 10**8):08d}"
+        else:
+            telefone = f"{ddd}{2 + int(sortear() * 4)}{int(sortear() * 10**7):07d}"
+        paciente = (
+            paciente_id,
+            nomes[int(sortear() * n_nomes)],
+            nascimentos[int(sortear() * n_nasc)],
+            nomes[int(sortear() * n_nomes)],
+            gerar_cpf(paciente_id, _DESLOCAMENTO_CPF),
+            gerar_cns(paciente_id, _DESLOCAMENTO_CNS) if sortear() < 0.85 else None,
+            telefone,
+        )
+        endereco = (
+            paciente_id,
+            LOGRADOUROS[int(sortear() * n_logr)],
+            str(1 + int(sortear() * 9999)) if sortear() < 0.95 else None,
+            BAIRROS[int(sortear() * n_bairros)],
+            cidade,
+            estado,
+            f"{prefixo_cep}{int(sortear() * 1000):03d}-{int(sortear() * 1000):03d}",
+            paciente_id,
+        )
+        yield paciente, endereco
+
+
+def gerar_medicos(
+    rng: random.Random,
+    primeiro_id: int,
+    quantidade: int,
+    especialidade_ids: Dict[str, int],
+) -> Iterator[tuple]:
+    """Gera linhas de médicos; especialidades comuns recebem mais médicos."""
+    for medico_id in range(primeiro_id, primeiro_id + quantidade):
+        especialidade, _ = ESPECIALIDADES[
+            _indice_enviesado(rng, len(ESPECIALIDADES), 1.6)
+        ]
+        _, _, ddd, _ = rng.choice(CIDADES)
+        titulo = rng.choice(("Dr.", "Dra."))
+        yield (
+            medico_id,
+            f"{titulo} {_nome(rng)} (CRM {medico_id:06d})",
+            especialidade,
+            gerar_telefone(rng, ddd),
+            especialidade_ids[especialidade],
+        )
+
+
+def gerar_agendamentos(
+    rng: random.Random,
+    primeiro_id: int,
+    quantidade: int,
+    paciente_ids: Tuple[int, int],
+    medicos: List[tuple],
+    data_referencia: date,
+) -> Iterator[tuple]:
+    """
+    Gera linhas de agendamentos com distribuição enviesada.
+
+    Pacientes crônicos (início da faixa de IDs) e médicos populares concentram a
+    maior parte das consultas; as datas cobrem os dois anos anteriores e os seis
+    meses seguintes à data de referência, sem consultas aos domingos.
+    """
+    primeiro_paciente, total_pacientes = paciente_ids
+    valores_base = dict(ESPECIALIDADES)
+    # (especialidade, ID da especialidade, medico_id, valores já formatados)
+    perfis = [
+        (
+            especialidade,
+            especialidade_id,
+            medico_id,
+            tuple(
+                f"{valores_base[especialidade] * fator:.2f}"
+                for fator in (0.8, 1.0, 1.0, 1.2)
+            ),
+        )
+        for medico_id, _, especialidade, _, especialidade_id in medicos
+    ]
+    # Pares (data da consulta, possíveis datas de retorno), pré-formatados.
+    datas = []
+    for deslocamento in range(-730, 181):
+        consulta = data_referencia + timedelta(days=deslocamento)
+        if consulta.weekday() == 6:
+            continue
+        retornos = tuple(
+            (consulta + timedelta(days=d)).isoformat() for d in (30, 60, 90, 180)
+        )
+        datas.append((consulta.isoformat(), retornos))
+    sortear = rng.random
+    n_perfis, n_datas, n_desc = len(perfis), len(datas), len(DESCRICOES)
+    for agendamento_id in range(primeiro_id, primeiro_id + quantidade):
+        especialidade, especialidade_id, medico_id, valores = perfis[
+            min(int(n_perfis * sortear() ** 2.0), n_perfis - 1)
+        ]
+        paciente_id = primeiro_paciente + min(
+            int(total_pacientes * sortear() ** 2.5), total_pacientes - 1
+        )
+        consulta, retornos = datas[int(sortear() * n_datas)]
+        yield (
+            agendamento_id,
+            especialidade,
+            consulta,
+            retornos[int(sortear() * 4)] if sortear() < 0.35 else None,
+            valores[int(sortear() * 4)],
+            DESCRICOES[int(sortear() * n_desc)],
+            None,
+            paciente_id,
+            medico_id,
+            especialidade_id,
+        )
+
+
+# ====================================================================================
+# ===== --- Carga em Lote ---                                                    =====
+# ====================================================================================
+
+
+# fmt: off
+COLUNAS = {
+    "pacientes": (
+        "id", "nome_completo", "data_nascimento", "nome_da_mae", "cpf", "cns",
+        "telefone",
+    ),
+    "enderecos": (
+        "id", "rua", "numero", "bairro", "cidade", "estado", "cep", "paciente_id",
+    ),
+    "medicos": ("id", "nome", "especialidade", "telefone", "especialidade_id"),
+    "agendamentos": (
+        "id", "especialidade", "data_primeira_consulta", "data_proxima_consulta",
+        "valor_consulta", "descricao", "receituario", "paciente_id", "medico_id",
+        "especialidade_id",
+    ),
+}
+# fmt: on
+
+
+class Carregador:
+    """Carga em lote via DBAPI; subclasses implementam o envio de um lote."""
+
+    def __init__(self, engine, tamanho_lote: int) -> None:
+        self.engine = engine
+        self.tamanho_lote = tamanho_lote
+        self.conexao = engine.raw_connection()
+
+    def proximo_id(self, tabela: str) -> int:
+        """Retorna o próximo ID livre da tabela (permite cargas incrementais)."""
+        cursor = self.conexao.cursor()
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {tabela}")
+        (valor,) = cursor.fetchone()
+        cursor.close()
+        return int(valor)
+
+    def carregar(self, tabela: str, linhas: Iterable[tuple]) -> int:
+        """Carrega as linhas em lotes de `tamanho_lote` e retorna o total."""
+        return self.carregar_em_conjunto((tabela,), ((linha,) for linha in linhas))
+
+    def carregar_em_conjunto(
+        self, tabelas: Sequence[str], grupos: Iterable[Sequence[tuple]]
+    ) -> int:
+        """
+        Carrega grupos de linhas relacionadas (ex.: paciente e endereço) em lotes,
+        enviando o i-ésimo elemento de cada grupo para a i-ésima tabela.
+
+        Returns:
+            O total de linhas carregadas somando todas as tabelas.
+        """
+        total = 0
+        iterador = iter(grupos)
+        while True:
+            lote = list(islice(iterador, self.tamanho_lote))
+            if not lote:
+                break
+            for posicao, tabela in enumerate(tabelas):
+                linhas = [grupo[posicao] for grupo in lote]
+                self._enviar_lote(tabela, COLUNAS[tabela], linhas)
+                total += len(linhas)
+        self.conexao.commit()
+        return total
+
+    def _enviar_lote(self, tabela: str, colunas: Sequence[str], lote: list) -> None:
+        raise NotImplementedError
+
+    def finalizar(self) -> None:
+        """Conclui a carga e devolve a conexão."""
+        self.conexao.close()
+
+
+class CarregadorPostgres(Carregador):
+    """Carga via `COPY ... FROM STDIN` (formato CSV)."""
+
+    def _enviar_lote(self, tabela: str, colunas: Sequence[str], lote: list) -> None:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(lote)
+        buffer.seek(0)
+        cursor = self.conexao.cursor()
+        cursor.copy_expert(
+            f"COPY {tabela} ({', '.join(colunas)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+        cursor.close()
+
+    def finalizar(self) -> None:
+        """Ajusta as sequences de ID após a carga com IDs explícitos."""
+        cursor = self.conexao.cursor()
+        for tabela in COLUNAS:
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{tabela}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {tabela}), 1))"
+            )
+        self.conexao.commit()
+        cursor.close()
+        super().finalizar()
+
+
+class CarregadorSQLite(Carregador):
+    """Carga via `executemany`, com journal em memória e sem fsync."""
+
+    def __init__(self, engine, tamanho_lote: int) -> None:
+        super().__init__(engine, tamanho_lote)
+        cursor = self.conexao.cursor()
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.execute("PRAGMA journal_mode = MEMORY")
+        cursor.close()
+
+    def _enviar_lote(self, tabela: str, colunas: Sequence[str], lote: list) -> None:
+        marcadores = ", ".join("?" for _ in colunas)
+        cursor = self.conexao.cursor()
+        cursor.executemany(
+            f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES ({marcadores})",
+            lote,
+        )
+        cursor.close()
+
+
+@contextmanager
+def indices_suspensos(engine, tabelas: Sequence[Table]) -> Iterator[None]:
+    """
+    Remove os índices secundários das tabelas durante a carga e os recria ao
+    final (mesmo em caso de erro): construir um índice de uma vez é muito mais
+    barato do que atualizá-lo a cada linha inserida.
+    """
+    indices = [indice for tabela in tabelas for indice in tabela.indexes]
+    with engine.begin() as conexao:
+        for indice in indices:
+            indice.drop(conexao, checkfirst=True)
+    try:
+        yield
+    finally:
+        inicio = time.perf_counter()
+        with engine.begin() as conexao:
+            for indice in indices:
+                indice.create(conexao, checkfirst=True)
+        print(
+            f"indices        {len(indices):>12,} recriados em "
+            f"{time.perf_counter() - inicio:8.1f}s"
+        )
+
+
+def _carregador_para(engine, tamanho_lote: int) -> Carregador:
+    if engine.dialect.name == "postgresql":
+        return CarregadorPostgres(engine, tamanho_lote)
+    if engine.dialect.name == "sqlite":
+        return CarregadorSQLite(engine, tamanho_lote)
+    raise SystemExit(f"Banco não suportado pelo gerador: {engine.dialect.name}")
+
+
+# ====================================================================================
+# ===== --- Execução ---                                                         =====
+# ====================================================================================
+
+
+def _medir(nome: str, funcao, *args) -> int:
+    """Executa uma etapa de carga e imprime a vazão obtida."""
+    inicio = time.perf_counter()
+    total = funcao(*args)
+    duracao = time.perf_counter() - inicio
+    print(
+        f"{nome:<14} {total:>12,} linhas em {duracao:8.1f}s "
+        f"({total / max(duracao, 1e-9):>10,.0f} linhas/s)"
+    )
+    return total
+
+
+def _criar_usuarios(engine, quantidade: int, senha: str) -> None:
+    """Cria um admin e `quantidade` secretárias (emails @seed.local)."""
+    from .. import models
+    from ..enums import UserRole
+    from ..security import get_password_hash
+
+    hash_senha = get_password_hash(senha)
+    emails = ["admin@seed.local"] + [
+        f"secretaria{i}@seed.local" for i in range(quantidade)
+    ]
+    with Session(engine) as db:
+        existentes = set(
+            db.scalars(select(models.User.email).where(models.User.email.in_(emails)))
+        )
+        for email in emails:
+            if email in existentes:
+                continue
+            is_admin = email.startswith("admin")
+            db.add(
+                models.User(
+                    email=email,
+                    hashed_password=hash_senha,
+                    nome_completo="Usuário Seed",
+                    role=UserRole.ADMIN if is_admin else UserRole.SECRETARIA,
+                    is_active=True,
+                    is_superuser=is_admin,
+                )
+            )
+        db.commit()
+    criados = len(emails) - len(existentes)
+    print(f"usuarios       {criados:>12,} criados (senha: {senha})")
+
+
+def _catalogar_especialidades(engine) -> Dict[str, int]:
+    """Cadastra (se preciso) as especialidades geradas; retorna nome -> ID."""
+    from .. import models
+    from ..especialidades import chave
+
+    chaves = {nome: chave(nome) for nome, _ in ESPECIALIDADES}
+    with Session(engine) as db:
+        existentes = set(
+            db.scalars(
+                select(models.Especialidade.chave).where(
+                    models.Especialidade.chave.in_(chaves.values())
+                )
+            )
+        )
+        db.add_all(
+            models.Especialidade(nome=nome, chave=chave_nome)
+            for nome, chave_nome in chaves.items()
+            if chave_nome not in existentes
+        )
+        db.commit()
+        ids = dict(
+            db.execute(
+                select(models.Especialidade.chave, models.Especialidade.id).where(
+                    models.Especialidade.chave.in_(chaves.values())
+                )
+            ).all()
+        )
+    return {nome: ids[chave_nome] for nome, chave_nome in chaves.items()}
+
+
+def _recalcular_carga(engine) -> int:
+    """Reconstrói os contadores de carga dos médicos após a carga em massa."""
+    from .. import crud
+
+    with Session(engine) as db:
+        return crud.recalcular_carga_medicos(db)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Ponto de entrada do gerador."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--pacientes", type=int, default=100_000)
+    parser.add_argument("--medicos", type=int, default=500)
+    parser.add_argument("--agendamentos", type=int, default=750_000)
+    parser.add_argument("--usuarios", type=int, default=20)
+    parser.add_argument("--senha", default=SENHA_PADRAO)
+    parser.add_argument("--lote", type=int, default=50_000)
+    parser.add_argument(
+        "--data-referencia",
+        type=date.fromisoformat,
+        default=DATA_REFERENCIA_PADRAO,
+        help="Data em torno da qual as consultas são distribuídas.",
+    )
+    parser.add_argument(
+        "--criar-tabelas",
+        action="store_true",
+        help="Cria as tabelas a partir dos modelos (útil no SQLite; no "
+        "PostgreSQL prefira `alembic upgrade head`).",
+    )
+    parser.add_argument(
+        "--manter-indices",
+        action="store_true",
+        help="Não remove os índices secundários durante a carga.",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.database_url:
+        parser.error("Informe --database-url ou defina DATABASE_URL.")
+    if not 0 < args.pacientes <= _MAXIMO_PACIENTES or args.medicos <= 0:
+        parser.error("Quantidades de pacientes e médicos devem ser positivas.")
+
+    # app.database lê DATABASE_URL na importação; os modelos só podem ser
+    # importados depois que a URL da linha de comando foi aplicada.
+    os.environ["DATABASE_URL"] = args.database_url
+    from .. import models  # noqa: F401 - registra os modelos em Base.metadata
+    from ..database import Base
+
+    engine = create_engine(args.database_url)
+    if args.criar_tabelas:
+        Base.metadata.create_all(bind=engine)
+    tabelas = [Base.metadata.tables[nome] for nome in COLUNAS]
+    # Antes da carga: o catálogo grava em transação própria
+    especialidade_ids = _catalogar_especialidades(engine)
+
+    rng = random.Random(args.seed)
+    carregador = _carregador_para(engine, args.lote)
+    try:
+        primeiro_paciente = carregador.proximo_id("pacientes")
+        primeiro_medico = carregador.proximo_id("medicos")
+        primeiro_agendamento = carregador.proximo_id("agendamentos")
+        if carregador.proximo_id("enderecos") > primeiro_paciente:
+            raise SystemExit("IDs de enderecos à frente de pacientes; abortando.")
+
+        suspensao = (
+            nullcontext() if args.manter_indices else indices_suspensos(engine, tabelas)
+        )
+        with suspensao:
+            _medir(
+                "pacientes",
+                carregador.carregar_em_conjunto,
+                ("pacientes", "enderecos"),
+                gerar_pacientes(
+                    rng, primeiro_paciente, args.pacientes, args.data_referencia
+                ),
+            )
+            medicos = list(
+                gerar_medicos(rng, primeiro_medico, args.medicos, especialidade_ids)
+            )
+            _medir("medicos", carregador.carregar, "medicos", medicos)
+            _medir(
+                "agendamentos",
+                carregador.carregar,
+                "agendamentos",
+                gerar_agendamentos(
+                    rng,
+                    primeiro_agendamento,
+                    args.agendamentos,
+                    (primeiro_paciente, args.pacientes),
+                    medicos,
+                    args.data_referencia,
+                ),
+            )
+        carregador.finalizar()
+    except BaseException:
+        carregador.conexao.close()
+        raise
+
+    _medir("carga_medicos", _recalcular_carga, engine)
+    _criar_usuarios(engine, args.usuarios, args.senha)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+# app/tracing.py
+
+"""
+Rastreamento local de requisições (traces e spans), sem APM externo.
+
+Cada requisição recebe um trace id (ou continua o do header W3C `traceparent`)
+e os pontos instrumentados abrem spans filhos: decodificação do JWT, carga do
+usuário, cada comando SQL, validação Pydantic da requisição e da resposta e
+bcrypt. Ao final da requisição os spans são entregues a um exportador em
+segundo plano: arquivo JSONL local ou coletor OTLP/HTTP (JSON).
+
+Com TRACING_ENABLED=false nada é registrado e `span()` custa uma leitura de
+ContextVar.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# ====================================================================================
+# ===== --- Traces e Spans ---                                                   =====
+# ====================================================================================
+
+
+class Span:
+    """Um trecho cronometrado de um trace."""
+
+    __slots__ = (
+        "trace",
+        "span_id",
+        "pai_id",
+        "nome",
+        "inicio_ns",
+        "fim_ns",
+        "atributos",
+    )
+
+    def __init__(
+        self, trace: "Trace", nome: str, pai_id: Optional[str], atributos: Dict
+    ) -> None:
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.pai_id = pai_id
+        self.nome = nome
+        self.inicio_ns = time.time_ns()
+        self.fim_ns = 0
+        self.atributos = atributos
+
+    def finalizar(self, **atributos: Any) -> None:
+        self.atributos.update(atributos)
+        self.fim_ns = time.time_ns()
+        self.trace.spans.append(self)
+
+    def como_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.pai_id,
+            "name": self.nome,
+            "start_ns": self.inicio_ns,
+            "end_ns": self.fim_ns,
+            "duration_ms": (self.fim_ns - self.inicio_ns) / 1e6,
+            "attributes": self.atributos,
+        }
+
+
+class Trace:
+    """Spans finalizados de uma requisição (list.append é seguro entre threads)."""
+
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id: str) -> None:
+        self.trace_id = trace_id
+        self.spans: List[Span] = []
+
+
+# O contexto é copiado para o threadpool do Starlette, então rotas síncronas e
+# o CRUD enxergam o trace da requisição.
+_trace_atual: ContextVar[Optional[Trace]] = ContextVar("trace_atual", default=None)
+_span_atual: ContextVar[Optional[str]] = ContextVar("span_atual", default=None)
+
+
+def trace_id_atual() -> Optional[str]:
+    """Trace id da requisição em andamento, se houver."""
+    trace = _trace_atual.get()
+    return trace.trace_id if trace is not None else None
+
+
+def iniciar_span(nome: str, **atributos: Any) -> Optional[Span]:
+    """Abre um span filho do span atual; None se não houver trace ativo."""
+    trace = _trace_atual.get()
+    if trace is None:
+        return None
+    return Span(trace, nome, _span_atual.get(), atributos)
+
+
+@contextmanager
+def span(nome: str, **atributos: Any) -> Iterator[Optional[Span]]:
+    """
+    Context manager que cronometra o bloco como um span do trace atual.
+
+    Uso:
+        with tracing.span("crud.busca", paciente_id=1):
+            ...
+    """
+    novo = iniciar_span(nome, **atributos)
+    if novo is None:
+        yield None
+        return
+    token = _span_atual.set(novo.span_id)
+    try:
+        yield novo
+    except BaseException as exc:
+        novo.atributos["error"] = type(exc).__name__
+        raise
+    finally:
+        _span_atual.reset(token)
+        novo.finalizar()
+
+
+# ====================================================================================
+# ===== --- Exportadores ---                                                     =====
+# ====================================================================================
+
+
+class Exportador:
+    """Thread de fundo que recebe traces por uma fila limitada e os exporta."""
+
+    def __init__(self, tamanho_fila: int) -> None:
+        self.fila: "queue.Queue[Optional[Trace]]" = queue.Queue(tamanho_fila)
+        self.descartados = 0
+        self._thread = threading.Thread(
+            target=self._executar, name="exportador-de-traces", daemon=True
+        )
+        self._thread.start()
+
+    def enviar(self, trace: Trace) -> None:
+        """Enfileira um trace sem bloquear; se a fila estiver cheia, descarta-o."""
+        try:
+            self.fila.put_nowait(trace)
+        except queue.Full:
+            self.descartados += 1
+
+    def encerrar(self) -> None:
+        self.fila.put(None)
+        self._thread.join()
+
+    def _executar(self) -> None:
+        while True:
+            trace = self.fila.get()
+            if trace is None:
+                return
+            lote = [trace]
+            while len(lote) < 100:
+                try:
+                    proximo = self.fila.get_nowait()
+                except queue.Empty:
+                    break
+                if proximo is None:
+                    self._exportar_com_log(lote)
+                    return
+                lote.append(proximo)
+            self._exportar_com_log(lote)
+
+    def _exportar_com_log(self, lote: List[Trace]) -> None:
+        try:
+            self.exportar(lote)
+        except Exception:
+            logger.exception("Falha ao exportar %d trace(s).", len(lote))
+
+    def exportar(self, lote: List[Trace]) -> None:
+        raise NotImplementedError
+
+
+class ExportadorArquivo(Exportador):
+    """Grava um span por linha (JSON) em um arquivo local."""
+
+    def __init__(self, caminho: str, tamanho_fila: int) -> None:
+        self.caminho = caminho
+        super().__init__(tamanho_fila)
+
+    def exportar(self, lote: List[Trace]) -> None:
+        with open(self.caminho, "a", encoding="utf-8") as arquivo:
+            for trace in lote:
+                for item in trace.spans:
+                    arquivo.write(json.dumps(item.como_dict(), default=str) + "\n")
+
+
+def _valor_otlp(valor: Any) -> Dict[str, Any]:
+    if isinstance(valor, bool):
+        return {"boolValue": valor}
+    if isinstance(valor, int):
+        return {"intValue": str(valor)}
+    if isinstance(valor, float):
+        return {"doubleValue": valor}
+    return {"stringValue": str(valor)}
+
+
+class ExportadorOTLP(Exportador):
+    """Envia os spans a um coletor OTLP/HTTP no formato JSON (/v1/traces)."""
+
+    def __init__(self, endpoint: str, tamanho_fila: int) -> None:
+        self.endpoint = endpoint
+        super().__init__(tamanho_fila)
+
+    def exportar(self, lote: List[Trace]) -> None:
+        spans = [
+            {
+                "traceId": item.trace.trace_id,
+                "spanId": item.span_id,
+                "parentSpanId": item.pai_id or "",
+                "name": item.nome,
+                "kind": 2 if item.pai_id is None else 1,
+                "startTimeUnixNano": str(item.inicio_ns),
+                "endTimeUnixNano": str(item.fim_ns),
+                "attributes": [
+                    {"key": chave, "value": _valor_otlp(valor)}
+                    for chave, valor in item.atributos.items()
+                ],
+            }
+            for trace in lote
+            for item in trace.spans
+        ]
+        corpo = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": settings.APP_NAME},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+                }
+            ]
+        }
+        import urllib.request
+
+        requisicao = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(corpo).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(requisicao, timeout=5):
+            pass
+
+
+_exportador: Optional[Exportador] = None
+
+
+def configurar_exportador() -> Exportador:
+    """Cria (uma vez) o exportador definido em TRACING_EXPORTER."""
+    global _exportador
+    if _exportador is None:
+        if settings.TRACING_EXPORTER == "otlp":
+            _exportador = ExportadorOTLP(
+                settings.TRACING_OTLP_ENDPOINT, settings.TRACING_QUEUE_SIZE
+            )
+        else:
+            _exportador = ExportadorArquivo(
+                settings.TRACING_FILE, settings.TRACING_QUEUE_SIZE
+            )
+    return _exportador
+
+
+def encerrar_exportador() -> None:
+    """Exporta os traces pendentes e encerra a thread do exportador."""
+    global _exportador
+    if _exportador is not None:
+        _exportador.encerrar()
+        _exportador = None
+
+
+# ====================================================================================
+# ===== --- Middleware de Tracing ---                                            =====
+# ====================================================================================
+
+
+def _trace_id_do_traceparent(valor: Optional[str]) -> Optional[str]:
+    """Extrai o trace id de um header W3C `traceparent` (00-<trace>-<span>-<flags>)."""
+    partes = (valor or "").split("-")
+    if len(partes) == 4 and len(partes[1]) == 32 and partes[1] != "0" * 32:
+        return partes[1]
+    return None
+
+
+class TracingMiddleware:
+    """
+    Abre o trace de cada requisição HTTP e o entrega ao exportador no final.
+
+    A resposta recebe o header `X-Trace-Id`, para correlacionar o cliente com
+    os spans exportados.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= settings.TRACING_SAMPLE_RATE:
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for chave, valor in scope.get("headers", []):
+            if chave == b"traceparent":
+                traceparent = valor.decode("latin-1")
+        trace = Trace(_trace_id_do_traceparent(traceparent) or os.urandom(16).hex())
+        raiz = Span(
+            trace,
+            f"{scope['method']} {scope['path']}",
+            None,
+            {"http.method": scope["method"], "http.target": scope["path"]},
+        )
+        status_code = 500
+
+        async def send_com_trace_id(mensagem: Message) -> None:
+            nonlocal status_code
+            if mensagem["type"] == "http.response.start":
+                status_code = mensagem["status"]
+                mensagem["headers"] = [
+                    *mensagem.get("headers", []),
+                    (b"x-trace-id", trace.trace_id.encode()),
+                ]
+            await send(mensagem)
+
+        token_trace = _trace_atual.set(trace)
+        token_span = _span_atual.set(raiz.span_id)
+        try:
+            await self.app(scope, receive, send_com_trace_id)
+        finally:
+            _span_atual.reset(token_span)
+            _trace_atual.reset(token_trace)
+            route = scope.get("route")
+            if route is not None:
+                raiz.nome = f"{scope['method']} {route.path}"
+            raiz.finalizar(**{"http.status_code": status_code})
+            configurar_exportador().enviar(trace)
+
+
+# ====================================================================================
+# ===== --- Instrumentação de SQL e Validação ---                                =====
+# ====================================================================================
+
+
+def instrumentar_engine(engine) -> None:
+    """Registra eventos na engine para abrir um span por comando SQL."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        novo = iniciar_span("sql", **{"db.statement": statement[:500]})
+        if novo is not None:
+            conn.info.setdefault("spans_tracing", []).append(novo)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _depois(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("spans_tracing")
+        if spans:
+            spans.pop().finalizar(**{"db.rowcount": cursor.rowcount})
+
+    @event.listens_for(engine, "handle_error")
+    def _erro(contexto):
+        conexao = contexto.connection
+        spans = conexao.info.get("spans_tracing") if conexao is not None else None
+        if spans:
+            spans.pop().finalizar(error=type(contexto.original_exception).__name__)
+
+
+def instrumentar_fastapi() -> None:
+    """
+    Envolve as funções internas do FastAPI que validam o corpo da requisição e
+    serializam a resposta, abrindo spans `pydantic.request` e `pydantic.response`.
+    """
+    import fastapi.dependencies.utils as utils
+    import fastapi.routing as routing
+
+    if getattr(routing.serialize_response, "_rastreado", False):
+        return
+    validar_requisicao = utils.request_body_to_args
+    serializar_resposta = routing.serialize_response
+
+    async def request_body_to_args(*args, **kwargs):
+        with span("pydantic.request"):
+            return await validar_requisicao(*args, **kwargs)
+
+    async def serialize_response(*args, **kwargs):
+        with span("pydantic.response"):
+            return await serializar_resposta(*args, **kwargs)
+
+    serialize_response._rastreado = True
+    utils.request_body_to_args = request_body_to_args
+    routing.serialize_response = serialize_response
@@ -0,0 +1,169 @@
+# app/worker.py
+
+"""
+Worker da fila de jobs (tabela 'jobs').
+
+Cada processo reserva um job por vez com `FOR UPDATE SKIP LOCKED`, executa a
+tarefa registrada em `app.jobs` e grava o resultado. Para processar mais jobs
+em paralelo, inicie mais processos (em qualquer máquina com acesso ao banco).
+
+Falhas são repetidas até `max_tentativas` (exceto as de parâmetros
+inválidos), com espera exponencial (e aleatoriedade) a partir de
+JOBS_BACKOFF_BASE_SECONDS, limitada a JOBS_BACKOFF_MAX_SECONDS. Se um
+worker cair, a reserva do job vence após JOBS_LEASE_SECONDS sem progresso e
+outro worker o reassume.
+
+Uso:
+    python -m app.worker
+    python -m app.worker --ate-esvaziar   # processa os jobs prontos e termina
+
+SIGTERM/SIGINT encerram o worker depois do job em andamento.
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import argparse
+import logging
+import os
+import random
+import signal
+import socket
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from pydantic import ValidationError
+
+from . import auditoria, crud, models
+from .config import settings
+from .database import SessionLocal
+from .jobs import TAREFAS, Contexto, ParametrosInvalidosError, ReservaPerdidaError
+
+logger = logging.getLogger(__name__)
+
+# ====================================================================================
+# ===== --- Execução de Jobs ---                                                 =====
+# ====================================================================================
+
+
+def espera_da_nova_tentativa(tentativas: int) -> float:
+    """Segundos até a próxima tentativa: exponencial, com aleatoriedade."""
+    espera = min(
+        settings.JOBS_BACKOFF_BASE_SECONDS * 2 ** (tentativas - 1),
+        settings.JOBS_BACKOFF_MAX_SECONDS,
+    )
+    return espera * random.uniform(0.5, 1.0)
+
+
+def executar_job(job: models.Job, worker: str) -> None:
+    """Executa um job reservado e registra a conclusão ou a falha."""
+    db = SessionLocal()
+    try:
+        tarefa = TAREFAS.get(job.tipo)
+        if tarefa is None:
+            crud.falhar_job(db, job.id, worker, f"Tipo desconhecido: {job.tipo}", None)
+            return
+        try:
+            if job.tentativas > job.max_tentativas:
+                # Reassumido depois de derrubar workers em todas as tentativas
+                raise RuntimeError("Tentativas esgotadas (worker interrompido).")
+            resultado = tarefa(Contexto(db, job, worker), dict(job.parametros))
+        except ReservaPerdidaError:
+            logger.warning("Job %d reassumido por outro worker.", job.id)
+            return
+        except Exception as exc:
+            db.rollback()
+            # Parâmetros inválidos não melhoram com novas tentativas
+            ultima = job.tentativas >= job.max_tentativas or isinstance(
+                exc, (ParametrosInvalidosError, ValidationError)
+            )
+            logger.exception(
+                "Falha no job %d (%s), tentativa %d/%d.",
+                job.id,
+                job.tipo,
+                job.tentativas,
+                job.max_tentativas,
+            )
+            nova_tentativa_em = None
+            if not ultima:
+                nova_tentativa_em = datetime.now(timezone.utc) + timedelta(
+                    seconds=espera_da_nova_tentativa(job.tentativas)
+                )
+            erro = f"{type(exc).__name__}: {exc}"
+            crud.falhar_job(db, job.id, worker, erro, nova_tentativa_em)
+            return
+        crud.concluir_job(db, job.id, worker, resultado)
+        logger.info("Job %d (%s) concluído.", job.id, job.tipo)
+    finally:
+        db.close()
+
+
+def reservar(worker: str) -> Optional[models.Job]:
+    db = SessionLocal()
+    try:
+        return crud.reservar_job(db, worker, settings.JOBS_LEASE_SECONDS)
+    finally:
+        db.close()
+
+
+def executar(parar: threading.Event, ate_esvaziar: bool = False) -> int:
+    """
+    Laço do worker: reserva e executa jobs até `parar` ser sinalizado.
+
+    Returns:
+        O número de jobs executados.
+    """
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    executados = 0
+    while not parar.is_set():
+        try:
+            job = reservar(worker)
+        except Exception:
+            logger.exception("Falha ao reservar job.")
+            job = None
+        if job is None:
+            if ate_esvaziar:
+                break
+            parar.wait(settings.JOBS_POLL_INTERVAL_SECONDS)
+            continue
+        executar_job(job, worker)
+        executados += 1
+    return executados
+
+
+# ====================================================================================
+# ===== --- Ponto de Entrada ---                                                 =====
+# ====================================================================================
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Ponto de entrada do worker."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--ate-esvaziar",
+        action="store_true",
+        help="termina quando não houver mais jobs prontos",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+
+    parar = threading.Event()
+    for sinal in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sinal, lambda *_: parar.set())
+
+    auditoria.iniciar_gravador()
+    try:
+        executados = executar(parar, ate_esvaziar=args.ate_esvaziar)
+    finally:
+        auditoria.encerrar_gravador()
+    logger.info("Worker encerrado após %d job(s).", executados)
+
+
+if __name__ == "__main__":
+    main()
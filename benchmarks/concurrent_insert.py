@@ -0,0 +1,138 @@
+# benchmarks/concurrent_insert.py
+
+"""
+Verificação de inserções concorrentes de pacientes com o mesmo documento.
+
+Dispara várias threads, sincronizadas por uma barreira, tentando cadastrar
+pacientes que compartilham o mesmo CPF (grupo "cpf") ou o mesmo CNS (grupo
+"cns"). Para cada grupo exatamente uma inserção deve vencer e todas as demais
+devem ser rejeitadas com `PacienteDuplicadoError` apontando o campo correto.
+Termina com código de saída 1 se isso não ocorrer.
+
+Sem --database-url, usa um SQLite em um diretório temporário, apagado ao final.
+
+Uso:
+    python -m benchmarks.concurrent_insert [--database-url postgresql://...]
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+from typing import Dict, List
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+# A auditoria grava pela engine da aplicação, não pela engine criada aqui
+os.environ.setdefault("AUDIT_ENABLED", "false")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from validate_docbr import CNS, CPF
+
+from app import crud, schemas
+from app.database import Base
+
+# ====================================================================================
+# ===== --- Execução ---                                                         =====
+# ====================================================================================
+
+
+def _paciente(cpf: str, cns: str) -> schemas.PacienteCreate:
+    """Monta um paciente válido com os documentos informados."""
+    return schemas.PacienteCreate(
+        nome_completo="Paciente Concorrente",
+        data_nascimento="1980-05-05",
+        nome_da_mae="Mãe Concorrente",
+        cpf=cpf,
+        cns=cns,
+        telefone="11987654321",
+        endereco=schemas.EnderecoCreate(
+            rua="Rua A", bairro="Centro", cidade="Cidade", estado="SP", cep="12345-678"
+        ),
+    )
+
+
+def _verificar(database_url: str, quantidade: int) -> int:
+    """Executa a verificação em `database_url`; devolve o código de saída."""
+    connect_args = (
+        {"check_same_thread": False, "timeout": 30}
+        if database_url.startswith("sqlite")
+        else {}
+    )
+    engine = create_engine(
+        database_url, connect_args=connect_args, pool_size=quantidade
+    )
+    Base.metadata.create_all(bind=engine)
+    fabrica = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+    cpf_gen, cns_gen = CPF(), CNS()
+    cpf_compartilhado, cns_compartilhado = cpf_gen.generate(), cns_gen.generate()
+    tentativas: List[Dict[str, object]] = []
+    for i in range(quantidade):
+        if i % 2 == 0:
+            paciente = _paciente(cpf_compartilhado, cns_gen.generate())
+            tentativas.append({"grupo": "cpf", "paciente": paciente})
+        else:
+            paciente = _paciente(cpf_gen.generate(), cns_compartilhado)
+            tentativas.append({"grupo": "cns", "paciente": paciente})
+
+    barreira = threading.Barrier(len(tentativas))
+    resultados: List[tuple] = []
+    trava = threading.Lock()
+
+    def inserir(tentativa: Dict[str, object]) -> None:
+        db = fabrica()
+        try:
+            barreira.wait()
+            crud.create_paciente(db, tentativa["paciente"])
+            resultado = "criado"
+        except crud.PacienteDuplicadoError as exc:
+            resultado = f"duplicado:{exc.campo}"
+        except Exception as exc:  # noqa: BLE001 - reportado no resumo
+            resultado = f"erro:{type(exc).__name__}"
+        finally:
+            db.close()
+        with trava:
+            resultados.append((tentativa["grupo"], resultado))
+
+    threads = [threading.Thread(target=inserir, args=(t,)) for t in tentativas]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    falhou = False
+    for grupo in ("cpf", "cns"):
+        contagem = Counter(r for g, r in resultados if g == grupo)
+        total = sum(contagem.values())
+        print(f"grupo {grupo}: {dict(contagem)}")
+        if contagem["criado"] != 1 or contagem[f"duplicado:{grupo}"] != total - 1:
+            falhou = True
+    engine.dispose()
+    return 1 if falhou else 0
+
+
+def main() -> None:
+    """Ponto de entrada da verificação."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url")
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    if args.database_url is not None:
+        codigo = _verificar(args.database_url, args.threads)
+    else:
+        with tempfile.TemporaryDirectory() as diretorio:
+            banco = os.path.join(diretorio, "concorrencia.db")
+            codigo = _verificar(f"sqlite:///{banco}", args.threads)
+    sys.exit(codigo)
+
+
+if __name__ == "__main__":
+    main()
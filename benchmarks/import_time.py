@@ -0,0 +1,138 @@
+# benchmarks/import_time.py
+
+"""
+Orçamento de tempo de importação da aplicação (inicialização dos workers).
+
+Executa `python -X importtime -c "import app.main"` em processos novos e
+mede, em cada execução, o tempo cumulativo de `app.main` e o tempo próprio
+dos módulos da aplicação (`app.*`, sem as dependências). Termina com código 1
+se algum dos dois orçamentos for excedido ou se algum módulo que deveria ser
+importado sob demanda (ex.: passlib, validate_docbr) for carregado no boot.
+
+Os orçamentos são comparados com o menor tempo das N execuções: carga na
+máquina só acrescenta tempo, e o mínimo é a estimativa mais estável do custo
+real. Roda no pre-commit a cada mudança em app/.
+
+Uso:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --orcamento-ms 900 --execucoes 7
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Módulos que não devem ser importados na inicialização
+PROIBIDOS_PADRAO = [
+    "passlib",
+    "validate_docbr",
+    "app.profiling",
+    "app.routers.admin",
+    "app.lembretes",
+    "app.manutencao",
+]
+
+# ====================================================================================
+# ===== --- Medição ---                                                          =====
+# ====================================================================================
+
+
+def medir(database_url: str) -> Tuple[float, float, Dict[str, float]]:
+    """
+    Importa `app.main` em um processo novo com -X importtime.
+
+    Returns:
+        (tempo cumulativo de app.main em ms, soma dos tempos próprios dos
+        módulos app.* em ms, {módulo: tempo próprio em ms}).
+    """
+    ambiente = {**os.environ, "DATABASE_URL": database_url}
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        env=ambiente,
+        check=True,
+    )
+    total = 0.0
+    modulos: Dict[str, float] = {}
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        proprio, cumulativo, nome = linha[len("import time:") :].split("|")
+        modulo = nome.strip()
+        modulos[modulo] = int(proprio) / 1000
+        if modulo == "app.main":
+            total = int(cumulativo) / 1000
+    aplicacao = sum(
+        tempo
+        for modulo, tempo in modulos.items()
+        if modulo == "app" or modulo.startswith("app.")
+    )
+    return total, aplicacao, modulos
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Ponto de entrada da verificação do orçamento de importação."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--orcamento-ms", type=float, default=1100.0)
+    parser.add_argument("--orcamento-app-ms", type=float, default=300.0)
+    parser.add_argument("--execucoes", type=int, default=5)
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--proibidos", nargs="*", default=PROIBIDOS_PADRAO)
+    args = parser.parse_args(argv)
+
+    totais = []
+    proprios = []
+    modulos: Dict[str, float] = {}
+    for _ in range(args.execucoes):
+        total, aplicacao, modulos = medir(args.database_url)
+        totais.append(total)
+        proprios.append(aplicacao)
+    minimo, minimo_app = min(totais), min(proprios)
+
+    print(f"Módulos com maior tempo próprio (última execução, top {args.top}):")
+    for modulo, tempo in sorted(modulos.items(), key=lambda m: -m[1])[: args.top]:
+        print(f"  {tempo:8.1f} ms  {modulo}")
+    print(
+        f"import app.main: min {minimo:.1f} ms "
+        f"(mediana {statistics.median(totais):.1f}, max {max(totais):.1f}; "
+        f"orçamento {args.orcamento_ms:.0f} ms)"
+    )
+    print(
+        f"módulos app.*: min {minimo_app:.1f} ms "
+        f"(mediana {statistics.median(proprios):.1f}; "
+        f"orçamento {args.orcamento_app_ms:.0f} ms)"
+    )
+
+    falhas = []
+    if minimo > args.orcamento_ms:
+        falhas.append(f"orçamento excedido em {minimo - args.orcamento_ms:.1f} ms")
+    if minimo_app > args.orcamento_app_ms:
+        falhas.append(
+            "orçamento dos módulos app.* excedido em "
+            f"{minimo_app - args.orcamento_app_ms:.1f} ms"
+        )
+    for proibido in args.proibidos:
+        carregados = [
+            m for m in modulos if m == proibido or m.startswith(proibido + ".")
+        ]
+        if carregados:
+            falhas.append(f"'{proibido}' importado na inicialização")
+    for falha in falhas:
+        print(f"FALHA: {falha}")
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+# benchmarks/loadtest.py
+
+"""
+Suíte de carga dos endpoints da API, com comparação contra um baseline.
+
+Executa cenários roteirizados sobre a massa gerada por `app.tools.seed`, seja
+em processo (transporte ASGI do httpx, sem rede) ou contra um uvicorn em
+execução. Para cada rota informa vazão e latências p50/p95/p99, grava o
+resultado em JSON e, se um baseline for informado, termina com código 1 quando
+alguma rota regredir além do limite configurado.
+
+Cenários:
+    login         rajada de logins (POST /auth/token)
+    busca         busca de paciente por CPF e por ID
+    calendario    semana de agendamentos + pacientes em lote (?ids=)
+    paginacao     listagem de pacientes com `skip` no fim da tabela
+    agendamento   criação de agendamentos em lote (POST /agendamentos/bulk)
+
+Uso:
+    python -m benchmarks.loadtest --modo asgi --database-url sqlite:///seed.db
+    python -m benchmarks.loadtest --modo http --url http://localhost:8000 \\
+        --saida atual.json --baseline baseline.json --limite 0.15
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from app.tools.seed import (
+    _DESLOCAMENTO_CPF,
+    DATA_REFERENCIA_PADRAO,
+    SENHA_PADRAO,
+    gerar_cpf,
+)
+
+# ====================================================================================
+# ===== --- Coleta de Métricas ---                                               =====
+# ====================================================================================
+
+
+class Metricas:
+    """Acumula latências (em ms) e erros por rota."""
+
+    def __init__(self) -> None:
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.erros: Dict[str, int] = defaultdict(int)
+
+    async def medir(
+        self, rota: str, requisicao: Awaitable[httpx.Response], esperado: int = 200
+    ) -> httpx.Response:
+        """Executa a requisição, registrando a latência e o status inesperado."""
+        inicio = time.perf_counter()
+        resposta = await requisicao
+        self.latencias[rota].append((time.perf_counter() - inicio) * 1000)
+        if resposta.status_code != esperado:
+            self.erros[rota] += 1
+        return resposta
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil pelo método nearest-rank sobre uma lista já ordenada."""
+    if not valores:
+        return 0.0
+    posicao = max(int(round(p / 100 * len(valores) + 0.5)) - 1, 0)
+    return valores[min(posicao, len(valores) - 1)]
+
+
+def resumir(metricas: Metricas, duracao: float) -> Dict[str, Dict[str, float]]:
+    """Gera o resumo por rota: contagem, vazão, erros e percentis."""
+    resumo = {}
+    for rota, latencias in sorted(metricas.latencias.items()):
+        ordenadas = sorted(latencias)
+        resumo[rota] = {
+            "requisicoes": len(ordenadas),
+            "erros": metricas.erros.get(rota, 0),
+            "vazao_rps": len(ordenadas) / duracao,
+            "p50_ms": percentil(ordenadas, 50),
+            "p95_ms": percentil(ordenadas, 95),
+            "p99_ms": percentil(ordenadas, 99),
+        }
+    return resumo
+
+
+# ====================================================================================
+# ===== --- Cenários ---                                                         =====
+# ====================================================================================
+
+
+class Contexto:
+    """Estado compartilhado pelos cenários: cliente, token e tamanho da massa."""
+
+    def __init__(
+        self, cliente: httpx.AsyncClient, args: argparse.Namespace, token: str
+    ) -> None:
+        self.cliente = cliente
+        self.args = args
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.rng = random.Random(args.seed)
+
+    def paciente_id(self) -> int:
+        """Sorteia um paciente, com viés para os mais ativos (como no seed)."""
+        return 1 + min(
+            int(self.args.pacientes * self.rng.random() ** 2.5),
+            self.args.pacientes - 1,
+        )
+
+
+async def cenario_login(ctx: Contexto, metricas: Metricas) -> None:
+    """Um login de uma das secretárias criadas pelo seed."""
+    email = f"secretaria{ctx.rng.randrange(ctx.args.usuarios)}@seed.local"
+    await metricas.medir(
+        "POST /auth/token",
+        ctx.cliente.post(
+            "/auth/token", data={"username": email, "password": ctx.args.senha}
+        ),
+    )
+
+
+async def cenario_busca(ctx: Contexto, metricas: Metricas) -> None:
+    """Busca por CPF (como na recepção) seguida da leitura por ID."""
+    paciente_id = ctx.paciente_id()
+    cpf = gerar_cpf(paciente_id, _DESLOCAMENTO_CPF)
+    await metricas.medir(
+        "GET /pacientes/cpf/{cpf}",
+        ctx.cliente.get(f"/pacientes/cpf/{cpf}", headers=ctx.headers),
+    )
+    await metricas.medir(
+        "GET /pacientes/{id}",
+        ctx.cliente.get(f"/pacientes/{paciente_id}", headers=ctx.headers),
+    )
+
+
+async def cenario_calendario(ctx: Contexto, metricas: Metricas) -> None:
+    """Uma página de agendamentos e os pacientes correspondentes em lote."""
+    skip = ctx.rng.randrange(max(ctx.args.agendamentos - 100, 1))
+    resposta = await metricas.medir(
+        "GET /agendamentos/",
+        ctx.cliente.get(
+            "/agendamentos/",
+            params={"skip": skip, "limit": 100},
+            headers=ctx.headers,
+        ),
+    )
+    if resposta.status_code != 200:
+        return
+    ids = sorted({item["paciente_id"] for item in resposta.json()})
+    if ids:
+        await metricas.medir(
+            "GET /pacientes/?ids=",
+            ctx.cliente.get(
+                "/pacientes/",
+                params={"ids": ",".join(map(str, ids))},
+                headers=ctx.headers,
+            ),
+        )
+
+
+async def cenario_paginacao(ctx: Contexto, metricas: Metricas) -> None:
+    """Listagem de pacientes nas últimas páginas da tabela."""
+    skip = max(ctx.args.pacientes - ctx.rng.randrange(1, 50) * 100, 0)
+    await metricas.medir(
+        "GET /pacientes/?skip=profundo",
+        ctx.cliente.get(
+            "/pacientes/", params={"skip": skip, "limit": 100}, headers=ctx.headers
+        ),
+    )
+
+
+async def cenario_agendamento(ctx: Contexto, metricas: Metricas) -> None:
+    """Criação de 20 agendamentos em lote para a próxima semana."""
+    medico_id = 1 + ctx.rng.randrange(ctx.args.medicos)
+    inicio = date.today() + timedelta(days=7)
+    itens = [
+        {
+            "medico_id": medico_id,
+            "paciente_id": ctx.paciente_id(),
+            "especialidade": "Clínica Geral",
+            "data_primeira_consulta": (inicio + timedelta(days=i % 5)).isoformat(),
+            "valor_consulta": 150.0,
+        }
+        for i in range(20)
+    ]
+    await metricas.medir(
+        "POST /agendamentos/bulk",
+        ctx.cliente.post(
+            "/agendamentos/bulk", json={"itens": itens}, headers=ctx.headers
+        ),
+        esperado=201,
+    )
+
+
+CENARIOS: Dict[str, Callable[[Contexto, Metricas], Awaitable[None]]] = {
+    "login": cenario_login,
+    "busca": cenario_busca,
+    "calendario": cenario_calendario,
+    "paginacao": cenario_paginacao,
+    "agendamento": cenario_agendamento,
+}
+
+
+# ====================================================================================
+# ===== --- Execução ---                                                         =====
+# ====================================================================================
+
+
+async def _executar_cenario(
+    ctx: Contexto, cenario: Callable, duracao: float, concorrencia: int
+) -> Metricas:
+    """Executa um cenário em laço, com N usuários virtuais, por `duracao` segundos."""
+    metricas = Metricas()
+    fim = time.monotonic() + duracao
+
+    async def usuario_virtual() -> None:
+        while time.monotonic() < fim:
+            await cenario(ctx, metricas)
+
+    await asyncio.gather(*(usuario_virtual() for _ in range(concorrencia)))
+    return metricas
+
+
+def _criar_cliente(args: argparse.Namespace) -> httpx.AsyncClient:
+    """Cria o cliente HTTP: transporte ASGI (em processo) ou rede."""
+    if args.modo == "http":
+        return httpx.AsyncClient(base_url=args.url, timeout=60)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from app.main import app
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://asgi", timeout=60
+    )
+
+
+async def executar(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    """Executa os cenários selecionados e retorna o resumo por rota."""
+    resultado: Dict[str, Dict[str, float]] = {}
+    async with _criar_cliente(args) as cliente:
+        login = await cliente.post(
+            "/auth/token",
+            data={"username": "secretaria0@seed.local", "password": args.senha},
+        )
+        login.raise_for_status()
+        ctx = Contexto(cliente, args, login.json()["access_token"])
+        for nome in args.cenarios:
+            metricas = await _executar_cenario(
+                ctx, CENARIOS[nome], args.duracao, args.concorrencia
+            )
+            resultado.update(resumir(metricas, args.duracao))
+    return resultado
+
+
+def comparar(
+    atual: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    limite: float,
+) -> List[str]:
+    """
+    Compara o resultado com o baseline e lista as regressões encontradas.
+
+    Uma rota regride quando o p95 cresce ou a vazão cai mais do que `limite`
+    (fração, ex.: 0.15 = 15%). Rotas ausentes em um dos lados são ignoradas.
+    """
+    regressoes = []
+    for rota, base in baseline.items():
+        if rota not in atual:
+            continue
+        agora = atual[rota]
+        if base["p95_ms"] > 0 and agora["p95_ms"] > base["p95_ms"] * (1 + limite):
+            regressoes.append(
+                f"{rota}: p95 {base['p95_ms']:.1f}ms -> {agora['p95_ms']:.1f}ms"
+            )
+        if base["vazao_rps"] > 0 and agora["vazao_rps"] < base["vazao_rps"] * (
+            1 - limite
+        ):
+            regressoes.append(
+                f"{rota}: vazão {base['vazao_rps']:.1f} -> {agora['vazao_rps']:.1f} rps"
+            )
+    return regressoes
+
+
+def _imprimir(resultado: Dict[str, Dict[str, float]]) -> None:
+    print(
+        f"{'rota':<32} {'req':>7} {'erros':>6} {'rps':>8} "
+        f"{'p50':>8} {'p95':>8} {'p99':>8}"
+    )
+    for rota, r in resultado.items():
+        print(
+            f"{rota:<32} {r['requisicoes']:>7} {r['erros']:>6} {r['vazao_rps']:>8.1f} "
+            f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Ponto de entrada da suíte de carga."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--modo", choices=("asgi", "http"), default="asgi")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--database-url", help="Banco usado no modo asgi.")
+    parser.add_argument(
+        "--cenarios", nargs="+", choices=sorted(CENARIOS), default=list(CENARIOS)
+    )
+    parser.add_argument("--duracao", type=float, default=10.0)
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--pacientes", type=int, default=100_000)
+    parser.add_argument("--medicos", type=int, default=500)
+    parser.add_argument("--agendamentos", type=int, default=750_000)
+    parser.add_argument("--usuarios", type=int, default=20)
+    parser.add_argument("--senha", default=SENHA_PADRAO)
+    parser.add_argument("--saida", help="Arquivo JSON onde gravar o resultado.")
+    parser.add_argument("--baseline", help="Resultado JSON anterior para comparação.")
+    parser.add_argument(
+        "--limite",
+        type=float,
+        default=0.10,
+        help="Regressão máxima tolerada (fração; padrão 0.10 = 10%%).",
+    )
+    args = parser.parse_args(argv)
+
+    resultado = asyncio.run(executar(args))
+    _imprimir(resultado)
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(
+                {
+                    "meta": {
+                        "modo": args.modo,
+                        "cenarios": args.cenarios,
+                        "duracao_s": args.duracao,
+                        "concorrencia": args.concorrencia,
+                        "data_referencia_seed": DATA_REFERENCIA_PADRAO.isoformat(),
+                    },
+                    "rotas": resultado,
+                },
+                arquivo,
+                indent=2,
+                ensure_ascii=False,
+            )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as arquivo:
+            baseline = json.load(arquivo)["rotas"]
+        regressoes = comparar(resultado, baseline, args.limite)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao}")
+        if regressoes:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
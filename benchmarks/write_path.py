@@ -0,0 +1,305 @@
+# benchmarks/write_path.py
+
+"""
+Benchmark do caminho de escrita do CRUD.
+
+Conta quantos statements SQL cada operação de escrita (update/delete de
+pacientes, médicos e agendamentos) envia ao banco, incluindo a serialização da
+resposta pelos schemas, e compara com o fluxo antigo (pré-busca no router,
+nova busca no CRUD, commit e `refresh`).
+
+O fluxo atual tem um número fixo de statements por operação (ESPERADO): além
+do UPDATE ... RETURNING, cada escrita grava o evento da outbox e as de
+agendamentos atualizam a carga dos médicos, na mesma transação. O fluxo antigo
+não fazia nenhuma das duas coisas. Termina com código 1 se alguma operação
+passar da contagem esperada.
+
+Uso:
+    python -m benchmarks.write_path [--database-url sqlite://] [--repeticoes 200]
+"""
+
+# ====================================================================================
+# ===== --- Importações ---                                                      =====
+# ====================================================================================
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+from typing import Callable, Dict, List
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+# A auditoria grava pela engine da aplicação (outro banco em memória, sem as
+# tabelas) e fora das queries contadas aqui
+os.environ.setdefault("AUDIT_ENABLED", "false")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, models, schemas
+from app.database import Base
+
+# ====================================================================================
+# ===== --- Contagem de Statements ---                                           =====
+# ====================================================================================
+
+# Statements por escrita no fluxo atual, com a serialização da resposta
+ESPERADO = {
+    # UPDATE ... RETURNING, SELECT do médico, INSERT na outbox
+    "update_agendamento": 3,
+    # SELECT ... FOR UPDATE dos valores anteriores, UPDATE ... RETURNING,
+    # SELECT do médico, INSERT na outbox, upsert da carga (dias antigo e novo)
+    "remarcar_agendamento": 5,
+    # UPDATE ... RETURNING, SELECT do endereço, INSERT na outbox
+    "update_paciente": 3,
+    # UPDATE ... RETURNING (deleted_at), SELECT do médico, INSERT na outbox,
+    # upsert da carga
+    "delete_agendamento": 4,
+}
+
+
+class ContadorDeQueries:
+    """Conta os statements enviados ao DBAPI por uma engine."""
+
+    def __init__(self, engine) -> None:
+        self.total = 0
+        event.listen(engine, "before_cursor_execute", self._contar)
+
+    def _contar(self, *args, **kwargs) -> None:
+        self.total += 1
+
+
+def _criar_engine(database_url: str):
+    """Cria a engine do benchmark; SQLite em memória usa uma única conexão."""
+    if database_url.startswith("sqlite"):
+        return create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    return create_engine(database_url)
+
+
+# ====================================================================================
+# ===== --- Dados de Apoio ---                                                   =====
+# ====================================================================================
+
+
+def _popular(db: Session, quantidade: int) -> Dict[str, List[int]]:
+    """Insere médicos, pacientes e agendamentos usados pelas operações medidas."""
+    especialidade = models.Especialidade(nome="Clínica", chave="clinica")
+    db.add(especialidade)
+    db.flush()
+    medico = models.Medico(
+        nome="Dr. Benchmark",
+        especialidade=especialidade.nome,
+        especialidade_id=especialidade.id,
+        telefone="1",
+    )
+    db.add(medico)
+    db.flush()
+    pacientes, agendamentos = [], []
+    for i in range(quantidade):
+        paciente = models.Paciente(
+            nome_completo=f"Paciente {i}",
+            data_nascimento=date(1990, 1, 1),
+            nome_da_mae="Mãe",
+            cpf=f"{i:011d}",
+            telefone="11987654321",
+            endereco=models.Endereco(
+                rua="Rua A",
+                bairro="Centro",
+                cidade="Cidade",
+                estado="SP",
+                cep="12345-678",
+            ),
+        )
+        db.add(paciente)
+        db.flush()
+        agendamento = models.Agendamento(
+            especialidade=especialidade.nome,
+            especialidade_id=especialidade.id,
+            data_primeira_consulta=date(2025, 1, 1),
+            valor_consulta=100,
+            paciente_id=paciente.id,
+            medico_id=medico.id,
+        )
+        db.add(agendamento)
+        db.flush()
+        pacientes.append(paciente.id)
+        agendamentos.append(agendamento.id)
+    db.commit()
+    return {"medico": [medico.id], "pacientes": pacientes, "agendamentos": agendamentos}
+
+
+# ====================================================================================
+# ===== --- Fluxo Anterior (Referência) ---                                      =====
+# ====================================================================================
+
+
+def _legado_update_agendamento(db: Session, agendamento_id: int, valor: float):
+    """Reproduz o fluxo anterior: pré-busca no router + busca, commit e refresh."""
+    db.query(models.Agendamento).filter(models.Agendamento.id == agendamento_id).first()
+    db_agendamento = (
+        db.query(models.Agendamento)
+        .filter(models.Agendamento.id == agendamento_id)
+        .first()
+    )
+    db_agendamento.valor_consulta = valor
+    db.commit()
+    db.refresh(db_agendamento)
+    return db_agendamento
+
+
+def _legado_update_paciente(db: Session, paciente_id: int, telefone: str):
+    """Reproduz o fluxo anterior de atualização de paciente."""
+    db.query(models.Paciente).filter(models.Paciente.id == paciente_id).first()
+    db_paciente = (
+        db.query(models.Paciente).filter(models.Paciente.id == paciente_id).first()
+    )
+    db_paciente.telefone = telefone
+    db.commit()
+    db.refresh(db_paciente)
+    return db_paciente
+
+
+def _legado_delete_agendamento(db: Session, agendamento_id: int):
+    """Reproduz o fluxo anterior de remoção de agendamento."""
+    db_agendamento = (
+        db.query(models.Agendamento)
+        .filter(models.Agendamento.id == agendamento_id)
+        .first()
+    )
+    db_agendamento.medico
+    db.delete(db_agendamento)
+    db.commit()
+    return db_agendamento
+
+
+# ====================================================================================
+# ===== --- Execução ---                                                         =====
+# ====================================================================================
+
+
+def _medir(
+    nome: str,
+    fabrica_sessao: Callable[[], Session],
+    contador: ContadorDeQueries,
+    ids: List[int],
+    operacao: Callable[[Session, int], object],
+    schema,
+) -> Dict[str, float]:
+    """Executa `operacao` para cada id em uma sessão nova e agrega os números."""
+    inicio_queries = contador.total
+    inicio = time.perf_counter()
+    for objeto_id in ids:
+        db = fabrica_sessao()
+        try:
+            resultado = operacao(db, objeto_id)
+            schema.model_validate(resultado)
+        finally:
+            db.close()
+    duracao = time.perf_counter() - inicio
+    queries = (contador.total - inicio_queries) / max(len(ids), 1)
+    print(f"{nome:<40} {queries:>6.2f} queries/escrita {duracao * 1000:>9.1f} ms")
+    return {"queries_por_escrita": queries, "duracao_ms": duracao * 1000}
+
+
+def main() -> None:
+    """Ponto de entrada do benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--repeticoes", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = _criar_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    legado = sessionmaker(autoflush=False, bind=engine)
+    atual = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
+    with atual() as db:
+        ids = _popular(db, args.repeticoes * 2)
+    metade = args.repeticoes
+    contador = ContadorDeQueries(engine)
+
+    atualizacao = schemas.AgendamentoUpdate(valor_consulta=123.45)
+    remarcacao = schemas.AgendamentoUpdate(data_primeira_consulta=date(2025, 2, 1))
+    telefone = schemas.PacienteUpdate(telefone="11912345678")
+    agendamentos, pacientes = ids["agendamentos"], ids["pacientes"]
+
+    print(f"{'operação':<40} {'média':>6}")
+    _medir(
+        "legado: update_agendamento",
+        legado,
+        contador,
+        agendamentos[:metade],
+        lambda db, i: _legado_update_agendamento(db, i, 123.45),
+        schemas.Agendamento,
+    )
+    atual_por_operacao = {
+        "update_agendamento": _medir(
+            "atual:  update_agendamento",
+            atual,
+            contador,
+            agendamentos[:metade],
+            lambda db, i: crud.update_agendamento(db, i, atualizacao),
+            schemas.Agendamento,
+        ),
+        "remarcar_agendamento": _medir(
+            "atual:  update_agendamento (remarcação)",
+            atual,
+            contador,
+            agendamentos[:metade],
+            lambda db, i: crud.update_agendamento(db, i, remarcacao),
+            schemas.Agendamento,
+        ),
+    }
+    _medir(
+        "legado: update_paciente",
+        legado,
+        contador,
+        pacientes[:metade],
+        lambda db, i: _legado_update_paciente(db, i, "11912345678"),
+        schemas.Paciente,
+    )
+    atual_por_operacao["update_paciente"] = _medir(
+        "atual:  update_paciente",
+        atual,
+        contador,
+        pacientes[:metade],
+        lambda db, i: crud.update_paciente(db, i, telefone),
+        schemas.Paciente,
+    )
+    _medir(
+        "legado: delete_agendamento",
+        legado,
+        contador,
+        agendamentos[:metade],
+        _legado_delete_agendamento,
+        schemas.Agendamento,
+    )
+    atual_por_operacao["delete_agendamento"] = _medir(
+        "atual:  delete_agendamento",
+        atual,
+        contador,
+        agendamentos[metade:],
+        crud.delete_agendamento,
+        schemas.Agendamento,
+    )
+
+    acima = [
+        f"{operacao}: {resultado['queries_por_escrita']:.2f} statements "
+        f"(esperado {ESPERADO[operacao]})"
+        for operacao, resultado in atual_por_operacao.items()
+        if resultado["queries_por_escrita"] > ESPERADO[operacao]
+    ]
+    for mensagem in acima:
+        print(f"REGRESSÃO {mensagem}")
+    if acima:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()